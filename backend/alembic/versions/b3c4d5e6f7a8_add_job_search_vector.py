@@ -0,0 +1,46 @@
+"""add full-text search vector to job
+
+Revision ID: b3c4d5e6f7a8
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c4d5e6f7a8'
+down_revision: Union[str, None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Add generated tsvector column with GIN index."""
+    op.add_column('job', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_job_search_vector', 'job', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Drop full-text search column and index."""
+    op.drop_index('ix_job_search_vector', table_name='job', postgresql_using='gin')
+    op.drop_column('job', 'search_vector')
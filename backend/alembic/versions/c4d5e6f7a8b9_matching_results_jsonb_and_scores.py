@@ -0,0 +1,63 @@
+"""move matching_results to jsonb, add top_match_score and matches_count
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'b3c4d5e6f7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Convert matching_results to JSONB and denormalize scores."""
+    # JSON null (старые записи без результатов) превращаем в SQL NULL
+    op.execute("""
+        ALTER TABLE job
+        ALTER COLUMN matching_results TYPE JSONB
+        USING NULLIF(matching_results::jsonb, 'null'::jsonb)
+    """)
+
+    op.add_column('job', sa.Column('top_match_score', sa.Integer(), nullable=True))
+    op.add_column('job', sa.Column('matches_count', sa.Integer(), nullable=True))
+
+    op.execute("""
+        UPDATE job
+        SET matches_count = COALESCE(jsonb_array_length(matching_results->'matches'), 0),
+            top_match_score = (
+                SELECT max((m->>'score')::int)
+                FROM jsonb_array_elements(matching_results->'matches') AS m
+            )
+        WHERE matching_results IS NOT NULL
+          AND jsonb_typeof(matching_results->'matches') = 'array'
+    """)
+    op.execute("""
+        UPDATE job
+        SET matches_count = 0
+        WHERE matching_results IS NOT NULL AND matches_count IS NULL
+    """)
+
+    op.create_index('ix_job_matches_count', 'job', ['matches_count'], unique=False)
+    op.execute("CREATE INDEX ix_job_top_match_score ON job (top_match_score DESC NULLS LAST)")
+
+
+def downgrade() -> None:
+    """Revert matching_results to JSON and drop score columns."""
+    op.drop_index('ix_job_top_match_score', table_name='job')
+    op.drop_index('ix_job_matches_count', table_name='job')
+    op.drop_column('job', 'matches_count')
+    op.drop_column('job', 'top_match_score')
+    op.execute("""
+        ALTER TABLE job
+        ALTER COLUMN matching_results TYPE JSON
+        USING matching_results::json
+    """)
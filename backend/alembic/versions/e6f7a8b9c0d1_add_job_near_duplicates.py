@@ -0,0 +1,47 @@
+"""add near-duplicate signatures and job.canonical_job_id
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job', sa.Column('canonical_job_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key(
+        'job_canonical_job_id_fkey', 'job', 'job',
+        ['canonical_job_id'], ['id'], ondelete='SET NULL')
+    op.create_index('ix_job_canonical_job_id', 'job', ['canonical_job_id'], unique=False)
+
+    op.create_table(
+        'jobsignature',
+        sa.Column('job_id', sa.Uuid(), nullable=False),
+        sa.Column('signature', postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column('bands', postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index('ix_jobsignature_bands', 'jobsignature', ['bands'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobsignature_bands', table_name='jobsignature', postgresql_using='gin')
+    op.drop_table('jobsignature')
+    op.drop_index('ix_job_canonical_job_id', table_name='job')
+    op.drop_constraint('job_canonical_job_id_fkey', 'job', type_='foreignkey')
+    op.drop_column('job', 'canonical_job_id')
@@ -1,25 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from app.parsers.startup_jobs import scrape_startup_jobs
-from app.parsers.thehub_io import scrape_thehub_jobs
-from app.parsers.vseti_app import scrape_vseti_app_jobs
-from app.parsers.dev_by import scrape_devby_jobs
-from app.parsers.justremote_co import scrape_justremote_jobs
-from app.parsers.remoteok import scrape_remoteok_jobs
-from app.parsers.himalayas_app import scrape_himalayas_jobs
-from app.parsers.ycombinator import scrape_ycombinator_jobs
-from app.parsers.activejobs_db import scrape_activejobs_db
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
+from app.parsers.base import Parser
+from app.parsers.registry import PARSERS
 
 from app.utils.slack import send_slack_message
 
 from sqlmodel import Session, select, desc
+from sqlalchemy import func
 from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.db import get_session
 from app.models import Job, JobProcessingStatus, JobProcessingStatusEnum, JobRead, User
 from app.auth import get_current_user
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Dict, Literal, Optional, List, Sequence
 
 
 class AcceptOrRejectJobRequest(BaseModel):
@@ -43,6 +39,7 @@ class PendingJobRead(BaseModel):
     parsed_at: datetime
     matching_results: Optional[dict]
     amocrm_lead_id: Optional[str] = None
+    top_match_score: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -53,97 +50,132 @@ class PendingJobsResponse(BaseModel):
     available_sources: List[str]
 
 
-router = APIRouter()
-
-
-@router.post("/scrape/startup-jobs")
-async def run_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_startup_jobs, session)
-    return {"message": "Scraping started in background"}
-
-
-@router.post("/scrape/devby-jobs")
-async def run_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_devby_jobs, session)
-    return {"message": "Scraping started in background"}
+# Колонки Job в порядке полей PendingJobRead
+PENDING_JOB_COLUMNS = (
+    Job.id,
+    Job.title,
+    Job.url,
+    Job.source,
+    Job.description,
+    Job.company,
+    Job.company_url,
+    Job.apply_url,
+    Job.salary,
+    Job.parsed_at,
+    Job.matching_results,
+    Job.amocrm_lead_id,
+    Job.top_match_score,
+)
+PENDING_JOB_FIELDS = tuple(column.key for column in PENDING_JOB_COLUMNS)
+
+
+def rows_to_pending_jobs(rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert SQL result tuples selected with PENDING_JOB_COLUMNS into
+    PendingJobRead-shaped dicts ready for orjson serialization.
+    """
+    return [dict(zip(PENDING_JOB_FIELDS, row)) for row in rows]
 
 
-@router.post("/scrape/thehub-jobs")
-async def run_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_thehub_jobs, session)
-    return {"message": "Scraping started in background"}
+def job_search_query(q: str):
+    """tsquery по строке поиска сразу для английской и русской конфигураций"""
+    return func.websearch_to_tsquery("english", q).op("||")(
+        func.websearch_to_tsquery("russian", q))
 
 
-@router.post("/scrape/justremote-jobs")
-async def run_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+def apply_list_filters(
+    statement,
+    source: Optional[str],
+    q: Optional[str],
+    min_score: Optional[int] = None,
+    sort: Optional[str] = None,
 ):
-    background_tasks.add_task(scrape_justremote_jobs, session)
-    return {"message": "Scraping started in background"}
+    """
+    Apply the shared filters and ordering of the job list endpoints.
 
+    With q set, jobs are matched against the GIN-indexed search_vector and
+    ordered by ts_rank unless another sort is requested. min_score and
+    sort="score" use the indexed top_match_score column. Default ordering
+    is newest first.
+    """
+    if source:
+        statement = statement.where(Job.source == source)
 
-@router.post("/scrape/vseti-app-jobs")
-async def run_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    # current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_vseti_app_jobs, session)
-    return {"message": "Scraping started in background"}
+    if min_score is not None:
+        statement = statement.where(Job.top_match_score >= min_score)
 
+    ts_query = None
+    if q and q.strip():
+        ts_query = job_search_query(q.strip())
+        statement = statement.where(Job.search_vector.op("@@")(ts_query))
 
-@router.post("/scrape/remoteok-jobs")
-async def run_remoteok_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_remoteok_jobs, session)
-    return {"message": "Remote OK scraping started in background"}
+    if sort == "score":
+        return statement.order_by(Job.top_match_score.desc().nulls_last(), desc(Job.parsed_at))
+    if ts_query is not None and sort is None:
+        return statement.order_by(desc(func.ts_rank(Job.search_vector, ts_query)), desc(Job.parsed_at))
+    return statement.order_by(desc(Job.parsed_at))
 
 
-@router.post("/scrape/himalayas-jobs")
-async def run_himalayas_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    # current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_himalayas_jobs, session)
-    return {"message": "Himalayas scraping started in background"}
+router = APIRouter()
 
 
-@router.post("/scrape/ycombinator-jobs")
-async def run_ycombinator_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    # current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_ycombinator_jobs, session)
-    return {"message": "Y Combinator scraping started in background"}
+def create_processing_status(
+    session: Session,
+    job_id: UUID,
+    user_id: UUID,
+    status: str,
+    comment: Optional[str] = None,
+) -> Optional[UUID]:
+    """
+    Atomically create a processing status for a job.
 
+    Uses INSERT ... ON CONFLICT DO NOTHING RETURNING on the unique job_id,
+    so concurrent requests for the same job cannot raise IntegrityError:
+    exactly one of them gets the new status id.
 
-@router.post("/scrape/activejobs-db")
-async def run_activejobs_db_scraper(
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session),
-    # current_user: User = Depends(get_current_user)
-):
-    background_tasks.add_task(scrape_activejobs_db, session)
-    return {"message": "Active Jobs DB scraping started in background"}
+    Returns:
+        Id of the created status, or None if the job was already processed
+    """
+    statement = (
+        pg_insert(JobProcessingStatus)
+        .values(
+            id=uuid4(),
+            job_id=job_id,
+            user_id=user_id,
+            status=status,
+            comment=comment,
+            created_at=datetime.utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=["job_id"])
+        .returning(JobProcessingStatus.id)
+    )
+    status_id = session.exec(statement).scalar_one_or_none()
+    session.commit()
+    return status_id
+
+
+def make_scrape_endpoint(parser: Parser):
+    async def run_scraper(
+        background_tasks: BackgroundTasks,
+        profile: bool = False,
+        session: Session = Depends(get_session),
+    ):
+        # profile=true — записать профиль запуска (app.utils.profiling, GET /api/system/profiles)
+        background_tasks.add_task(parser.run, session, profile=profile)
+        return {"message": f"{parser.display_name} scraping started in background"}
+
+    return run_scraper
+
+
+# Ручной запуск парсеров: POST /scrape/{slug} для каждого парсера из реестра
+for scrape_parser in PARSERS.values():
+    router.add_api_route(
+        f"/scrape/{scrape_parser.slug}",
+        make_scrape_endpoint(scrape_parser),
+        methods=["POST"],
+        name=f"scrape_{scrape_parser.slug.replace('-', '_')}",
+        dependencies=[Depends(get_current_user)] if scrape_parser.requires_auth else [],
+    )
 
 
 @router.post("/jobs/{job_id}/accept")
@@ -156,29 +188,22 @@ async def accept(
     job = session.exec(select(Job).where(Job.id == job_id)).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    existing_status = session.exec(
-        select(JobProcessingStatus).where(JobProcessingStatus.job_id == job_id)
-    ).first()
-
-    if existing_status:
-        return {"success": False, "reason": "Already processed"}
 
-    new_status = JobProcessingStatus(
+    status_id = create_processing_status(
+        session,
         job_id=job_id,
         user_id=current_user.id,
         status=JobProcessingStatusEnum.APPLIED.value,
         comment=data.comment,
-        created_at=datetime.utcnow()
     )
-    session.add(new_status)
-    session.commit()
-    session.refresh(new_status)
+    if status_id is None:
+        return {"success": False, "reason": "Already processed"}
 
     # Отправляем уведомление в Slack
     message = f"Пользователь {current_user.email} откликнулся на запрос {job.url} и подал: {data.comment}"
     await send_slack_message(message)
 
-    return {"success": True, "status_id": str(new_status.id)}
+    return {"success": True, "status_id": str(status_id)}
 
 
 @router.post("/jobs/{job_id}/reject")
@@ -191,29 +216,22 @@ async def reject(
     job = session.exec(select(Job).where(Job.id == job_id)).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    existing_status = session.exec(
-        select(JobProcessingStatus).where(JobProcessingStatus.job_id == job_id)
-    ).first()
-
-    if existing_status:
-        return {"success": False, "reason": "Already processed"}
 
-    new_status = JobProcessingStatus(
+    status_id = create_processing_status(
+        session,
         job_id=job_id,
         user_id=current_user.id,
         status=JobProcessingStatusEnum.NOT_SUITABLE.value,
         comment=data.comment,
-        created_at=datetime.utcnow()
     )
-    session.add(new_status)
-    session.commit()
-    session.refresh(new_status)
+    if status_id is None:
+        return {"success": False, "reason": "Already processed"}
 
     # Отправляем уведомление в Slack
     message = f"Пользователь {current_user.email} отклонил запрос {job.url} по причине: {data.comment}"
     await send_slack_message(message)
 
-    return {"success": True, "status_id": str(new_status.id)}
+    return {"success": True, "status_id": str(status_id)}
 
 
 @router.post("/jobs/{job_id}/postpone")
@@ -226,30 +244,23 @@ async def postpone(
     job = session.exec(select(Job).where(Job.id == job_id)).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    existing_status = session.exec(
-        select(JobProcessingStatus).where(JobProcessingStatus.job_id == job_id)
-    ).first()
 
-    if existing_status:
-        return {"success": False, "reason": "Already processed"}
-
-    new_status = JobProcessingStatus(
+    status_id = create_processing_status(
+        session,
         job_id=job_id,
         user_id=current_user.id,
-        status="Postponed",
+        status=JobProcessingStatusEnum.POSTPONED.value,
         comment=data.comment,
-        created_at=datetime.utcnow()
     )
-    session.add(new_status)
-    session.commit()
-    session.refresh(new_status)
+    if status_id is None:
+        return {"success": False, "reason": "Already processed"}
 
     # Отправляем уведомление в Slack
     comment_text = f" с комментарием: {data.comment}" if data.comment else ""
     message = f"Пользователь {current_user.email} отложил запрос {job.url}{comment_text}"
     await send_slack_message(message)
 
-    return {"success": True, "status_id": str(new_status.id)}
+    return {"success": True, "status_id": str(status_id)}
 
 
 @router.get("/jobs", response_model=list[JobRead])
@@ -262,89 +273,73 @@ def list_jobs(
         .outerjoin(JobProcessingStatus)
         .options(selectinload(Job.processing_status))
     )
-    jobs = session.exec(statement).all()
+    jobs = session.exec(statement.execution_options(query_name="jobs_list")).all()
     return jobs
 
 
 @router.get("/pending-jobs", response_model=PendingJobsResponse)
 def list_pending_jobs(
     source: Optional[str] = None,
+    q: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    sort: Optional[Literal["date", "score"]] = None,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    # Базовый запрос для pending jobs
+    # Базовый запрос для pending jobs: сразу нужные колонки, без ORM-объектов.
+    # Копии вакансий с других площадок не показываем — их разбирают по каноничной
     statement = (
-        select(Job)
+        select(*PENDING_JOB_COLUMNS)
         .outerjoin(JobProcessingStatus, Job.id == JobProcessingStatus.job_id)
         .where(JobProcessingStatus.job_id == None)
+        .where(Job.canonical_job_id == None)
     )
 
-    # Добавляем фильтр по source, если он указан
-    if source:
-        statement = statement.where(Job.source == source)
+    # Фильтры по source, поиску и скору, сортировка
+    statement = apply_list_filters(statement, source, q, min_score, sort)
 
-    # Добавляем сортировку
-    statement = statement.order_by(desc(Job.parsed_at))
-
-    jobs = session.exec(statement).all()
+    rows = session.exec(statement.execution_options(query_name="pending_jobs")).all()
 
     # Получаем все уникальные источники из всех pending jobs (без фильтра по source)
     all_sources_statement = (
         select(Job.source)
         .outerjoin(JobProcessingStatus, Job.id == JobProcessingStatus.job_id)
         .where(JobProcessingStatus.job_id == None)
+        .where(Job.canonical_job_id == None)
         .distinct()
+        .execution_options(query_name="pending_sources")
     )
     available_sources = [source for source in session.exec(
         all_sources_statement).all()]
 
-    # Преобразуем Job в PendingJobRead
-    pending_jobs = [
-        PendingJobRead(
-            id=job.id,
-            title=job.title,
-            url=job.url,
-            source=job.source,
-            description=job.description,
-            company=job.company,
-            company_url=job.company_url,
-            apply_url=job.apply_url,
-            salary=job.salary,
-            parsed_at=job.parsed_at,
-            matching_results=job.matching_results,
-            amocrm_lead_id=job.amocrm_lead_id
-        )
-        for job in jobs
-    ]
-
-    return PendingJobsResponse(
-        jobs=pending_jobs,
-        available_sources=available_sources
-    )
+    # Строки уже соответствуют PendingJobRead — отдаем их через orjson без повторной валидации
+    return ORJSONResponse({
+        "jobs": rows_to_pending_jobs(rows),
+        "available_sources": available_sources,
+    })
 
 
 @router.get("/postponed-jobs", response_model=PendingJobsResponse)
 def list_postponed_jobs(
     source: Optional[str] = None,
+    q: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    sort: Optional[Literal["date", "score"]] = None,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     try:
         # Get jobs with POSTPONED status
         statement = (
-            select(Job)
+            select(*PENDING_JOB_COLUMNS)
             .join(JobProcessingStatus, Job.id == JobProcessingStatus.job_id)
             .where(JobProcessingStatus.status == "Postponed")
         )
 
-        # Add source filter if specified
-        if source:
-            statement = statement.where(Job.source == source)
+        # Add source, search and score filters, sorting
+        statement = apply_list_filters(statement, source, q, min_score, sort)
 
-        # Add sorting
-        statement = statement.order_by(desc(Job.parsed_at))
-
-        jobs = session.exec(statement).all()
+        rows = session.exec(statement.execution_options(query_name="postponed_jobs")).all()
 
         # Get all unique sources from postponed jobs
         all_sources_statement = (
@@ -352,49 +347,34 @@ def list_postponed_jobs(
             .join(JobProcessingStatus, Job.id == JobProcessingStatus.job_id)
             .where(JobProcessingStatus.status == "Postponed")
             .distinct()
+            .execution_options(query_name="postponed_sources")
         )
         available_sources = [source for source in session.exec(
             all_sources_statement).all()]
 
-        # Convert Job to PendingJobRead
-        postponed_jobs = [
-            PendingJobRead(
-                id=job.id,
-                title=job.title,
-                url=job.url,
-                source=job.source,
-                description=job.description,
-                company=job.company,
-                company_url=job.company_url,
-                apply_url=job.apply_url,
-                salary=job.salary,
-                parsed_at=job.parsed_at,
-                matching_results=job.matching_results,
-                amocrm_lead_id=job.amocrm_lead_id
-            )
-            for job in jobs
-        ]
-
-        return PendingJobsResponse(
-            jobs=postponed_jobs,
-            available_sources=available_sources
-        )
+        return ORJSONResponse({
+            "jobs": rows_to_pending_jobs(rows),
+            "available_sources": available_sources,
+        })
     except Exception:
         # Return empty list if enum value doesn't exist yet
-        return PendingJobsResponse(jobs=[], available_sources=[])
+        return ORJSONResponse({"jobs": [], "available_sources": []})
 
 
 @router.post("/matching/run")
 async def manual_matching(
     background_tasks: BackgroundTasks,
+    profile: bool = False,
     session: Session = Depends(get_session),
 ):
     """
     Manually trigger the matching process of developers with jobs.
     This runs in the background and sends results to Slack.
+    With profile=true the run is profiled (GET /api/system/profiles).
     """
     # Import here to avoid circular dependency issues at startup
     from app.matching import run_matching, send_matching_results
+    from app.utils.profiling import profile_run
     
     async def run_matching_task():
         """Wrapper to run matching with proper session handling"""
@@ -407,9 +387,11 @@ async def manual_matching(
         
         session = next(get_session())
         try:
-            results = await run_matching(session)
+            async with profile_run("matching", "matching", enabled=profile):
+                results = await run_matching(session)
+                if results:
+                    await send_matching_results(results, session)
             if results:
-                await send_matching_results(results, session)
                 logger.info(f"✅ Матчинг завершен. Найдено совпадений для {len(results)} вакансий")
                 await send_slack_message(f"✅ Ручной матчинг завершен. Обработано {len(results)} вакансий")
             else:
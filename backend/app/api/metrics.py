@@ -0,0 +1,20 @@
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.config import settings
+
+router = APIRouter(tags=["system"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str = Header(default="")):
+    """
+    Метрики в текстовом формате Prometheus (app.metrics): загрузки страниц,
+    ответы сайтов, вакансии, вызовы LLM, запросы к БД и к API.
+    """
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+            authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from app.auth import get_current_user
+from app.models import User
+from app.utils.executor import get_executor_stats
+from app.utils.http import get_http_stats
+from app.utils.limiter import get_limiter_stats
+from app.utils.profiling import ARTIFACTS, get_profile_artifact, list_profiles
+from app.utils.retry import get_breaker_stats
+
+router = APIRouter(
+    prefix="/system",
+    tags=["system"]
+)
+
+
+@router.get("/executor")
+async def executor_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Состояние пула процессов для парсинга: число воркеров,
+    задачи в работе, глубина очереди и счетчики выполненных задач.
+    """
+    return get_executor_stats()
+
+
+@router.get("/http")
+async def http_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Общие HTTP клиенты внешних API: запросы, открытые и
+    переиспользованные соединения и ответы по HTTP/2 по каждому хосту.
+    """
+    return get_http_stats()
+
+
+@router.get("/limits")
+async def limiter_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Адаптивные лимиты параллельности загрузок по сайтам: текущий лимит,
+    запросы в работе, задержка, таймауты и ответы 429/403, а также
+    состояние circuit breaker сайта (closed / open / half_open).
+    """
+    stats = get_limiter_stats()
+    for host, circuit in get_breaker_stats().items():
+        stats.setdefault(host, {}).update(circuit)
+    return stats
+
+
+@router.get("/profiles")
+async def profiles(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Сохраненные профили запусков парсеров и матчинга (?profile=true у ручного
+    запуска или PROFILE_RUNS), от новых к старым: длительность, самые загруженные
+    задачи asyncio и ссылки на файлы профиля.
+    """
+    return list_profiles()
+
+
+@router.get("/profiles/{run_id}/{artifact}")
+async def profile_artifact(
+    run_id: str,
+    artifact: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Файл профиля: stacks.folded (свернутые стеки для flamegraph.pl / speedscope),
+    tasks.json (время задач asyncio) или run.json (запись о запуске).
+    """
+    path = get_profile_artifact(run_id, artifact)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type=ARTIFACTS[artifact], filename=f"{run_id}-{artifact}")
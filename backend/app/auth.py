@@ -1,11 +1,16 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
+from app.config import settings
 from app.db import get_session
+from app.metrics import AUTH_USER_LOOKUP_SECONDS
 from app.models import User, TokenData
 
 # to get a string like this run:
@@ -17,6 +22,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 8 * 60 * 5
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Кэш пользователей по subject токена: email -> (время записи, данные пользователя)
+_user_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -37,6 +45,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def _get_cached_user(email: str) -> Optional[User]:
+    """Вернуть пользователя из кэша или None, если записи нет или она устарела"""
+    entry = _user_cache.get(email)
+    if entry is None:
+        return None
+    cached_at, data = entry
+    if time.monotonic() - cached_at > settings.AUTH_USER_CACHE_TTL_SECONDS:
+        del _user_cache[email]
+        return None
+    _user_cache.move_to_end(email)
+    # Отдаем новый detached-объект, чтобы запросы не делили один ORM-инстанс
+    return User(**data)
+
+
+def _cache_user(user: User) -> None:
+    """Сохранить пользователя в кэш, вытесняя самые старые записи"""
+    _user_cache[user.email] = (time.monotonic(), user.model_dump())
+    _user_cache.move_to_end(user.email)
+    while len(_user_cache) > settings.AUTH_USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+
+
+def invalidate_cached_user(email: Optional[str] = None) -> None:
+    """
+    Сбросить кэш пользователя после его изменения.
+    Без аргументов очищает кэш целиком.
+    """
+    if email is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(email, None)
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,12 +89,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: Session
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, user_id=payload.get("uid"))
     except JWTError:
         raise credentials_exception
 
-    user = session.exec(select(User).where(
-        User.email == token_data.email)).first()
+    started = time.perf_counter()
+    user = _get_cached_user(token_data.email)
+    source = "cache" if user is not None else "db"
     if user is None:
-        raise credentials_exception
+        # Новые токены содержат id пользователя — ищем по первичному ключу
+        if token_data.user_id:
+            try:
+                user = session.get(User, UUID(token_data.user_id))
+            except ValueError:
+                raise credentials_exception
+        else:
+            user = session.exec(select(User).where(
+                User.email == token_data.email)).first()
+        if user is None or user.email != token_data.email:
+            raise credentials_exception
+        _cache_user(user)
+    # Число попаданий в кэш — _count{source="cache"}, промахов — _count{source="db"}
+    AUTH_USER_LOOKUP_SECONDS.labels(source).observe(time.perf_counter() - started)
     return user
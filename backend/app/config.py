@@ -41,6 +41,10 @@ class Settings(BaseSettings):
     # just remote
     JUST_REMOTE_LOGIN: Optional[str] = None
     JUST_REMOTE_PWD: Optional[str] = None
+    # Сохраненная между запусками сессия (cookies/localStorage), зашифрована Fernet-ключом;
+    # без ключа сессия не сохраняется и парсер логинится при каждом запуске
+    JUST_REMOTE_STATE_PATH: str = "cache/justremote_state.bin"
+    JUST_REMOTE_STATE_KEY: Optional[str] = None
 
     # AmoCRM
     AMOCRM_TOKEN: Optional[str] = None
@@ -56,6 +60,48 @@ class Settings(BaseSettings):
     # API
     API_V1_PREFIX: str = "/api"
 
+    # Кэш пользователей в get_current_user
+    AUTH_USER_CACHE_TTL_SECONDS: int = 300
+    AUTH_USER_CACHE_SIZE: int = 1024
+
+    # Кэш загруженных страниц вакансий, без листингов и лент API (0 часов — кэш выключен)
+    PAGE_CACHE_PATH: str = "cache/pages.sqlite3"
+    PAGE_CACHE_MAX_MB: int = 512
+    PAGE_CACHE_TTL_HOURS: int = 12
+
+    # Процессы для разбора HTML и очистки описаний (0 — разбор в потоке основного процесса)
+    PARSE_WORKERS: int = 2
+
+    # Общие HTTP клиенты внешних API: соединения на хост, keep-alive, таймауты, повторы соединения
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_KEEPALIVE_SECONDS: float = 60.0
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_RETRIES: int = 2
+
+    # Адаптивная параллельность загрузок страниц на сайт: стартовый, минимальный и максимальный лимит
+    ADAPTIVE_CONCURRENCY_INITIAL: int = 4
+    ADAPTIVE_CONCURRENCY_MIN: int = 1
+    ADAPTIVE_CONCURRENCY_MAX: int = 16
+
+    # Повторы загрузки страниц (экспоненциальная пауза со случайным разбросом) и пауза
+    # запросов к сайту после CIRCUIT_FAILURE_THRESHOLD ошибок подряд
+    FETCH_RETRY_ATTEMPTS: int = 3
+    FETCH_RETRY_BASE_SECONDS: float = 1.0
+    FETCH_RETRY_MAX_SECONDS: float = 30.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 60.0
+
+    # Prometheus-метрики GET /metrics; если задан токен, нужен заголовок Authorization: Bearer <токен>
+    METRICS_TOKEN: Optional[str] = None
+
+    # Профилирование запусков парсеров и матчинга (app.utils.profiling): для всех запусков
+    # или по ?profile=true у ручного запуска; каталог профилей, интервал срезов стека, сколько хранить
+    PROFILE_RUNS: bool = False
+    PROFILE_DIR: str = "cache/profiles"
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILE_KEEP: int = 50
+
     # CORS
     CORS_ORIGINS: list[str] = ["*"]
 
@@ -3,6 +3,7 @@
 import os
 from sqlmodel import SQLModel, create_engine, Session
 from dotenv import load_dotenv
+from app.metrics import instrument_engine
 
 load_dotenv()
 
@@ -14,6 +15,7 @@ DB_PORT = os.getenv("DB_PORT", "5432")
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 engine = create_engine(DATABASE_URL, echo=True)
+instrument_engine(engine)
 
 
 def get_session():
@@ -1,10 +1,26 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import jobs, auth, analytics
+from fastapi.responses import ORJSONResponse
+from app.api import jobs, auth, analytics, system, metrics
 from app.db import init_db
+from app.metrics import observe_api_request
 from app.scheduler import start_scheduler
+from app.utils.executor import shutdown_executor
+from app.utils.http import close_http_clients
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    start_scheduler()
+    yield
+    await close_http_clients()
+    shutdown_executor()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -15,13 +31,22 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        observe_api_request(request.scope, request.method, status_code, time.perf_counter() - started)
+
+
 # Include routers
 app.include_router(jobs.router, prefix="/api", tags=["jobs"])
 app.include_router(auth.router, prefix="/api", tags=["auth"])
 app.include_router(analytics.router, prefix="/api", tags=["analytics"])
-
-
-@app.on_event("startup")
-def on_startup():
-    init_db()
-    start_scheduler()
+app.include_router(system.router, prefix="/api", tags=["system"])
+app.include_router(metrics.router)
@@ -1,16 +1,28 @@
-import httpx
 from typing import List, Dict, Any
+from urllib.parse import urlparse
 from sqlmodel import Session, select
 from app.models import Job, JobProcessingStatus
 from app.config import settings
 from app.logger import logger
+from app.metrics import LLM_CACHE_HITS
 from app.utils.openrouter import evaluate_match_batch
 from app.utils.slack import send_slack_message, send_crm_lead_created_alert
 from app.utils.amocrm import create_amocrm_lead
+from app.utils.http import get_http_client
+from app.utils.keywords import KeywordMatcher
 from datetime import datetime
 import re
 
 
+OFFICE_KEYWORDS = [
+    'office', 'onsite', 'on-site', 'офис', 'в офис', 
+    'визит в офис', 'офисная', 'офисное', 'on site'
+]
+# Stems that match with any ending: 'offices', 'в офисе', 'офиса'
+OFFICE_PREFIXES = ['office', 'офис']
+OFFICE_KEYWORDS_MATCHER = KeywordMatcher(OFFICE_KEYWORDS, prefixes=OFFICE_PREFIXES)
+
+
 async def fetch_developers() -> List[Dict[str, Any]]:
     """
     Fetch all active developers from the external API.
@@ -19,22 +31,33 @@ async def fetch_developers() -> List[Dict[str, Any]]:
         List of developer dictionaries
     """
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(settings.DEVELOPERS_API_URL)
+        client = get_http_client(urlparse(settings.DEVELOPERS_API_URL).netloc)
+        response = await client.get(settings.DEVELOPERS_API_URL)
+        
+        if response.status_code == 200:
+            developers = response.json()
+            logger.info(f"📊 Получено {len(developers)} разработчиков из API")
+            return developers
+        else:
+            logger.error(f"❌ Ошибка при получении разработчиков: {response.status_code}")
+            return []
             
-            if response.status_code == 200:
-                developers = response.json()
-                logger.info(f"📊 Получено {len(developers)} разработчиков из API")
-                return developers
-            else:
-                logger.error(f"❌ Ошибка при получении разработчиков: {response.status_code}")
-                return []
-                
     except Exception as e:
         logger.error(f"❌ Ошибка при запросе к API разработчиков: {str(e)}")
         return []
 
 
+def apply_matching_results(job: Job, matching_data: Dict[str, Any]) -> None:
+    """
+    Save matching results on the job together with the denormalized
+    top_match_score / matches_count columns used for indexed filtering.
+    """
+    scores = [match["score"] for match in matching_data.get("matches", [])]
+    job.matching_results = matching_data
+    job.matches_count = len(scores)
+    job.top_match_score = max(scores) if scores else None
+
+
 def filter_jobs(jobs: List[Job]) -> List[Job]:
     """
     Filter jobs to only include remote positions.
@@ -46,20 +69,15 @@ def filter_jobs(jobs: List[Job]) -> List[Job]:
     Returns:
         Filtered list of remote jobs
     """
-    office_keywords = [
-        'office', 'onsite', 'on-site', 'офис', 'в офис', 
-        'визит в офис', 'офисная', 'офисное', 'on site'
-    ]
-    
     filtered = []
     
     for job in jobs:
         # Check title and description for office keywords
-        text_to_check = f"{job.title} {job.description or ''}".lower()
+        office_hits = OFFICE_KEYWORDS_MATCHER.find(job.title, job.description or '')
         
         # Skip if any office keyword is found
-        if any(keyword in text_to_check for keyword in office_keywords):
-            logger.info(f"⚠️ Пропускаю вакансию (требуется офис): {job.title}")
+        if office_hits:
+            logger.info(f"⚠️ Пропускаю вакансию (требуется офис: {', '.join(sorted(office_hits))}): {job.title}")
             continue
         
         filtered.append(job)
@@ -87,26 +105,34 @@ async def run_matching(session: Session) -> Dict[str, List[Dict[str, Any]]]:
         logger.warning("⚠️ Не найдено активных разработчиков")
         return {}
     
-    # Step 2: Get ALL unprocessed jobs (not yet processed by manager)
-    all_unprocessed_statement = (
+    # Step 2: Get unprocessed jobs (not yet processed by manager).
+    # Matching state is read from the indexed columns, so saved blobs without
+    # any candidates are never loaded. Copies of a vacancy from other sources
+    # are matched once, through their canonical job
+    unprocessed_statement = (
         select(Job)
         .outerjoin(JobProcessingStatus, Job.id == JobProcessingStatus.job_id)
         .where(JobProcessingStatus.job_id == None)
+        .where(Job.canonical_job_id == None)
     )
-    all_unprocessed_jobs = session.exec(all_unprocessed_statement).all()
+    jobs_needing_matching = session.exec(
+        unprocessed_statement.where(Job.matching_results == None)
+        .execution_options(query_name="matching_new_jobs")
+    ).all()
+    jobs_already_matched = session.exec(
+        unprocessed_statement.where(Job.matches_count > 0)
+        .execution_options(query_name="matching_matched_jobs")
+    ).all()
     
-    if not all_unprocessed_jobs:
+    if not jobs_needing_matching and not jobs_already_matched:
         logger.warning("⚠️ Не найдено необработанных вакансий")
         return {}
     
-    logger.info(f"📊 Найдено {len(all_unprocessed_jobs)} необработанных вакансий")
-    
-    # Step 3: Separate jobs into those needing matching and those already matched
-    jobs_needing_matching = [job for job in all_unprocessed_jobs if job.matching_results is None]
-    jobs_already_matched = [job for job in all_unprocessed_jobs if job.matching_results is not None]
-    
+    # Step 3: Log jobs needing matching and jobs with saved candidates
     logger.info(f"🆕 Новых вакансий для матчинга: {len(jobs_needing_matching)}")
-    logger.info(f"✅ Вакансий с сохраненными результатами: {len(jobs_already_matched)}")
+    logger.info(f"✅ Вакансий с сохраненными кандидатами: {len(jobs_already_matched)}")
+    # Сохраненные результаты используются вместо нового вызова LLM
+    LLM_CACHE_HITS.inc(len(jobs_already_matched))
     
     # Step 4: Initialize results dictionary with jobs that already have matching results
     results = {}
@@ -201,7 +227,7 @@ async def run_matching(session: Session) -> Dict[str, List[Dict[str, Any]]]:
                     for match in job_matches
                 ]
             }
-            job.matching_results = matching_data
+            apply_matching_results(job, matching_data)
             session.add(job)
             session.commit()
             
@@ -0,0 +1,99 @@
+"""
+Метрики Prometheus парсеров, матчинга, БД и API, отдаются GET /metrics.
+Значения меток — хосты, источники, шаблоны путей и имена запросов, не URL и не id.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Секунды: от запроса к БД до загрузки страницы с ожиданием тишины в сети
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+RUN_BUCKETS = (10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0, 7200.0)
+
+PAGE_FETCH_SECONDS = Histogram(
+    "scraper_page_fetch_seconds", "Duration of one page load attempt in the browser",
+    ["host", "outcome"], buckets=SLOW_BUCKETS)
+BROWSER_PAGES_OPEN = Gauge(
+    "scraper_browser_pages_open", "Pages open in running Chromium browsers")
+HTTP_RESPONSES = Counter(
+    "scraper_http_responses_total", "Responses of scraped sites and external APIs",
+    ["host", "client", "status"])
+JOBS_INSERTED = Counter(
+    "scraper_jobs_inserted_total", "New jobs stored by parser runs", ["source"])
+JOBS_DUPLICATES = Counter(
+    "scraper_jobs_duplicates_total",
+    "Jobs skipped as already stored: before loading details (listing) or on write",
+    ["source", "stage"])
+PARSER_RUN_SECONDS = Histogram(
+    "scraper_run_seconds", "Duration of parser runs", ["source", "outcome"], buckets=RUN_BUCKETS)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds", "Duration of LLM API calls", ["model", "outcome"], buckets=SLOW_BUCKETS)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "LLM tokens by kind: prompt, completion, cached (prompt tokens served from cache)",
+    ["model", "kind"])
+LLM_CACHE_HITS = Counter(
+    "llm_cache_hits_total", "Jobs matched from saved results without a new LLM call")
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds", "Duration of DB queries", ["query"], buckets=FAST_BUCKETS)
+API_REQUEST_SECONDS = Histogram(
+    "api_request_seconds", "Duration of API requests", ["method", "route", "status"], buckets=FAST_BUCKETS)
+AUTH_USER_LOOKUP_SECONDS = Histogram(
+    "auth_user_lookup_seconds", "Resolving the user of an API token: from the user cache or the DB",
+    ["source"], buckets=FAST_BUCKETS)
+
+
+def observe_page_fetch(host: str, outcome: str, seconds: float) -> None:
+    PAGE_FETCH_SECONDS.labels(host, outcome).observe(seconds)
+
+
+def count_http_response(host: str, client: str, status: Optional[int]) -> None:
+    HTTP_RESPONSES.labels(host, client, str(status) if status is not None else "none").inc()
+
+
+def count_llm_usage(model: str, usage: Dict[str, Any]) -> None:
+    """Token counts of an OpenAI-compatible "usage" object."""
+    LLM_TOKENS.labels(model, "prompt").inc(usage.get("prompt_tokens") or 0)
+    LLM_TOKENS.labels(model, "completion").inc(usage.get("completion_tokens") or 0)
+    details = usage.get("prompt_tokens_details") or {}
+    LLM_TOKENS.labels(model, "cached").inc(details.get("cached_tokens") or 0)
+
+
+def observe_api_request(scope: Dict[str, Any], method: str, status: int, seconds: float) -> None:
+    # Шаблон пути маршрута (/api/jobs/{job_id}), а не сам путь; 404 без маршрута — одной меткой
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    API_REQUEST_SECONDS.labels(method, path, str(status)).observe(seconds)
+
+
+def query_name(context, statement: str) -> str:
+    name = context.execution_options.get("query_name") if context is not None else None
+    if name:
+        return name
+    verb = statement.lstrip().split(None, 1)[:1]
+    return verb[0].lower() if verb else "other"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every query of the engine into db_query_seconds."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.labels(query_name(context, statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        timers = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if timers:
+            timers.pop()
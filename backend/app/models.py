@@ -5,7 +5,9 @@ import uuid
 from uuid import UUID
 from enum import Enum
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import JSON
+from sqlalchemy import BigInteger, Computed, ForeignKey, Index, Uuid
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 
 
 class JobProcessingStatusEnum(str, Enum):
@@ -26,10 +28,34 @@ class JobProcessingStatus(SQLModel, table=True):
     user: Optional["User"] = Relationship(back_populates="processed_jobs")
 
 
+# tsvector для полнотекстового поиска по вакансиям: английская и русская
+# морфология, заголовок весит больше компании, компания больше описания.
+# Должно совпадать с SEARCH_VECTOR_SQL миграции b3c4d5e6f7a8 символ в символ:
+# миграция хранит свою копию выражения и не меняется. Новое выражение —
+# только вместе с новой миграцией, которая пересоздает колонку search_vector
+JOB_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C')"
+)
+# Генерируется PostgreSQL при вставке/обновлении, в приложении не заполняется.
+# Нужен только в WHERE/ORDER BY поиска, поэтому select(Job) его не загружает (deferred)
+JOB_SEARCH_VECTOR_COLUMN = Column("search_vector", TSVECTOR, Computed(JOB_SEARCH_VECTOR_SQL, persisted=True))
+
+
 class Job(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_job_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # Column() не принимает deferred=True, отложенную загрузку задает свойство маппера
+    __mapper_args__ = {"properties": {"search_vector": deferred(JOB_SEARCH_VECTOR_COLUMN)}}
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str
-    url: str
+    url: str = Field(index=True)
     source: str
     description: Optional[str] = None
     company: Optional[str] = None
@@ -38,15 +64,42 @@ class Job(SQLModel, table=True):
     salary: Optional[str] = None
     parsed_at: datetime = Field(default_factory=datetime.utcnow)
     matching_results: Optional[Dict[str, Any]] = Field(
-        default=None, sa_column=Column(JSON))
+        default=None, sa_column=Column(JSONB(none_as_null=True)))
+    # Денормализованные поля из matching_results для фильтрации и сортировки по скору
+    top_match_score: Optional[int] = None
+    matches_count: Optional[int] = Field(default=None, index=True)
     # AmoCRM integration fields
     amocrm_lead_id: Optional[str] = None
     amocrm_created_at: Optional[datetime] = None
+    # Та же вакансия с другой площадки: ссылка на первую сохраненную копию.
+    # Дубликаты не матчатся и не показываются в списках на разбор
+    canonical_job_id: Optional[UUID] = Field(
+        default=None, foreign_key="job.id", ondelete="SET NULL", index=True)
+    search_vector: Optional[str] = Field(default=None, sa_column=JOB_SEARCH_VECTOR_COLUMN)
 
     processing_status: Optional[JobProcessingStatus] = Relationship(
         back_populates="job")
 
 
+# Сортировка по скору: DESC NULLS LAST, чтобы несматченные вакансии шли в конце
+Index(
+    "ix_job_top_match_score",
+    Job.__table__.c.top_match_score.desc().nulls_last(),
+)
+
+
+class JobSignature(SQLModel, table=True):
+    """MinHash-сигнатура вакансии и хэши LSH-полос для поиска почти-дубликатов"""
+    __table_args__ = (
+        Index("ix_jobsignature_bands", "bands", postgresql_using="gin"),
+    )
+
+    job_id: UUID = Field(
+        sa_column=Column(Uuid, ForeignKey("job.id", ondelete="CASCADE"), primary_key=True))
+    signature: List[int] = Field(sa_column=Column(ARRAY(BigInteger), nullable=False))
+    bands: List[int] = Field(sa_column=Column(ARRAY(BigInteger), nullable=False))
+
+
 class JobProcessingStatusRead(BaseModel):
     status: str
     comment: str
@@ -103,3 +156,4 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    user_id: Optional[str] = None
@@ -4,14 +4,13 @@ Fetches remote developer/engineer jobs from RapidAPI Active Jobs DB.
 Uses API-level filtering for date, remote status, and job titles.
 """
 
-import httpx
-import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from sqlmodel import Session, select
+from typing import AsyncIterator, List, Dict, Any, Optional
+from sqlmodel import Session
 from app.models import Job
 from app.logger import logger
-from app.utils.slack import send_slack_message
+from app.parsers.base import Parser, RunContext
+from app.utils.http import get_http_client
 from app.config import settings
 
 
@@ -111,31 +110,31 @@ async def fetch_jobs_from_api() -> List[Dict[str, Any]]:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(API_URL, headers=headers, params=params)
-            
-            logger.info(f"📡 API response: status={response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list):
-                    logger.info(f"📊 Received {len(data)} jobs from Active Jobs DB API")
-                    return data
-                elif isinstance(data, dict):
-                    # Some APIs wrap results in a dict
-                    jobs = data.get("jobs", data.get("data", data.get("results", [])))
-                    if isinstance(jobs, list):
-                        logger.info(f"📊 Received {len(jobs)} jobs from Active Jobs DB API (from dict)")
-                        return jobs
-                    logger.warning("⚠️ Unexpected API response format: dict without jobs list")
-                    return []
-                else:
-                    logger.warning(f"⚠️ Unexpected API response format: {type(data)}")
-                    return []
+        client = get_http_client(API_HOST, timeout=60.0)
+        response = await client.get(API_URL, headers=headers, params=params)
+        
+        logger.info(f"📡 API response: status={response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list):
+                logger.info(f"📊 Received {len(data)} jobs from Active Jobs DB API")
+                return data
+            elif isinstance(data, dict):
+                # Some APIs wrap results in a dict
+                jobs = data.get("jobs", data.get("data", data.get("results", [])))
+                if isinstance(jobs, list):
+                    logger.info(f"📊 Received {len(jobs)} jobs from Active Jobs DB API (from dict)")
+                    return jobs
+                logger.warning("⚠️ Unexpected API response format: dict without jobs list")
+                return []
             else:
-                logger.error(f"❌ API error: {response.status_code} - {response.text[:500]}")
+                logger.warning(f"⚠️ Unexpected API response format: {type(data)}")
                 return []
-                
+        else:
+            logger.error(f"❌ API error: {response.status_code} - {response.text[:500]}")
+            return []
+            
     except Exception as e:
         logger.error(f"❌ Error during API request: {str(e)}")
         return []
@@ -197,92 +196,27 @@ def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-async def scrape_activejobs_db(session: Session) -> List[Job]:
-    """
-    Main function to scrape Active Jobs DB from RapidAPI.
-    Fetches from API (filtering done at API level) and saves to database.
-    """
-    all_jobs = []
-    start_time = time.time()
-    
-    # Statistics for report
-    stats = {
-        "total_fetched": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-    }
-    
-    try:
-        # Fetch jobs from API (already filtered by API)
+class ActiveJobsDbParser(Parser):
+    slug = "activejobs-db"
+    source = SOURCE
+    requires_auth = False
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, Any]]:
+        """Jobs of the API response (filtered by API), mapped to Job fields."""
         jobs_data = await fetch_jobs_from_api()
-        stats["total_fetched"] = len(jobs_data)
-        
         if not jobs_data:
             logger.warning("⚠️ No jobs received from Active Jobs DB API")
-            await send_slack_message(f"⚠️ {SOURCE}: no jobs received from API")
-            return []
         
-        # Process jobs
         for job_data in jobs_data:
-            # Map to model
-            job_info = map_job_to_model(job_data)
-            
-            # Skip if no URL
-            if not job_info["url"]:
-                logger.warning(f"⚠️ Skipping job without URL: {job_info['title']}")
-                continue
-            
-            # Check for duplicates
-            existing = session.exec(
-                select(Job).where(Job.url == job_info["url"])
-            ).first()
-            
-            if existing:
-                stats["duplicates_skipped"] += 1
-                logger.debug(f"⏭️ Skipping duplicate: {job_info['title']}")
-                continue
-            
-            # Create and save job
-            job = Job(
-                title=job_info["title"],
-                url=job_info["url"],
-                description=job_info["description"],
-                company=job_info["company"],
-                company_url=job_info.get("company_url"),
-                apply_url=job_info.get("apply_url"),
-                salary=job_info["salary"],
-                source=SOURCE,
-                parsed_at=job_info["parsed_at"],
-            )
-            
-            session.add(job)
-            all_jobs.append(job)
-            stats["added_to_db"] += 1
-            logger.info(f"✅ Saved: {job_info['title']} @ {job_info['company']}")
-        
-        # Commit all jobs
-        session.commit()
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        # Send Slack report
-        report = (
-            f"📊 *Active Jobs DB parsing summary*:\n"
-            f"Total jobs from API: {stats['total_fetched']}\n"
-            f"Added to DB: {stats['added_to_db']}\n"
-            f"Duplicates skipped: {stats['duplicates_skipped']}\n"
-            f"Execution time: {duration:.2f} seconds"
-        )
-        await send_slack_message(report)
-        
-        logger.info(f"✅ {SOURCE} parsing completed. Added {stats['added_to_db']} jobs")
-        
-        return all_jobs
-        
-    except Exception as e:
-        error_message = f"❌ Critical error during {SOURCE} parsing: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Error during {SOURCE} parsing:\n{str(e)}")
-        return []
+            yield map_job_to_model(job_data)
+
+
+parser = ActiveJobsDbParser()
+
 
+async def scrape_activejobs_db(session: Session) -> List[Job]:
+    """
+    Main function to scrape Active Jobs DB from RapidAPI.
+    Fetches from API (filtering done at API level) and saves to database.
+    """
+    return await parser.run(session)
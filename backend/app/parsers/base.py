@@ -0,0 +1,330 @@
+"""
+Common skeleton of the job board parsers.
+
+A parser declares its stages and Parser.run() does the rest:
+
+- open(ctx):       async context manager for run-scoped resources
+                   (Playwright browser, logged in page), stored in ctx.state
+- listings(ctx):   async generator of raw listing items, each with a URL
+- details(item):   fetch and parse the detail page of one new item (optional)
+- map_jobs(items): map items to Job fields (runs in the process pool where
+                   the mapping is CPU-heavy)
+
+Parser.run() connects the stages with bounded queues:
+
+    listings -> known URL check -> detail workers -> DB writer
+
+Items whose URL is already stored are dropped before details are fetched.
+`concurrency` workers load details with retries (how many of them hit
+the site at once is decided by its adaptive limiter, app.utils.limiter),
+and a single writer task persists parsed jobs in batches of
+write_batch_size (or after write_flush_seconds without new results), with
+URL dedup and near-duplicate linking. Full queues stop the listing producer and the workers while the
+writer is behind, and every flushed batch is committed, so a failure late in
+the run keeps the jobs written before it. The run ends with the Slack report.
+A run can be profiled (app.utils.profiling), the report then names the profile.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlmodel import Session
+
+from app.logger import logger
+from app.metrics import JOBS_DUPLICATES, JOBS_INSERTED, PARSER_RUN_SECONDS
+from app.models import Job
+from app.utils.dedup import get_known_urls, link_duplicates, skip_known_jobs
+from app.utils.limiter import get_limiter
+from app.utils.profiling import RunProfile, profile_run
+from app.utils.retry import FetchError, fetch_error_stats
+from app.utils.slack import send_slack_message
+
+Item = Dict[str, Any]
+
+# Строки отчета в Slack по общим счетчикам
+STAT_LABELS = {
+    "total_found": "Всего найдено вакансий",
+    "successfully_parsed": "Успешно обработано",
+    "added_to_db": "Добавлено в БД",
+    "duplicates_skipped": "Пропущено дубликатов",
+    "known_skipped": "Пропущено известных без загрузки",
+    "near_duplicates": "Связано с вакансиями других площадок",
+    "errors": "Ошибок",
+}
+CONCURRENCY_LABEL = "Параллельность загрузок (адаптивная)"
+
+# Неудачные попытки загрузки страниц по классам (app.utils.retry), для парсеров сайтов
+FETCH_ERROR_LABELS = {
+    "fetch_timeout": "Загрузки: таймаут",
+    "fetch_navigation": "Загрузки: ошибка навигации",
+    "fetch_blocked": "Загрузки: блокировка (403/429)",
+    "fetch_empty": "Загрузки: пустая страница",
+    "fetch_circuit_open": "Загрузки: пропущены (сайт на паузе)",
+}
+
+
+@dataclass
+class RunContext:
+    """State of one parser run, passed to every stage."""
+    session: Session
+    stats: Dict[str, int]
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+class Parser:
+    """Base class of a job board parser, see the module docstring."""
+
+    # Путь ручного запуска: POST /api/scrape/{slug}
+    slug: str = ""
+    # Значение Job.source
+    source: str = ""
+    # Название в логах и отчетах (по умолчанию source)
+    name: str = ""
+    # Ручной запуск только для авторизованных пользователей
+    requires_auth: bool = True
+    # Сайт, загрузки с которого ограничивает адаптивный лимитер (пусто — API без лимитера)
+    host: str = ""
+    # Воркеры загрузки деталей: верхняя граница, сама параллельность подбирается лимитером
+    concurrency: int = 16
+    # Попытки обработать детали одной вакансии. Загрузку страницы уже повторяет
+    # fetch_with_retry, поэтому здесь повторяются только ошибки разбора, не FetchError
+    detail_attempts: int = 1
+    detail_retry_delay: float = 2.0
+    # Вакансий в одной транзакции записи и в одной проверке известных URL
+    write_batch_size: int = 20
+    # Запись неполной порции, если новых результатов нет столько секунд
+    write_flush_seconds: float = 10.0
+    # Дополнительные счетчики парсера: ключ -> строка отчета
+    extra_stats: Dict[str, str] = {}
+
+    @property
+    def display_name(self) -> str:
+        return self.name or self.source
+
+    @asynccontextmanager
+    async def open(self, ctx: RunContext) -> AsyncIterator[None]:
+        """Open run-scoped resources (browser, session) and store them in ctx.state."""
+        yield
+
+    def listings(self, ctx: RunContext) -> AsyncIterator[Item]:
+        """Yield raw listing items."""
+        raise NotImplementedError
+
+    def get_url(self, item: Item) -> str:
+        """URL of a listing item, used to skip known jobs before details are loaded."""
+        return item.get("url") or ""
+
+    async def details(self, item: Item, ctx: RunContext) -> Optional[Item]:
+        """Complete a listing item with its detail page, None to drop it."""
+        return item
+
+    def to_job(self, item: Item) -> Item:
+        """Map a parsed item to Job fields (title, url, description, company, ...)."""
+        return item
+
+    async def map_jobs(self, items: List[Item]) -> List[Item]:
+        return [self.to_job(item) for item in items]
+
+    def stat_labels(self) -> Dict[str, str]:
+        return {**STAT_LABELS, **(FETCH_ERROR_LABELS if self.host else {}), **self.extra_stats}
+
+    def new_stats(self) -> Dict[str, int]:
+        return {key: 0 for key in self.stat_labels()}
+
+    async def run(self, session: Session, profile: bool = False) -> List[Job]:
+        """Run all stages, persist new jobs and send the Slack report; profiled if asked or PROFILE_RUNS is set."""
+        async with profile_run("parser", self.slug or self.source, enabled=profile) as run_profile:
+            return await self.run_stages(session, run_profile)
+
+    async def run_stages(self, session: Session, run_profile: Optional[RunProfile] = None) -> List[Job]:
+        start_time = time.time()
+        ctx = RunContext(session=session, stats=self.new_stats())
+        saved: List[Job] = []
+        # Загрузчики страниц считают ошибки в статистику этого запуска (задачи ниже наследуют контекст)
+        stats_token = fetch_error_stats.set(ctx.stats)
+
+        # Очереди ограничены: при отстающей записи встают загрузчики, а за ними и листинг
+        detail_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.write_batch_size * 2)
+        writer = asyncio.create_task(self.write_jobs(write_queue, ctx, saved))
+        workers = [
+            asyncio.create_task(self.detail_worker(detail_queue, write_queue, ctx))
+            for _ in range(self.concurrency)
+        ]
+
+        error = None
+        try:
+            async with self.open(ctx):
+                try:
+                    await self.produce(detail_queue, ctx)
+                except Exception as e:
+                    error = e
+                finally:
+                    # Уже найденные вакансии дозагружаем и записываем и после ошибки листинга
+                    for _ in workers:
+                        await detail_queue.put(None)
+                    await asyncio.gather(*workers)
+        except Exception as e:
+            error = error or e
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await write_queue.put(None)
+            await writer
+            fetch_error_stats.reset(stats_token)
+
+        duration = time.time() - start_time
+        PARSER_RUN_SECONDS.labels(self.source, "error" if error is not None else "ok").observe(duration)
+        if self.host:
+            ctx.stats["concurrency_limit"] = get_limiter(self.host).current_limit
+        if error is not None:
+            logger.error(f"❌ Критическая ошибка при парсинге {self.display_name}: {str(error)}")
+            await send_slack_message(
+                f"❌ Ошибка при парсинге {self.source}:\n{str(error)}\n"
+                f"Сохранено до ошибки: {ctx.stats['added_to_db']}")
+            return saved
+
+        report = self.build_report(ctx.stats, duration)
+        if run_profile is not None:
+            report += f"\nПрофиль запуска: {run_profile.id}"
+        await send_slack_message(report)
+        logger.info(
+            f"✅ Парсинг {self.display_name} завершен за {duration:.2f} секунд. Добавлено {len(saved)} вакансий")
+        return saved
+
+    async def produce(self, detail_queue: asyncio.Queue, ctx: RunContext) -> None:
+        """Feed new listing items to the detail workers, known URLs checked in batches."""
+        seen_urls = set()
+        batch: List[Item] = []
+        try:
+            async for item in self.listings(ctx):
+                url = self.get_url(item)
+                if not url:
+                    logger.warning(f"⚠️ {self.display_name}: пропущена вакансия без URL")
+                    continue
+                # Одна вакансия может попасть в несколько запросов листинга
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                ctx.stats["total_found"] += 1
+
+                batch.append(item)
+                if len(batch) >= self.write_batch_size:
+                    await self.enqueue_new(batch, detail_queue, ctx)
+                    batch = []
+        finally:
+            if batch:
+                await self.enqueue_new(batch, detail_queue, ctx)
+
+    async def enqueue_new(self, items: List[Item], detail_queue: asyncio.Queue, ctx: RunContext) -> None:
+        items, known_skipped = skip_known_jobs(ctx.session, items, self.get_url)
+        ctx.stats["known_skipped"] += known_skipped
+        JOBS_DUPLICATES.labels(self.source, "listing").inc(known_skipped)
+        for item in items:
+            await detail_queue.put(item)
+
+    async def detail_worker(self, detail_queue: asyncio.Queue, write_queue: asyncio.Queue, ctx: RunContext) -> None:
+        while (item := await detail_queue.get()) is not None:
+            parsed = await self.fetch_details(item, ctx)
+            if parsed is not None:
+                ctx.stats["successfully_parsed"] += 1
+                await write_queue.put(parsed)
+
+    async def write_jobs(self, write_queue: asyncio.Queue, ctx: RunContext, saved: List[Job]) -> None:
+        """
+        DB writer: commits parsed items in batches of write_batch_size, or
+        earlier when no new results arrive for write_flush_seconds.
+        """
+        batch: List[Item] = []
+        getter: Optional[asyncio.Future] = None
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(write_queue.get())
+            done, _ = await asyncio.wait({getter}, timeout=self.write_flush_seconds if batch else None)
+            if not done:
+                saved.extend(await self.write_batch(batch, ctx))
+                batch = []
+                continue
+
+            item, getter = getter.result(), None
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) >= self.write_batch_size:
+                saved.extend(await self.write_batch(batch, ctx))
+                batch = []
+
+        if batch:
+            saved.extend(await self.write_batch(batch, ctx))
+
+    async def write_batch(self, items: List[Item], ctx: RunContext) -> List[Job]:
+        """Map and persist one batch; a failed batch is rolled back without stopping the run."""
+        try:
+            return await self.persist(await self.map_jobs(items), ctx)
+        except Exception as e:
+            ctx.session.rollback()
+            ctx.stats["errors"] += len(items)
+            logger.error(f"❌ Ошибка записи {len(items)} вакансий {self.display_name} в БД: {e}")
+            return []
+
+    async def fetch_details(self, item: Item, ctx: RunContext) -> Optional[Item]:
+        for attempt in range(1, self.detail_attempts + 1):
+            try:
+                return await self.details(item, ctx)
+            except Exception as e:
+                if attempt == self.detail_attempts or isinstance(e, FetchError):
+                    ctx.stats["errors"] += 1
+                    logger.error(f"❌ Ошибка при загрузке {self.get_url(item)}: {e}")
+                    return None
+                logger.warning(f"⚠️ Повтор {attempt}/{self.detail_attempts - 1} для {self.get_url(item)}: {e}")
+                await asyncio.sleep(self.detail_retry_delay * attempt)
+        return None
+
+    async def persist(self, jobs_info: List[Item], ctx: RunContext) -> List[Job]:
+        """Insert jobs that are not stored yet, link cross-source copies, commit."""
+        session = ctx.session
+        known_urls = get_known_urls(session, (job_info.get("url") for job_info in jobs_info))
+
+        new_jobs = []
+        for job_info in jobs_info:
+            if not job_info.get("url") or job_info["url"] in known_urls:
+                ctx.stats["duplicates_skipped"] += 1
+                JOBS_DUPLICATES.labels(self.source, "write").inc()
+                logger.info(f"⚠️ Пропущено (дубликат): {job_info.get('title')}")
+                continue
+            known_urls.add(job_info["url"])
+
+            job = Job(
+                title=job_info["title"],
+                url=job_info["url"],
+                description=job_info.get("description"),
+                company=job_info.get("company"),
+                company_url=job_info.get("company_url"),
+                apply_url=job_info.get("apply_url"),
+                salary=job_info.get("salary"),
+                source=self.source,
+                parsed_at=job_info.get("parsed_at") or datetime.utcnow(),
+            )
+            session.add(job)
+            new_jobs.append(job)
+            logger.info(f"✅ Сохранено: {job.title}")
+
+        if new_jobs:
+            ctx.stats["near_duplicates"] += await link_duplicates(session, new_jobs)
+            session.commit()
+            ctx.stats["added_to_db"] += len(new_jobs)
+            JOBS_INSERTED.labels(self.source).inc(len(new_jobs))
+        return new_jobs
+
+    def build_report(self, stats: Dict[str, int], duration: float) -> str:
+        labels = self.stat_labels()
+        if "concurrency_limit" in stats:
+            labels["concurrency_limit"] = CONCURRENCY_LABEL
+        lines = [f"📊 *Сводка по парсингу {self.display_name}*:"]
+        lines += [f"{label}: {stats[key]}" for key, label in labels.items()]
+        lines.append(f"Время выполнения: {duration:.2f} секунд")
+        return "\n".join(lines)
@@ -1,22 +1,18 @@
 import asyncio
-from bs4 import BeautifulSoup, ResultSet
+from bs4 import SoupStrainer
+from contextlib import asynccontextmanager
 from app.models import Job
-from sqlmodel import select, Session
-from datetime import datetime, timedelta
-from app.utils.browser import fetch_html_async
-from typing import Any, Dict, List, Optional
+from sqlmodel import Session
+from app.utils.browser import fetch_html_async, launch_chromium
+from typing import Any, AsyncIterator, Dict, List, Optional
 from app.logger import logger
-from app.utils.slack import send_slack_message
-from functools import lru_cache
-import time
-import uuid
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from app.parsers.base import Parser, RunContext
+from app.utils.page_cache import page_cache_ttl
+from app.utils.html import has_class, make_soup, parse_html
+from app.utils.limiter import get_limiter
+from playwright.async_api import async_playwright
 
 
-# Семафор для ограничения количества одновременных операций
-MAX_CONCURRENT_TABS = 5
-sem = asyncio.Semaphore(MAX_CONCURRENT_TABS)
-
 URLS = [
     "https://jobs.devby.io/?filter[specialization_title]=Front-end/JS&filter[job_types][]=remote_job",
     "https://jobs.devby.io/?filter[job_types][]=remote_job&filter[search]=angular",
@@ -29,251 +25,177 @@ SOURCE = "jobs.devby.io"
 BASE_URL = "https://jobs.devby.io"
 
 
-def remove_duplicate_jobs(jobs_info: List[Any]) -> List[Dict[str, Any]]:
-    """Удаляет дубликаты вакансий по job_link"""
-    unique_jobs = []
-    seen_urls = set()
+# Разбираем только нужные контейнеры, а не всю страницу
+LISTING_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "div" and has_class(attrs, "vacancies-list-item"))
+DETAIL_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "a" or (name == "div" and has_class(attrs, "vacancy__text")))
 
-    for result in jobs_info:
-        if isinstance(result, Exception) or result is None:
-            logger.warning(f"Пропускаем некорректный результат: {result}")
-            continue
 
-        for job in result:
-            job_url = job.get('job_link', '')
-            if job_url and job_url not in seen_urls:
-                seen_urls.add(job_url)
-                unique_jobs.append(job)
+def parse_job_detail(page_html: str) -> Dict[str, str]:
+    """Извлекает описание вакансии и ссылку на компанию со страницы вакансии"""
+    soup = make_soup(page_html, parse_only=DETAIL_STRAINER)
 
-    return unique_jobs
+    # Получаем описание вакансии
+    job_description_div = soup.find("div", class_="vacancy__text")
+    job_description = job_description_div.get_text(
+        strip=True) if job_description_div else "Описание не найдено"
 
+    # Получаем ссылку на компанию
+    company_link_tag = soup.find("a", string="Профиль компании")
+    company_link = company_link_tag.get(
+        "href", "") if company_link_tag else ""
 
-async def get_job_detail(job: Dict[str, Any], browser) -> Optional[Dict[str, Any]]:
-    """Получает детальную информацию о вакансии с использованием семафора"""
-    async with sem:  # Ограничиваем количество одновременных запросов
-        try:
-            page_html = await fetch_html_async(job["job_link"], browser)
-            if not page_html:
-                logger.warning(
-                    f"Не удалось получить HTML для {job['job_link']}")
-                return None
+    return {"company_link": company_link, "job_description": job_description}
 
-            soup = BeautifulSoup(page_html, "html.parser")
 
-            # Получаем описание вакансии
-            job_description_div = soup.find("div", class_="vacancy__text")
-            job_description = job_description_div.get_text(
-                strip=True) if job_description_div else "Описание не найдено"
+def parse_jobs_list(page_html: str) -> List[Dict[str, Any]]:
+    """Извлекает вакансии со страницы списка"""
+    jobs = []
+    soup = make_soup(page_html, parse_only=LISTING_STRAINER)
+    jobs_divs = soup.find_all('div', class_='vacancies-list-item')
 
-            # Получаем ссылку на компанию
-            company_link_tag = soup.find("a", string="Профиль компании")
-            company_link = company_link_tag.get(
-                "href", "") if company_link_tag else ""
+    if len(jobs_divs) <= 1:
+        return []
 
-            job["company_link"] = company_link
-            job["job_description"] = job_description
-
-            logger.info(f"✅ Получены детали для: {job['title']}")
-            return job
-
-        except Exception as e:
-            logger.error(
-                f"❌ Ошибка получения деталей для {job.get('title', 'Unknown')}: {e}")
-            return None
-
-
-async def get_jobs_details_from_page(url: str, browser) -> Optional[List[Dict[str, Any]]]:
-    """Получает список вакансий со страницы с использованием семафора"""
-    async with sem:  # Ограничиваем количество одновременных запросов
+    # Исключаем последний элемент (обычно это пагинация)
+    for job_div in jobs_divs[:-1]:
         try:
-            jobs = []
-            page_html = await fetch_html_async(url, browser)
-
-            if not page_html:
-                logger.warning(f"Не удалось получить HTML для {url}")
-                return None
+            job_link_tag = job_div.find("a")
+            if not job_link_tag:
+                continue
 
-            soup = BeautifulSoup(page_html, "html.parser")
-            jobs_divs = soup.find_all('div', class_='vacancies-list-item')
+            href = job_link_tag.get("href", "")
+            job_title = job_link_tag.get_text(strip=True)
 
-            if len(jobs_divs) <= 1:
-                logger.info(f'📊 Не найдено вакансий для {url}')
-                return []
+            company_div = job_div.find(
+                'div', class_='vacancies-list-item__company')
+            if not company_div:
+                continue
 
-            # Исключаем последний элемент (обычно это пагинация)
-            for job_div in jobs_divs[:-1]:
-                try:
-                    job_link_tag = job_div.find("a")
-                    if not job_link_tag:
-                        continue
+            # Извлекаем название компании
+            text_parts = [
+                t for t in company_div.contents if t.name != 'span']
+            company_title = ''.join(
+                t.strip() for t in text_parts if isinstance(t, str)).strip()
 
-                    href = job_link_tag.get("href", "")
-                    job_title = job_link_tag.get_text(strip=True)
+            if not company_title:
+                company_title = "Компания не указана"
 
-                    company_div = job_div.find(
-                        'div', class_='vacancies-list-item__company')
-                    if not company_div:
-                        continue
+            job_info = {
+                "title": job_title,
+                "job_link": f"{BASE_URL}/{href.lstrip('/')}",
+                "company_title": company_title
+            }
 
-                    # Извлекаем название компании
-                    text_parts = [
-                        t for t in company_div.contents if t.name != 'span']
-                    company_title = ''.join(
-                        t.strip() for t in text_parts if isinstance(t, str)).strip()
+            jobs.append(job_info)
 
-                    if not company_title:
-                        company_title = "Компания не указана"
+        except Exception as e:
+            logger.error(f"❌ Ошибка парсинга вакансии: {e}")
+            continue
 
-                    job_info = {
-                        "title": job_title,
-                        "job_link": f"{BASE_URL}/{href.lstrip('/')}",
-                        "company_title": company_title
-                    }
+    return jobs
 
-                    jobs.append(job_info)
 
-                except Exception as e:
-                    logger.error(f"❌ Ошибка парсинга вакансии: {e}")
-                    continue
+async def get_job_detail(job: Dict[str, Any], browser) -> Optional[Dict[str, Any]]:
+    """
+    Получает детальную информацию о вакансии.
 
-            logger.info(f"📋 Найдено {len(jobs)} вакансий на странице {url}")
-            return jobs
+    None — только если страницу не удалось загрузить (fetch_html_async уже
+    повторил попытки). Ошибки разбора пробрасываются в Parser.fetch_details:
+    он повторяет загрузку и учитывает ошибку в статистике запуска.
+    """
+    page_html = await fetch_html_async(job["job_link"], browser, cache_ttl=page_cache_ttl())
+    if not page_html:
+        logger.warning(
+            f"Не удалось получить HTML для {job['job_link']}")
+        return None
 
-        except Exception as e:
-            logger.error(f"❌ Ошибка парсинга страницы {url}: {e}")
-            return None
+    job.update(await parse_html(parse_job_detail, page_html))
 
+    logger.info(f"✅ Получены детали для: {job['title']}")
+    return job
 
-async def scrape_devby_jobs(session: Session) -> List[Dict[str, Any]]:
-    """Основная функция скрапинга с улучшенной обработкой ошибок и семафором"""
-    start_time = time.time()
 
-    stats = {
-        "total_found": 0,
-        "successfully_parsed": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-        "errors": 0
-    }
+async def get_jobs_details_from_page(url: str, browser) -> Optional[List[Dict[str, Any]]]:
+    """Получает список вакансий со страницы"""
+    try:
+        page_html = await fetch_html_async(url, browser)
 
-    logger.info(
-        f"🚀 Начинаем парсинг {SOURCE} с максимум {MAX_CONCURRENT_TABS} одновременными вкладками")
+        if not page_html:
+            logger.warning(f"Не удалось получить HTML для {url}")
+            return None
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            # Дополнительные аргументы для стабильности
-            args=['--no-sandbox', '--disable-dev-shm-usage']
-        )
+        jobs = await parse_html(parse_jobs_list, page_html)
 
-        try:
-            # Этап 1: Получаем списки вакансий со всех страниц
-            logger.info("📋 Получаем списки вакансий...")
-            jobs_info = await asyncio.gather(*[
-                get_jobs_details_from_page(url, browser) for url in URLS
-            ], return_exceptions=True)
-
-            # Удаляем дубликаты
-            unique_jobs = remove_duplicate_jobs(jobs_info)
-            stats["total_found"] = len(unique_jobs)
-            logger.info(
-                f"📊 Найдено уникальных вакансий: {stats['total_found']}")
-
-            if not unique_jobs:
-                logger.warning("⚠️ Не найдено вакансий для обработки")
-                return []
-
-            # Этап 2: Получаем детальную информацию о каждой вакансии
-            logger.info("🔍 Получаем детальную информацию о вакансиях...")
-            jobs_details = await asyncio.gather(*[
-                get_job_detail(job, browser) for job in unique_jobs
-            ], return_exceptions=True)
-
-            # Фильтруем успешно обработанные вакансии
-            successful_jobs = []
-            for job_detail in jobs_details:
-                if isinstance(job_detail, Exception):
-                    stats["errors"] += 1
-                    logger.error(f"❌ Ошибка обработки вакансии: {job_detail}")
-                elif job_detail is not None:
-                    successful_jobs.append(job_detail)
-
-            stats["successfully_parsed"] = len(successful_jobs)
-            logger.info(
-                f"✅ Успешно обработано вакансий: {stats['successfully_parsed']}")
-
-            # Этап 3: Сохраняем в базу данных
-            logger.info("💾 Сохраняем в базу данных...")
-            for parsed_job in successful_jobs:
-                try:
-                    existing = session.exec(
-                        select(Job).where(Job.url == parsed_job["job_link"])
-                    ).first()
-
-                    if not existing:
-                        job = Job(
-                            title=parsed_job["title"],
-                            url=parsed_job["job_link"],
-                            description=parsed_job["job_description"],
-                            source=SOURCE,
-                            parsed_at=datetime.utcnow(),
-                            company_url=parsed_job.get("company_link", ""),
-                            company=parsed_job["company_title"]
-                        )
-                        session.add(job)
-                        stats["added_to_db"] += 1
-                        logger.info(f"✅ Сохранено: {parsed_job['title']}")
-                    else:
-                        stats["duplicates_skipped"] += 1
-                        logger.info(
-                            f"⚠️ Пропущено (дубликат): {existing.title}")
-
-                except Exception as e:
-                    logger.error(
-                        f"❌ Ошибка сохранения вакансии {parsed_job.get('title', 'Unknown')}: {e}")
-                    stats["errors"] += 1
-
-            session.commit()
-            logger.info("💾 Изменения сохранены в базу данных")
+        if not jobs:
+            logger.info(f'📊 Не найдено вакансий для {url}')
+            return []
 
-        except Exception as e:
-            logger.error(f"❌ Критическая ошибка в scrape_devby_jobs: {e}")
-            stats["errors"] += 1
-            session.rollback()
-        finally:
-            await browser.close()
-            logger.info("🔒 Браузер закрыт")
-
-    # Формируем и отправляем отчет
-    end_time = time.time()
-    duration = end_time - start_time
-
-    report = (
-        f"📊 *Сводка по парсингу {SOURCE}*:\n"
-        f"Всего найдено вакансий: {stats['total_found']}\n"
-        f"Успешно обработано: {stats['successfully_parsed']}\n"
-        f"Добавлено в БД: {stats['added_to_db']}\n"
-        f"Пропущено дубликатов: {stats['duplicates_skipped']}\n"
-        f"Ошибок: {stats['errors']}\n"
-        f"Время выполнения: {duration:.2f} секунд\n"
-        f"Максимум одновременных вкладок: {MAX_CONCURRENT_TABS}"
-    )
+        logger.info(f"📋 Найдено {len(jobs)} вакансий на странице {url}")
+        return jobs
 
-    try:
-        await send_slack_message(report)
-        logger.info("📤 Отчет отправлен в Slack")
     except Exception as e:
-        logger.error(f"❌ Ошибка отправки отчета в Slack: {e}")
-
-    logger.info(report)
-    return successful_jobs
-
-
-# Функция для настройки семафора (опционально)
-def set_max_concurrent_tabs(max_tabs: int):
-    """Позволяет изменить максимальное количество одновременных вкладок"""
-    global sem, MAX_CONCURRENT_TABS
-    MAX_CONCURRENT_TABS = max_tabs
-    sem = asyncio.Semaphore(max_tabs)
-    logger.info(
-        f"🔧 Установлено максимальное количество одновременных вкладок: {max_tabs}")
+        logger.error(f"❌ Ошибка парсинга страницы {url}: {e}")
+        return None
+
+
+class DevByParser(Parser):
+    slug = "devby-jobs"
+    source = SOURCE
+    name = "devby.jobs"
+    host = "jobs.devby.io"
+
+    @asynccontextmanager
+    async def open(self, ctx: RunContext) -> AsyncIterator[None]:
+        logger.info(
+            f"🚀 Начинаем парсинг {SOURCE}, вкладок одновременно: {get_limiter(self.host).current_limit}")
+        async with async_playwright() as p:
+            browser = await launch_chromium(
+                p,
+                headless=True,
+                # Дополнительные аргументы для стабильности
+                args=['--no-sandbox', '--disable-dev-shm-usage']
+            )
+            ctx.state["browser"] = browser
+            try:
+                yield
+            finally:
+                await browser.close()
+                logger.info("🔒 Браузер закрыт")
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, Any]]:
+        logger.info("📋 Получаем списки вакансий...")
+        jobs_info = await asyncio.gather(*[
+            get_jobs_details_from_page(url, ctx.state["browser"]) for url in URLS
+        ], return_exceptions=True)
+
+        for result in jobs_info:
+            if isinstance(result, Exception) or result is None:
+                logger.warning(f"Пропускаем некорректный результат: {result}")
+                continue
+            for job in result:
+                yield job
+
+    def get_url(self, job: Dict[str, Any]) -> str:
+        return job.get("job_link", "")
+
+    async def details(self, job: Dict[str, Any], ctx: RunContext) -> Optional[Dict[str, Any]]:
+        return await get_job_detail(job, ctx.state["browser"])
+
+    def to_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": job["title"],
+            "url": job["job_link"],
+            "description": job["job_description"],
+            "company_url": job.get("company_link", ""),
+            "company": job["company_title"],
+        }
+
+
+parser = DevByParser()
+
+
+async def scrape_devby_jobs(session: Session) -> List[Job]:
+    """Основная функция скрапинга"""
+    return await parser.run(session)
@@ -4,25 +4,34 @@ Fetches remote jobs from himalayas.app API and filters for software development
 Filters by experience level (mid-level, senior) and employment type (full-time, contractor).
 """
 
+import asyncio
 import httpx
 import re
-import time
 from html import unescape
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Set
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Dict, Any, Optional, Set
 from sqlmodel import Session, select
+from sqlalchemy import func
 from app.models import Job
 from app.logger import logger
-from app.utils.slack import send_slack_message
+from app.parsers.base import Parser, RunContext
+from app.utils.keywords import KeywordMatcher
+from app.utils.executor import run_cpu_bound
+from app.utils.http import get_http_client
 
 
 # API endpoint
-API_URL = "https://himalayas.app/jobs/api"
+API_HOST = "himalayas.app"
+API_URL = f"https://{API_HOST}/jobs/api"
 SOURCE = "himalayas.app"
 
 # Pagination settings
 PAGE_LIMIT = 20  # Max jobs per request (API limit)
-MAX_PAGES = 5    # Total pages to fetch (100 jobs max)
+MAX_PAGES = 100  # Safety cap, pagination normally stops at already stored jobs
+MAX_CONCURRENT_PAGES = 5  # Pages requested in parallel
+
+# Jobs per task sent to the parsing process pool
+MAP_BATCH_SIZE = 100
 
 # Filter settings
 ALLOWED_EXPERIENCE = {"mid-level", "senior"}
@@ -68,6 +77,12 @@ DEV_CATEGORIES: Set[str] = {
     'fullstack',
 }
 
+# Role nouns that also match as word prefixes: 'engineers', 'developers'
+DEV_TAG_PREFIXES: Set[str] = {'developer', 'programmer', 'engineer'}
+
+DEV_TAGS_MATCHER = KeywordMatcher(DEV_TAGS, prefixes=DEV_TAG_PREFIXES)
+DEV_CATEGORIES_MATCHER = KeywordMatcher(DEV_CATEGORIES)
+
 
 def strip_html_tags(html: str) -> str:
     """Remove HTML tags from string and decode HTML entities."""
@@ -100,21 +115,12 @@ def is_dev_job(categories: List[str], title: str) -> bool:
     Returns True if job has ANY dev-related category or title keyword.
     """
     # Check categories
-    if categories:
-        categories_lower = {cat.lower() for cat in categories}
-        for dev_cat in DEV_CATEGORIES:
-            if dev_cat in categories_lower:
-                return True
-            for cat in categories_lower:
-                if dev_cat in cat:
-                    return True
+    if categories and DEV_CATEGORIES_MATCHER.search(*categories):
+        return True
     
     # Check title
-    if title:
-        title_lower = title.lower()
-        for dev_tag in DEV_TAGS:
-            if dev_tag in title_lower:
-                return True
+    if title and DEV_TAGS_MATCHER.search(title):
+        return True
     
     return False
 
@@ -153,77 +159,129 @@ def matches_employment_filter(employment_type: Optional[str]) -> bool:
     return False
 
 
-async def fetch_jobs_from_api(offset: int = 0, limit: int = PAGE_LIMIT) -> List[Dict[str, Any]]:
+async def fetch_jobs_from_api(client: httpx.AsyncClient, offset: int = 0, limit: int = PAGE_LIMIT) -> List[Dict[str, Any]]:
     """
-    Fetch jobs from Himalayas API with pagination.
+    Fetch one page of jobs from Himalayas API.
     Returns list of job dictionaries.
     """
-    headers = {
-        "User-Agent": "JobsParser/1.0 (https://github.com/jobs-parser)",
-        "Accept": "application/json",
-    }
-    
     params = {
         "offset": offset,
         "limit": limit,
     }
     
     try:
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.get(API_URL, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # API returns a list of jobs or dict with jobs key
-                if isinstance(data, list):
-                    jobs = data
-                elif isinstance(data, dict):
-                    jobs = data.get("jobs", data.get("data", []))
-                else:
-                    jobs = []
-                
-                logger.info(f"📊 Fetched {len(jobs)} jobs from Himalayas API (offset={offset})")
-                return jobs
+        response = await client.get(API_URL, params=params)
+        
+        if response.status_code == 200:
+            data = response.json()
+            # API returns a list of jobs or dict with jobs key
+            if isinstance(data, list):
+                jobs = data
+            elif isinstance(data, dict):
+                jobs = data.get("jobs", data.get("data", []))
             else:
-                logger.error(f"❌ Error fetching from Himalayas API: {response.status_code}")
-                return []
-                
+                jobs = []
+            
+            logger.info(f"📊 Fetched {len(jobs)} jobs from Himalayas API (offset={offset})")
+            return jobs
+        else:
+            logger.error(f"❌ Error fetching from Himalayas API: {response.status_code}")
+            return []
+            
     except Exception as e:
         logger.error(f"❌ Error fetching from Himalayas API: {str(e)}")
         return []
 
 
-async def fetch_all_jobs(max_pages: int = MAX_PAGES) -> List[Dict[str, Any]]:
+def get_published_at(job_data: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Parse job publication date from API response.
+    Returns None if the date is missing or has unknown format.
+    """
+    pub_date = job_data.get("pubDate") or job_data.get("publishedAt") or job_data.get("createdAt")
+    if not pub_date:
+        return None
+    try:
+        # Handle various date formats
+        if isinstance(pub_date, str):
+            # ISO format
+            return datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
+        elif isinstance(pub_date, (int, float)):
+            # Unix timestamp
+            return datetime.fromtimestamp(pub_date)
+    except (ValueError, AttributeError, OSError):
+        pass
+    return None
+
+
+def is_older_than(job_data: Dict[str, Any], since: datetime) -> bool:
+    """
+    Check if job was published before `since` (naive UTC, as stored in DB).
+    Jobs without a date are treated as new.
+    """
+    published_at = get_published_at(job_data)
+    if published_at is None:
+        return False
+    if published_at.tzinfo is not None:
+        published_at = published_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return published_at < since
+
+
+async def fetch_all_jobs(
+    since: Optional[datetime] = None,
+    max_pages: int = MAX_PAGES,
+    concurrency: int = MAX_CONCURRENT_PAGES,
+) -> List[Dict[str, Any]]:
     """
-    Fetch all jobs from multiple pages.
-    Stops when no more jobs or max_pages reached.
+    Fetch jobs page by page, `concurrency` pages at a time over the shared keep-alive client.
+    Stops when a page is empty or short, when a page holds only jobs older than
+    `since`, or when max_pages is reached.
     """
     all_jobs = []
-    
-    for page in range(max_pages):
-        offset = page * PAGE_LIMIT
-        jobs = await fetch_jobs_from_api(offset=offset, limit=PAGE_LIMIT)
-        
-        if not jobs:
-            logger.info(f"📊 No more jobs at page {page + 1}, stopping pagination")
-            break
+    headers = {
+        "User-Agent": "JobsParser/1.0 (https://github.com/jobs-parser)",
+        "Accept": "application/json",
+    }
+    client = get_http_client(API_HOST, headers=headers, follow_redirects=True)
+    done = False
+    for batch_start in range(0, max_pages, concurrency):
+        pages = range(batch_start, min(batch_start + concurrency, max_pages))
+        results = await asyncio.gather(*(
+            fetch_jobs_from_api(client, offset=page * PAGE_LIMIT, limit=PAGE_LIMIT)
+            for page in pages
+        ))
         
-        all_jobs.extend(jobs)
+        # Pages are checked in order, later pages of the batch are dropped once we stop
+        for page, jobs in zip(pages, results):
+            if not jobs:
+                logger.info(f"📊 No more jobs at page {page + 1}, stopping pagination")
+                done = True
+                break
+            
+            all_jobs.extend(jobs)
+            
+            # If we got fewer jobs than limit, we've reached the end
+            if len(jobs) < PAGE_LIMIT:
+                logger.info(f"📊 Last page reached at page {page + 1}")
+                done = True
+                break
+            
+            if since and all(is_older_than(job, since) for job in jobs):
+                logger.info(f"📊 Page {page + 1} has only jobs older than {since}, stopping pagination")
+                done = True
+                break
         
-        # If we got fewer jobs than limit, we've reached the end
-        if len(jobs) < PAGE_LIMIT:
-            logger.info(f"📊 Last page reached at page {page + 1}")
+        if done:
             break
+    else:
+        logger.warning(f"⚠️ Himalayas pagination hit the {max_pages} pages cap")
     
     logger.info(f"📊 Total jobs fetched from Himalayas: {len(all_jobs)}")
     return all_jobs
 
 
-def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Map Himalayas API response to Job model fields.
-    """
-    # Build job URL
+def get_job_url(job_data: Dict[str, Any]) -> str:
+    """Build job URL from Himalayas API item."""
     job_url = job_data.get("applicationLink", "")
     if not job_url:
         # Fallback to constructing URL from slug or ID
@@ -234,21 +292,17 @@ def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
             job_id = job_data.get("id", "")
             if job_id:
                 job_url = f"https://himalayas.app/jobs/{job_id}"
+    return job_url
+
+
+def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map Himalayas API response to Job model fields.
+    """
+    job_url = get_job_url(job_data)
     
     # Parse date
-    parsed_at = datetime.utcnow()
-    pub_date = job_data.get("pubDate") or job_data.get("publishedAt") or job_data.get("createdAt")
-    if pub_date:
-        try:
-            # Handle various date formats
-            if isinstance(pub_date, str):
-                # ISO format
-                parsed_at = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-            elif isinstance(pub_date, (int, float)):
-                # Unix timestamp
-                parsed_at = datetime.fromtimestamp(pub_date)
-        except (ValueError, AttributeError, OSError):
-            pass
+    parsed_at = get_published_at(job_data) or datetime.utcnow()
     
     # Format salary
     salary = format_salary(
@@ -275,36 +329,33 @@ def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-async def scrape_himalayas_jobs(session: Session) -> List[Job]:
-    """
-    Main function to scrape Himalayas jobs.
-    Fetches from API, filters by experience/employment type/dev tags, and saves to database.
-    """
-    all_jobs = []
-    start_time = time.time()
-    
-    # Statistics for report
-    stats = {
-        "total_fetched": 0,
-        "dev_jobs_found": 0,
-        "experience_filtered": 0,
-        "employment_filtered": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-        "non_dev_filtered": 0,
+def map_jobs_to_model(jobs_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map a batch of API items, runs in the parsing process pool."""
+    return [map_job_to_model(job_data) for job_data in jobs_data]
+
+
+class HimalayasParser(Parser):
+    slug = "himalayas-jobs"
+    source = SOURCE
+    requires_auth = False
+    extra_stats = {
+        "experience_filtered": "Отфильтровано по опыту",
+        "employment_filtered": "Отфильтровано по типу занятости",
+        "non_dev_filtered": "Отфильтровано не-dev вакансий",
     }
-    
-    try:
-        # Fetch jobs from API
-        jobs_data = await fetch_all_jobs(max_pages=MAX_PAGES)
-        stats["total_fetched"] = len(jobs_data)
-        
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Jobs published since the last stored one, filtered by experience,
+        employment type and dev categories/title.
+        """
+        last_parsed_at = ctx.session.exec(
+            select(func.max(Job.parsed_at)).where(Job.source == SOURCE)
+        ).one()
+        jobs_data = await fetch_all_jobs(since=last_parsed_at)
         if not jobs_data:
             logger.warning("⚠️ No jobs received from Himalayas API")
-            await send_slack_message(f"⚠️ Himalayas: no jobs received from API")
-            return []
         
-        # Filter and process jobs
         for job_data in jobs_data:
             # Get filter fields
             experience = job_data.get("experience") or job_data.get("experienceLevel", "")
@@ -314,80 +365,40 @@ async def scrape_himalayas_jobs(session: Session) -> List[Job]:
             
             # Check experience filter
             if not matches_experience_filter(experience):
-                stats["experience_filtered"] += 1
+                ctx.stats["experience_filtered"] += 1
                 continue
             
             # Check employment type filter
             if not matches_employment_filter(employment_type):
-                stats["employment_filtered"] += 1
+                ctx.stats["employment_filtered"] += 1
                 continue
             
             # Check if it's a dev job
             if not is_dev_job(categories, title):
-                stats["non_dev_filtered"] += 1
+                ctx.stats["non_dev_filtered"] += 1
                 continue
             
-            stats["dev_jobs_found"] += 1
-            
-            # Map to model
-            job_info = map_job_to_model(job_data)
-            
-            # Skip if no URL
-            if not job_info["url"]:
-                logger.warning(f"⚠️ Skipped job without URL: {job_info['title']}")
-                continue
-            
-            # Check for duplicates
-            existing = session.exec(
-                select(Job).where(Job.url == job_info["url"])
-            ).first()
-            
-            if existing:
-                stats["duplicates_skipped"] += 1
-                logger.debug(f"⏭️ Skipped duplicate: {job_info['title']}")
-                continue
-            
-            # Create and save job
-            job = Job(
-                title=job_info["title"],
-                url=job_info["url"],
-                description=job_info["description"],
-                company=job_info["company"],
-                company_url=job_info.get("company_url"),
-                apply_url=job_info.get("apply_url"),
-                salary=job_info["salary"],
-                source=SOURCE,
-                parsed_at=job_info["parsed_at"],
-            )
-            
-            session.add(job)
-            all_jobs.append(job)
-            stats["added_to_db"] += 1
-            logger.info(f"✅ Saved: {job_info['title']} @ {job_info['company']}")
-        
-        # Commit all jobs
-        session.commit()
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        # Send Slack report
-        report = (
-            f"📊 *Сводка по парсингу {SOURCE}*:\n"
-            f"Всего найдено вакансий: {stats['dev_jobs_found']}\n"
-            f"Добавлено в БД: {stats['added_to_db']}\n"
-            f"Пропущено дубликатов: {stats['duplicates_skipped']}\n"
-            f"Время выполнения: {duration:.2f} секунд"
-        )
-        await send_slack_message(report)
-        
-        logger.info(f"✅ Himalayas parsing completed. Added {stats['added_to_db']} jobs")
-        
-        return all_jobs
-        
-    except Exception as e:
-        error_message = f"❌ Critical error while parsing Himalayas: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Error parsing {SOURCE}:\n{str(e)}")
-        return []
+            yield job_data
 
+    def get_url(self, job_data: Dict[str, Any]) -> str:
+        return get_job_url(job_data)
+
+    async def map_jobs(self, jobs_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Description cleanup runs in the parsing process pool, MAP_BATCH_SIZE jobs per task."""
+        batches = [
+            jobs_data[i:i + MAP_BATCH_SIZE]
+            for i in range(0, len(jobs_data), MAP_BATCH_SIZE)
+        ]
+        mapped_batches = await asyncio.gather(*(run_cpu_bound(map_jobs_to_model, batch) for batch in batches))
+        return [job_info for batch in mapped_batches for job_info in batch]
+
+
+parser = HimalayasParser()
+
+
+async def scrape_himalayas_jobs(session: Session) -> List[Job]:
+    """
+    Main function to scrape Himalayas jobs.
+    Fetches from API, filters by experience/employment type/dev tags, and saves to database.
+    """
+    return await parser.run(session)
@@ -1,12 +1,21 @@
+from contextlib import asynccontextmanager
 from sqlmodel import select, Session
-import time
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError, Browser, Page
+from typing import AsyncIterator
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError, Browser, BrowserContext, Page
 from app.config import settings
 from datetime import datetime, date, timedelta, timezone
-from bs4 import BeautifulSoup, ResultSet
-import asyncio
+from bs4 import SoupStrainer
 from app.logger import logger
-from app.utils.slack import send_slack_message
+from app.parsers.base import Parser, RunContext
+from app.utils.browser import fetch_html_async, launch_chromium
+from app.utils.page_cache import page_cache_ttl
+from app.utils.html import has_class, make_soup, parse_html
+from app.utils.browser_state import (
+    delete_browser_state,
+    load_browser_state,
+    make_fernet,
+    save_browser_state,
+)
 from app.models import Job
 import re
 from sqlalchemy import func
@@ -15,8 +24,13 @@ from sqlalchemy import func
 LOGIN_URL = "https://justremote.co/a/sign-in"
 SOURCE = "justremote.co"
 
-MAX_CONCURRENT_TABS = 5
-sem = asyncio.Semaphore(MAX_CONCURRENT_TABS)
+# Разбираем только нужные контейнеры, а не всю страницу
+LISTING_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "div" and has_class(attrs, "infinite-scroll-component"))
+DETAIL_DATA_QA = {"job-description", "salary-range", "closing-description", "show-page-apply"}
+DETAIL_STRAINER = SoupStrainer(
+    lambda name, attrs: attrs.get("data-qa") in DETAIL_DATA_QA
+    or (name == "div" and has_class(attrs, "main-footer")))
 
 def _parse_site_date(text: str, today: date) -> date | None:
     """
@@ -62,8 +76,15 @@ def get_today_formatted_date():
     return f"{day}{suffix} {month}"
 
 
-async def login(browser: Browser) -> Page:
-    page = await browser.new_page()
+DEVELOPER_FILTER = '//div[contains(@class, "power-search-category-filter__Option") and contains(text(), "Developer")]'
+
+
+def _state_fernet():
+    return make_fernet(settings.JUST_REMOTE_STATE_KEY)
+
+
+async def login(context: BrowserContext) -> Page:
+    page = await context.new_page()
 
     await page.goto(LOGIN_URL)
 
@@ -72,32 +93,83 @@ async def login(browser: Browser) -> Page:
     await page.locator('form button').click()
 
     await page.wait_for_load_state("domcontentloaded")
+    # Страница с фильтрами, куда попадаем после логина — с нее начинаем следующие запуски
+    await page.locator(DEVELOPER_FILTER).wait_for(state="visible")
+    return page
+
+
+async def probe_session(page: Page, url: str) -> bool:
+    """Открывает страницу поиска с сохраненной сессией: True, если вход не требуется"""
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        if await page.locator('input[type="password"]').count() > 0:
+            return False
+        await page.locator(DEVELOPER_FILTER).wait_for(state="visible", timeout=10000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
 
-    # await page.locator('div[class*="power-search-category-filter__Option"]:has-text("Developer")').click()
-    await page.locator('//div[contains(@class, "power-search-category-filter__Option") and contains(text(), "Developer")]').click()
+async def open_search_page(browser: Browser) -> Page:
+    """
+    Страница поиска залогиненного пользователя: из сохраненной сессии,
+    если она еще действует, иначе через форму входа (сессия сохраняется).
+    """
+    fernet = _state_fernet()
+    if fernet is None:
+        logger.warning("⚠️ justremote.co: JUST_REMOTE_STATE_KEY не задан, сессия не сохраняется между запусками")
+        # Сессию, сохраненную раньше с другим ключом, на диске не оставляем
+        delete_browser_state(settings.JUST_REMOTE_STATE_PATH)
+        return await login(await browser.new_context())
+
+    saved = load_browser_state(settings.JUST_REMOTE_STATE_PATH, fernet)
+
+    if saved:
+        context = await browser.new_context(storage_state=saved["storage_state"])
+        page = await context.new_page()
+        if await probe_session(page, saved["url"]):
+            logger.info("🔑 justremote.co: сессия восстановлена, логин не нужен")
+            # Обновляем сохраненные cookies — сайт мог их продлить
+            save_browser_state(settings.JUST_REMOTE_STATE_PATH, fernet, {
+                "storage_state": await context.storage_state(),
+                "url": saved["url"],
+            })
+            return page
+        logger.info("🔑 justremote.co: сохраненная сессия недействительна, логинимся заново")
+        await context.close()
+        delete_browser_state(settings.JUST_REMOTE_STATE_PATH)
+
+    context = await browser.new_context()
+    page = await login(context)
+    save_browser_state(settings.JUST_REMOTE_STATE_PATH, fernet, {
+        "storage_state": await context.storage_state(),
+        "url": page.url,
+    })
+    logger.info("🔑 justremote.co: выполнен вход, сессия сохранена")
+    return page
+
+
+async def select_developer_jobs(page: Page) -> None:
+    await page.locator(DEVELOPER_FILTER).click()
     await page.wait_for_load_state("domcontentloaded")
     await page.wait_for_selector("div.infinite-scroll-component")
 
-    return page
 
+def parse_job_rows(page_html: str, last_parsed_date: date | None, today: date) -> tuple[int, list[dict]]:
+    """
+    Извлекает из листинга вакансии не старше last_parsed_date.
 
-async def get_fresh_job_rows(page: "Page", session: "Session"):
-    page_html = await page.content()
-    soup = BeautifulSoup(page_html, "html.parser")
+    Returns:
+        (число свежих строк в листинге, вакансии с заголовком и компанией)
+    """
+    soup = make_soup(page_html, parse_only=LISTING_STRAINER)
 
     container = soup.find("div", class_="infinite-scroll-component")
     if not container:
-        return []
+        return 0, []
 
-    # последний parsed_at ИМЕННО по этому источнику
-    result = session.exec(
-        select(func.max(Job.parsed_at)).where(Job.source == SOURCE)
-    ).one()
-    last_parsed_at = result  # None | datetime
-    last_parsed_date = last_parsed_at.date() if last_parsed_at else None
-
-    today = datetime.now(timezone.utc).date()
-    matching_links = []
+    fresh_rows = 0
+    jobs = []
 
     for child in container.find_all("a", recursive=False):
         date_p = child.find("p", class_=lambda x: x and x.startswith("power-search-job-item__Date"))
@@ -110,165 +182,136 @@ async def get_fresh_job_rows(page: "Page", session: "Session"):
             continue
 
         # если последней джобы для этого источника нет — берём всё
-        if (last_parsed_date is None) or (site_dt >= last_parsed_date):
-            matching_links.append(child)
+        if (last_parsed_date is not None) and (site_dt < last_parsed_date):
+            continue
+        fresh_rows += 1
 
-    return matching_links
+        job_title_tag = child.find("h2")
+        if not job_title_tag:
+            continue
 
+        company_p = child.find("p", class_=lambda x: x and x.startswith(
+            "power-search-job-item__Company"))
+        if not company_p:
+            continue
 
-async def process_job(browser: Browser, job: dict):
-    job_details = dict(job)
+        jobs.append({
+            "href": child["href"],
+            "job_title": job_title_tag.get_text(strip=True),
+            "company_name": company_p.get_text(strip=True)
+        })
 
-    async with sem:
-        page = await browser.new_page()
-        try:
-            try:
-                await page.goto(job['href'], wait_until="domcontentloaded", timeout=60000)
-                await page.wait_for_load_state("networkidle", timeout=10000)
-                await page.wait_for_timeout(1000)
-            except PlaywrightTimeoutError:
-                logger.info(
-                    f"[WARN] Timeout on {job['href']} — trying to proceed anyway")
-
-            soup = BeautifulSoup(await page.content(), "html.parser")
-
-            fields = [
-                soup.find("div", attrs={"data-qa": "job-description"}),
-                soup.find("div", attrs={"data-qa": "salary-range"}),
-                soup.find("div", attrs={"data-qa": "closing-description"})
-            ]
-            job_description = "\n".join(
-                field.get_text(strip=True) for field in fields if field is not None
-            )
-            job_details["job_description"] = job_description
+    return fresh_rows, jobs
 
-            apply_link_tag = soup.find(
-                "a", attrs={"data-qa": "show-page-apply"})
-            if apply_link_tag:
-                job_details["apply_link_href"] = apply_link_tag.get("href")
 
-            footer = soup.find("div", class_="main-footer")
-            if footer:
-                company_link_tag = footer.find("a")
-                if company_link_tag:
-                    job_details["company_href"] = company_link_tag.get("href")
+async def get_fresh_job_rows(page: "Page", session: "Session") -> tuple[int, list[dict]]:
+    page_html = await page.content()
 
-            return job_details
+    # последний parsed_at ИМЕННО по этому источнику
+    result = session.exec(
+        select(func.max(Job.parsed_at)).where(Job.source == SOURCE)
+    ).one()
+    last_parsed_at = result  # None | datetime
+    last_parsed_date = last_parsed_at.date() if last_parsed_at else None
 
-        except Exception as e:
-            logger.error(f"[ERROR] Failed to process {job['href']}: {e}")
-            return None
+    today = datetime.now(timezone.utc).date()
+    return await parse_html(parse_job_rows, page_html, last_parsed_date, today)
 
-        finally:
-            await page.close()
 
+def parse_job_page(html: str) -> dict:
+    """Извлекает описание, ссылку на отклик и сайт компании со страницы вакансии"""
+    job_details = {}
+    soup = make_soup(html, parse_only=DETAIL_STRAINER)
 
-async def scrape_justremote_jobs(session: Session):
-    """Основная функция скрапинга"""
-    start_time = time.time()
-
-    stats = {
-        "total_found": 0,
-        "successfully_parsed": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-        "errors": 0
-    }
-
-    proxy = {
-        "server": f"http://{settings.PROXY_HOST}:8000",
-        "username": settings.PROXY_USER,
-        "password": settings.PROXY_PASS,
-    }
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage'],
-            proxy=proxy
-        )
-        page = await login(browser)
-        job_links = await get_fresh_job_rows(page, session)
-        stats["total_found"] = len(job_links)
-
-        jobs = []
-
-        for job_link in job_links:
-            href = job_link["href"]
-
-            job_title_tag = job_link.find("h2")
-
-            if not job_title_tag:
-                continue
-            job_title = job_title_tag.get_text(strip=True)
-
-            company_p = job_link.find("p", class_=lambda x: x and x.startswith(
-                "power-search-job-item__Company"))
-            if not company_p:
-                continue
-            company_name = company_p.get_text(strip=True)
-
-            jobs.append({
-                "href": href,
-                "job_title": job_title,
-                "company_name": company_name
-            })
+    fields = [
+        soup.find("div", attrs={"data-qa": "job-description"}),
+        soup.find("div", attrs={"data-qa": "salary-range"}),
+        soup.find("div", attrs={"data-qa": "closing-description"})
+    ]
+    job_description = "\n".join(
+        field.get_text(strip=True) for field in fields if field is not None
+    )
+    job_details["job_description"] = job_description
+
+    apply_link_tag = soup.find(
+        "a", attrs={"data-qa": "show-page-apply"})
+    if apply_link_tag:
+        job_details["apply_link_href"] = apply_link_tag.get("href")
 
-        tasks = [process_job(browser, job) for job in jobs]
-        results = await asyncio.gather(*tasks)
+    footer = soup.find("div", class_="main-footer")
+    if footer:
+        company_link_tag = footer.find("a")
+        if company_link_tag:
+            job_details["company_href"] = company_link_tag.get("href")
 
-        clean_results = [res for res in results if res is not None]
-        stats["successfully_parsed"] = len(clean_results)
+    return job_details
 
-        logger.info("💾 Сохраняем в базу данных...")
 
-        for parsed_job in clean_results:
+async def process_job(browser: Browser, job: dict):
+    # None — только если страница не загрузилась; ошибки разбора обрабатывает Parser.fetch_details
+    job_details = dict(job)
+    html = await fetch_html_async(job['href'], browser, cache_ttl=page_cache_ttl())
+    if not html:
+        return None
+
+    job_details.update(await parse_html(parse_job_page, html))
+    return job_details
+
+
+class JustRemoteParser(Parser):
+    slug = "justremote-jobs"
+    source = SOURCE
+    host = "justremote.co"
+
+    @asynccontextmanager
+    async def open(self, ctx: RunContext) -> AsyncIterator[None]:
+        proxy = {
+            "server": f"http://{settings.PROXY_HOST}:8000",
+            "username": settings.PROXY_USER,
+            "password": settings.PROXY_PASS,
+        }
+
+        async with async_playwright() as p:
+            browser = await launch_chromium(
+                p,
+                headless=True,
+                args=['--no-sandbox', '--disable-dev-shm-usage'],
+                proxy=proxy
+            )
             try:
-                existing = session.exec(
-                    select(Job).where(Job.url == parsed_job["href"])
-                ).first()
-
-                if not existing:
-                    job = Job(
-                        title=parsed_job["job_title"],
-                        url=parsed_job["href"],
-                        description=parsed_job["job_description"],
-                        source=SOURCE,
-                        parsed_at=datetime.utcnow(),
-                        company_url=parsed_job.get("company_href", None),
-                        company=parsed_job["company_name"],
-                        apply_url=parsed_job.get("apply_link_href", None)
-                    )
-                    session.add(job)
-                    stats["added_to_db"] += 1
-                    logger.info(f"✅ Сохранено: {parsed_job['job_title']}")
-                else:
-                    stats["duplicates_skipped"] += 1
-                    logger.info(
-                        f"⚠️ Пропущено (дубликат): {existing.title}")
-
-            except Exception as e:
-                logger.error(
-                    f"❌ Ошибка сохранения вакансии {parsed_job.get('job_title', 'Unknown')}: {e}")
-                stats["errors"] += 1
-
-        session.commit()
-        end_time = time.time()
-        duration = end_time - start_time
-
-        report = (
-            f"📊 *Сводка по парсингу {SOURCE}*:\n"
-            f"Всего найдено вакансий: {stats['total_found']}\n"
-            f"Успешно обработано: {stats['successfully_parsed']}\n"
-            f"Добавлено в БД: {stats['added_to_db']}\n"
-            f"Пропущено дубликатов: {stats['duplicates_skipped']}\n"
-            f"Ошибок: {stats['errors']}\n"
-            f"Время выполнения: {duration:.2f} секунд\n"
-            f"Максимум одновременных вкладок: {MAX_CONCURRENT_TABS}"
-        )
+                ctx.state["browser"] = browser
+                page = await open_search_page(browser)
+                await select_developer_jobs(page)
+                ctx.state["page"] = page
+                yield
+            finally:
+                await browser.close()
 
-        try:
-            await send_slack_message(report)
-            logger.info("📤 Отчет отправлен в Slack")
-        except Exception as e:
-            logger.error(f"❌ Ошибка отправки отчета в Slack: {e}")
+    async def listings(self, ctx: RunContext) -> AsyncIterator[dict]:
+        _, jobs = await get_fresh_job_rows(ctx.state["page"], ctx.session)
+        for job in jobs:
+            yield job
+
+    def get_url(self, job: dict) -> str:
+        return job["href"]
+
+    async def details(self, job: dict, ctx: RunContext) -> dict | None:
+        return await process_job(ctx.state["browser"], job)
+
+    def to_job(self, job: dict) -> dict:
+        return {
+            "title": job["job_title"],
+            "url": job["href"],
+            "description": job["job_description"],
+            "company_url": job.get("company_href", None),
+            "company": job["company_name"],
+            "apply_url": job.get("apply_link_href", None),
+        }
+
+
+parser = JustRemoteParser()
+
+
+async def scrape_justremote_jobs(session: Session):
+    """Основная функция скрапинга"""
+    return await parser.run(session)
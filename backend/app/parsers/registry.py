@@ -0,0 +1,40 @@
+"""
+Registry of job board parsers.
+
+The scheduler runs the parsers in this order, and every parser gets a
+manual run endpoint POST /api/scrape/{slug}.
+"""
+
+from typing import Dict
+
+from app.parsers import (
+    activejobs_db,
+    dev_by,
+    himalayas_app,
+    justremote_co,
+    remoteok,
+    startup_jobs,
+    thehub_io,
+    vseti_app,
+    ycombinator,
+)
+from app.parsers.base import Parser
+
+PARSERS: Dict[str, Parser] = {
+    parser.slug: parser
+    for parser in (
+        startup_jobs.parser,
+        thehub_io.parser,
+        vseti_app.parser,
+        dev_by.parser,
+        justremote_co.parser,
+        remoteok.parser,
+        himalayas_app.parser,
+        ycombinator.parser,
+        activejobs_db.parser,
+    )
+}
+
+
+def get_parser(slug: str) -> Parser:
+    return PARSERS[slug]
@@ -4,21 +4,28 @@ Fetches remote jobs from remoteok.io API and filters for software development po
 """
 
 import httpx
+import ijson
 import re
-import time
 from html import unescape
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from sqlmodel import Session, select
+from typing import AsyncIterator, List, Dict, Any, Optional
+from sqlmodel import Session
 from app.models import Job
 from app.logger import logger
-from app.utils.slack import send_slack_message
+from app.parsers.base import Parser, RunContext
+from app.utils.executor import run_cpu_bound
+from app.utils.http import get_http_client
+from app.utils.keywords import KeywordMatcher
 
 
 # API endpoint
-API_URL = "https://remoteok.io/api"
+API_HOST = "remoteok.io"
+API_URL = f"https://{API_HOST}/api"
 SOURCE = "remoteok.io"
 
+# Jobs are written to the database in chunks of this size while the feed is streamed
+WRITE_CHUNK_SIZE = 100
+
 # Tags that indicate software development positions
 # If ANY of these tags present - it's a dev job
 DEV_TAGS = {
@@ -29,13 +36,21 @@ DEV_TAGS = {
     'sre', 'site reliability',
     # Technologies (specific enough to indicate dev work)
     'react', 'vue', 'angular', 'javascript', 'typescript',
-    'python', 'java', 'golang', 'rust', 'node', 'nodejs',
+    'python', 'java', 'golang', 'rust', 'node', 'nodejs', 'nextjs',
     'ios', 'android', 'devops', 'devsecops',
     'php', 'ruby', 'rails', 'django', 'flask', 'spring',
     'kubernetes', 'docker', 'terraform',
     'data engineer', 'ml engineer', 'machine learning',
     'c++', 'c#', '.net', 'dotnet', 'scala', 'kotlin', 'swift'
 }
+# Tags are slugs that glue words together ('reactjs', 'springboot', 'fullstackdeveloper'),
+# so role nouns and technology names also match as tag prefixes
+DEV_TAG_PREFIXES = {
+    'developer', 'programmer', 'programming', 'fullstack',
+    'react', 'vue', 'angular', 'node', 'python', 'rust', 'ruby',
+    'spring', 'swift', 'dotnet', 'android',
+}
+DEV_TAGS_MATCHER = KeywordMatcher(DEV_TAGS, prefixes=DEV_TAG_PREFIXES)
 
 
 def strip_html_tags(html: str) -> str:
@@ -70,57 +85,67 @@ def is_dev_job(tags: List[str]) -> bool:
     if not tags:
         return False
     
-    tags_lower = {tag.lower() for tag in tags}
-    
-    # Check if it has any dev-related tags
-    for dev_tag in DEV_TAGS:
-        # Exact match
-        if dev_tag in tags_lower:
-            return True
-        # Partial match (tag contains dev keyword)
-        for tag in tags_lower:
-            if dev_tag in tag:
-                return True
-    
-    return False
+    return DEV_TAGS_MATCHER.search(*tags)
 
 
-async def fetch_jobs_from_api() -> List[Dict[str, Any]]:
+class ResponseReader:
     """
-    Fetch jobs from Remote OK API.
-    Returns list of job dictionaries.
+    Minimal async file-like wrapper over a streamed httpx response,
+    so ijson can parse the feed while it is being downloaded.
+    """
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson expects at most `size` bytes per call, network chunks can be larger
+        while not self._buffer:
+            try:
+                self._buffer = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+async def iter_jobs_from_api() -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream jobs from Remote OK API.
+    Yields job dictionaries one by one as the feed is parsed, without
+    loading the whole response into memory.
     """
     headers = {
         "User-Agent": "JobsParser/1.0 (https://github.com/jobs-parser)"
     }
     
-    try:
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.get(API_URL, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # First element is usually legal/info, skip it
-                jobs = [item for item in data if isinstance(item, dict) and item.get("position")]
-                logger.info(f"📊 Получено {len(jobs)} вакансий из Remote OK API")
-                return jobs
-            else:
-                logger.error(f"❌ Ошибка при запросе к Remote OK API: {response.status_code}")
-                return []
-                
-    except Exception as e:
-        logger.error(f"❌ Ошибка при запросе к Remote OK API: {str(e)}")
-        return []
+    client = get_http_client(API_HOST, follow_redirects=True)
+    async with client.stream("GET", API_URL, headers=headers) as response:
+        if response.status_code != 200:
+            logger.error(f"❌ Ошибка при запросе к Remote OK API: {response.status_code}")
+            return
+        
+        async for item in ijson.items(ResponseReader(response), "item", use_float=True):
+            # First element is usually legal/info, skip it
+            if isinstance(item, dict) and item.get("position"):
+                yield item
+
+
+def get_job_url(job_data: Dict[str, Any]) -> str:
+    """Build job URL from Remote OK API item."""
+    job_url = job_data.get("url", "")
+    if not job_url and job_data.get("slug"):
+        job_url = f"https://remoteok.io/remote-jobs/{job_data['slug']}"
+    return job_url
 
 
 def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Map Remote OK API response to Job model fields.
     """
-    # Build job URL
-    job_url = job_data.get("url", "")
-    if not job_url and job_data.get("slug"):
-        job_url = f"https://remoteok.io/remote-jobs/{job_data['slug']}"
+    job_url = get_job_url(job_data)
     
     # Parse date
     parsed_at = datetime.utcnow()
@@ -145,102 +170,39 @@ def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def map_jobs_to_model(jobs_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map a batch of API items, runs in the parsing process pool."""
+    return [map_job_to_model(job_data) for job_data in jobs_data]
+
+
+class RemoteOkParser(Parser):
+    slug = "remoteok-jobs"
+    source = SOURCE
+    write_batch_size = WRITE_CHUNK_SIZE
+    extra_stats = {"filtered_out": "Отфильтровано не-dev вакансий"}
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, Any]]:
+        """Dev jobs of the streamed feed, filtered as they arrive."""
+        async for job_data in iter_jobs_from_api():
+            if not is_dev_job(job_data.get("tags", [])):
+                ctx.stats["filtered_out"] += 1
+                continue
+            yield job_data
+
+    def get_url(self, job_data: Dict[str, Any]) -> str:
+        return get_job_url(job_data)
+
+    async def map_jobs(self, jobs_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Descriptions are cleaned up in the parsing process pool."""
+        return await run_cpu_bound(map_jobs_to_model, jobs_data)
+
+
+parser = RemoteOkParser()
+
+
 async def scrape_remoteok_jobs(session: Session) -> List[Job]:
     """
     Main function to scrape Remote OK jobs.
-    Fetches from API, filters dev jobs, and saves to database.
+    Streams the feed, filters dev jobs, and saves them to database in chunks.
     """
-    all_jobs = []
-    start_time = time.time()
-    
-    # Statistics for report
-    stats = {
-        "total_fetched": 0,
-        "dev_jobs_found": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-        "filtered_out": 0,
-    }
-    
-    try:
-        # Fetch jobs from API
-        jobs_data = await fetch_jobs_from_api()
-        stats["total_fetched"] = len(jobs_data)
-        
-        if not jobs_data:
-            logger.warning("⚠️ Не получено вакансий из Remote OK API")
-            await send_slack_message(f"⚠️ Remote OK: не получено вакансий из API")
-            return []
-        
-        # Filter and process jobs
-        for job_data in jobs_data:
-            tags = job_data.get("tags", [])
-            
-            # Check if it's a dev job
-            if not is_dev_job(tags):
-                stats["filtered_out"] += 1
-                continue
-            
-            stats["dev_jobs_found"] += 1
-            
-            # Map to model
-            job_info = map_job_to_model(job_data)
-            
-            # Skip if no URL
-            if not job_info["url"]:
-                logger.warning(f"⚠️ Пропущена вакансия без URL: {job_info['title']}")
-                continue
-            
-            # Check for duplicates
-            existing = session.exec(
-                select(Job).where(Job.url == job_info["url"])
-            ).first()
-            
-            if existing:
-                stats["duplicates_skipped"] += 1
-                logger.debug(f"⏭️ Пропущен дубликат: {job_info['title']}")
-                continue
-            
-            # Create and save job
-            job = Job(
-                title=job_info["title"],
-                url=job_info["url"],
-                description=job_info["description"],
-                company=job_info["company"],
-                company_url=job_info.get("company_url"),
-                salary=job_info["salary"],
-                source=SOURCE,
-                parsed_at=job_info["parsed_at"],
-            )
-            
-            session.add(job)
-            all_jobs.append(job)
-            stats["added_to_db"] += 1
-            logger.info(f"✅ Сохранено: {job_info['title']} @ {job_info['company']}")
-        
-        # Commit all jobs
-        session.commit()
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        # Send Slack report
-        report = (
-            f"📊 *Сводка по парсингу {SOURCE}*:\n"
-            f"Всего найдено вакансий: {stats['dev_jobs_found']}\n"
-            f"Добавлено в БД: {stats['added_to_db']}\n"
-            f"Пропущено дубликатов: {stats['duplicates_skipped']}\n"
-            f"Время выполнения: {duration:.2f} секунд"
-        )
-        await send_slack_message(report)
-        
-        logger.info(f"✅ Remote OK парсинг завершен. Добавлено {stats['added_to_db']} вакансий")
-        
-        return all_jobs
-        
-    except Exception as e:
-        error_message = f"❌ Критическая ошибка при парсинге Remote OK: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Ошибка при парсинге {SOURCE}:\n{str(e)}")
-        return []
-
+    return await parser.run(session)
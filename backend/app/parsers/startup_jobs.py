@@ -1,21 +1,12 @@
 import asyncio
-from bs4 import BeautifulSoup, ResultSet
-from app.models import Job
-from sqlmodel import select, Session
-from datetime import datetime, timedelta
+from bs4 import BeautifulSoup, ResultSet, SoupStrainer
+from sqlmodel import Session
 from app.utils.browser import fetch_html_browser
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 from app.logger import logger
-from app.utils.slack import send_slack_message
-from functools import lru_cache
-import time
-
-# Уменьшаем количество одновременных запросов
-sem = asyncio.Semaphore(3)
-
-# Кэш для хранения результатов парсинга на 1 час
-CACHE_TTL = timedelta(hours=1)
-parsed_urls_cache: Dict[str, tuple[datetime, Dict]] = {}
+from app.parsers.base import Parser, RunContext
+from app.utils.page_cache import page_cache_ttl
+from app.utils.html import has_class, make_soup, parse_html
 
 
 URLS = [
@@ -29,30 +20,10 @@ URLS = [
 SOURCE = "startup.jobs"
 base_url = "https://startup.jobs"
 
-
-def get_cached_result(url: str) -> Dict | None:
-    """Получить кэшированный результат или None если кэш устарел"""
-    if url in parsed_urls_cache:
-        timestamp, result = parsed_urls_cache[url]
-        if datetime.utcnow() - timestamp < CACHE_TTL:
-            return result
-        del parsed_urls_cache[url]
-    return None
-
-
-def cache_result(url: str, result: Dict):
-    """Сохранить результат в кэш"""
-    parsed_urls_cache[url] = (datetime.utcnow(), result)
-
-
-async def process_job_div_throttled(job_div):
-    """Обработка div с вакансией с ограничением одновременных запросов"""
-    async with sem:
-        try:
-            return await process_job_div(job_div)
-        except Exception as e:
-            logger.error(f"Error processing job div: {str(e)}")
-            return None
+# Разбираем только нужные контейнеры, а не всю страницу
+LISTING_STRAINER = SoupStrainer("div", attrs={"data-search-target": "hits"})
+DETAIL_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "a" or (name == "div" and has_class(attrs, "trix-content")))
 
 
 def find_apply_link(s: BeautifulSoup) -> str | None:
@@ -63,39 +34,34 @@ def find_apply_link(s: BeautifulSoup) -> str | None:
     return None
 
 
-async def get_job_description(url: str) -> Dict[str, str]:
-    """Получение описания вакансии с кэшированием"""
-    # Проверяем кэш
-    cached_result = get_cached_result(url)
-    if cached_result:
-        logger.info(f"📊 Использую кэшированное описание для {url}")
-        return cached_result
+def parse_job_description(job_html: str, url: str) -> Dict[str, str]:
+    """Извлечение описания и ссылки на отклик со страницы вакансии"""
+    soup = make_soup(job_html, parse_only=DETAIL_STRAINER)
+    desc_div = soup.find("div", class_=["trix-content"])
+    apply_url = find_apply_link(soup)
+
+    if not desc_div:
+        logger.warning(f"⚠️ Не найдено описание для {url}")
+        return {"description": "", "apply_url": apply_url}
+
+    return {
+        "description": desc_div.get_text(),
+        "apply_url": apply_url
+    }
 
-    try:
-        job_html = await fetch_html_browser(url)
-        soup = BeautifulSoup(job_html, "html.parser")
-        desc_div = soup.find("div", class_=["trix-content"])
-        apply_url = find_apply_link(soup)
-
-        if not desc_div:
-            logger.warning(f"⚠️ Не найдено описание для {url}")
-            return {"description": "", "apply_url": apply_url}
-
-        result = {
-            "description": desc_div.get_text(),
-            "apply_url": apply_url
-        }
 
-        # Кэшируем результат
-        cache_result(url, result)
-        return result
+async def get_job_description(url: str) -> Dict[str, str]:
+    """Получение описания вакансии (страница берется из постоянного кэша, если есть)"""
+    try:
+        job_html = await fetch_html_browser(url, cache_ttl=page_cache_ttl())
+        return await parse_html(parse_job_description, job_html, url)
     except Exception as e:
         logger.error(f"❌ Ошибка при получении описания {url}: {str(e)}")
         return {"description": "", "apply_url": None}
 
 
-async def process_job_div(job_div: ResultSet[Any]) -> Dict | None:
-    """Обработка div с вакансией"""
+def parse_job_div(job_div: ResultSet[Any]) -> Dict | None:
+    """Извлечение ссылки, компании и заголовка из div с вакансией"""
     try:
         link_tag = job_div.find(
             "a", attrs={"data-mark-visited-links-target": "anchor"})
@@ -115,130 +81,89 @@ async def process_job_div(job_div: ResultSet[Any]) -> Dict | None:
         job_title = " ".join(line.strip() for line in link_tag.get_text(
         ).strip().splitlines() if line.strip())
 
-        job_info = await get_job_description(full_job_url)
-
         return {
             "url": full_job_url,
             "company_url": company_url,
             "company_name": company_name,
             "title": job_title,
-            "description": job_info["description"],
-            "apply_url": job_info["apply_url"]
         }
     except Exception as e:
         logger.error(f"❌ Ошибка при обработке вакансии: {str(e)}")
         return None
 
 
-async def parse_jobs_from_html(html: str, stats: Dict[str, Any]) -> List[Job]:
-    """Парсинг вакансий из HTML"""
+async def process_job(job: Dict) -> Dict:
+    """Дополнение вакансии описанием и ссылкой на отклик"""
+    job_info = await get_job_description(job["url"])
+    return {
+        **job,
+        "description": job_info["description"],
+        "apply_url": job_info["apply_url"]
+    }
+
+
+def parse_jobs_from_html(html: str) -> tuple[int, List[Dict]]:
+    """
+    Парсинг списка вакансий из HTML страницы поиска
+
+    Returns:
+        (число строк с вакансиями на странице, успешно разобранные вакансии)
+    """
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, parse_only=LISTING_STRAINER)
         hits_div = soup.find("div", attrs={"data-search-target": "hits"})
         if not hits_div:
             logger.warning("⚠️ Не найден div с вакансиями")
-            return []
+            return 0, []
 
         job_rows = hits_div.find_all("div", class_="isolate")
         logger.info(f"📊 Найдено {len(job_rows)} вакансий")
-        stats["successfully_parsed"] += len(job_rows)
-
-        # Обрабатываем вакансии с ограничением одновременных запросов
-        parsed_jobs = await asyncio.gather(
-            *[process_job_div_throttled(job) for job in job_rows],
-            return_exceptions=True
-        )
-
-        # Фильтруем None и исключения
-        parsed_jobs = [
-            job for job in parsed_jobs if job is not None and not isinstance(job, Exception)]
-
-        jobs = []
-        for job in parsed_jobs:
-            job_data = Job(
-                title=job["title"],
-                url=job["url"],
-                source=SOURCE,
-                description=job["description"],
-                company=job["company_name"],
-                company_url=job["company_url"],
-                parsed_at=datetime.utcnow(),
-                apply_url=job["apply_url"]
-            )
-            jobs.append(job_data)
-
-        return jobs
+
+        jobs = [parse_job_div(job_row) for job_row in job_rows]
+        return len(job_rows), [job for job in jobs if job is not None]
     except Exception as e:
         logger.error(f"❌ Ошибка при парсинге HTML: {str(e)}")
-        return []
+        return 0, []
 
 
-async def scrape_startup_jobs(session: Session):
-    """Основная функция скрапинга"""
-    start_time = time.time()
-    all_jobs = []
-
-    # Статистика для отчета
-    stats = {
-        "total_found": 0,
-        "successfully_parsed": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0
-    }
+class StartupJobsParser(Parser):
+    slug = "startup-jobs"
+    source = SOURCE
+    host = "startup.jobs"
+    # Каждая загрузка запускает отдельный Chromium: воркеров меньше, чем у остальных
+    concurrency = 3
 
-    try:
-        # screenshot_uuid = str(uuid.uuid4())[:8]
-        # Получаем HTML со всех URL с ограничением одновременных запросов
-        tasks = [fetch_html_browser(url) for url in URLS]
-        html_results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict]:
+        """Вакансии со всех страниц поиска (одна вакансия может попасть в несколько запросов)"""
+        html_results = await asyncio.gather(
+            *[fetch_html_browser(url) for url in URLS], return_exceptions=True)
 
-        # Обрабатываем результаты
         for html in html_results:
             if isinstance(html, Exception):
                 logger.error(f"❌ Ошибка при получении HTML: {str(html)}")
                 continue
 
-            jobs = await parse_jobs_from_html(html, stats)
-            stats["total_found"] += len(jobs)
-
-            # Проверяем дубликаты и сохраняем новые вакансии
+            _, jobs = await parse_html(parse_jobs_from_html, html)
             for job in jobs:
-                existing = session.exec(
-                    select(Job).where(Job.url == job.url)).first()
-
-                if not existing:
-                    logger.info(f"📊 Сохраняю в БД {job.url}")
-                    session.add(job)
-                    all_jobs.append(job)
-                    stats["added_to_db"] += 1
-                else:
-                    logger.info(f"⚠️ Пропускаю дубликат {job.url}")
-                    stats["duplicates_skipped"] += 1
-
-        # Сохраняем все изменения одним коммитом
-        if all_jobs:
-            session.commit()
-
-        end_time = time.time()
-        duration = end_time - start_time
-
-        # Формируем и отправляем отчет в Slack
-        report = (
-            f"📊 *Сводка по парсингу* {SOURCE}:\n"
-            f"Всего найдено запросов по запрос: {stats['total_found']}\n"
-            f"Успешно спарсили: {stats['successfully_parsed']}\n"
-            f"Добавили в БД: {stats['added_to_db']}\n"
-            f"Пропустили дубликатов: {stats['duplicates_skipped']}\n"
-            f"Время выполнения: {duration:.2f} секунд"
-        )
-        await send_slack_message(report)
-
-        logger.info(
-            f"✅ Скрапинг завершен за {duration:.2f} секунд. Добавлено {len(all_jobs)} вакансий")
-
-        return all_jobs
-    except Exception as e:
-        error_message = f"❌ Критическая ошибка при скрапинге: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Ошибка при парсинге {SOURCE}:\n{str(e)}")
-        return []
+                yield job
+
+    async def details(self, job: Dict, ctx: RunContext) -> Dict:
+        return await process_job(job)
+
+    def to_job(self, job: Dict) -> Dict:
+        return {
+            "title": job["title"],
+            "url": job["url"],
+            "description": job["description"],
+            "company": job["company_name"],
+            "company_url": job["company_url"],
+            "apply_url": job["apply_url"],
+        }
+
+
+parser = StartupJobsParser()
+
+
+async def scrape_startup_jobs(session: Session):
+    """Основная функция скрапинга"""
+    return await parser.run(session)
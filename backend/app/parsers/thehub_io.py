@@ -1,22 +1,21 @@
 import asyncio
-from bs4 import BeautifulSoup, ResultSet
-from app.models import Job
-from sqlmodel import select, Session
-from datetime import datetime
-from app.utils.browser import fetch_html_async
+from contextlib import asynccontextmanager
+from bs4 import ResultSet, SoupStrainer
+from sqlmodel import Session
+from app.utils.browser import fetch_html_async, launch_chromium
 from app.logger import logger
-from app.utils.slack import send_slack_message
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, urljoin
+from app.parsers.base import Parser, RunContext
+from app.utils.page_cache import page_cache_ttl, read_cached_page, write_cached_page
+from app.utils.html import make_soup, parse_html
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from playwright.async_api import (
     async_playwright,
     TimeoutError as PlaywrightTimeoutError,
 )
-import time
-from typing import Dict, Any
+from typing import AsyncIterator, Dict
+from datetime import date, timedelta
 import re
 
-sem = asyncio.Semaphore(10)
-
 URLS = [
     "https://thehub.io/jobs?roles=backenddeveloper&roles=engineer&roles=frontenddeveloper&roles=fullstackdeveloper&roles=mobiledevelopment&paid=true&countryCode=REMOTE&sorting=mostPopular"
 ]
@@ -24,10 +23,8 @@ URLS = [
 SOURCE = "thehub.io"
 base_url = "https://thehub.io"
 
-
-async def process_page_throttled(url: str, browser, stats: Dict[str, Any]):
-    async with sem:
-        return await process_page(url, browser, stats)
+# И листинг, и страница вакансии лежат внутри тегов <content>, остальное не разбираем
+CONTENT_STRAINER = SoupStrainer("content")
 
 
 def update_url_param(url: str, key: str, value: str) -> str:
@@ -82,110 +79,59 @@ async def _dismiss_cookies(page):
         pass
 
 
+PAGINATION_SELECTOR = 'ul[aria-label="Pagination"]'
+
+# Номер последней страницы за один вызов в браузере: aria-setsize радио-ссылок,
+# параметр ?page= в href и номера в тексте ссылок
+MAX_PAGE_SCRIPT = """
+(selector) => {
+    const pagination = document.querySelector(selector);
+    if (!pagination) return null;
+    const pages = [1];
+    for (const a of pagination.querySelectorAll('a')) {
+        const size = parseInt(a.getAttribute('aria-setsize'), 10);
+        if (size > 0) pages.push(size);
+        if (a.href) {
+            const page = parseInt(new URL(a.href, document.baseURI).searchParams.get('page'), 10);
+            if (page > 0) pages.push(page);
+        }
+        const text = a.textContent.trim();
+        if (/^\\d+$/.test(text)) pages.push(parseInt(text, 10));
+    }
+    return Math.max(...pages);
+}
+"""
+
+
+def max_page_cache_key(url: str) -> str:
+    # Число страниц кэшируем на текущие сутки
+    return f"thehub-max-page:{date.today().isoformat()}:{url}"
+
+
 async def get_max_page(url: str, browser) -> int:
+    cache_key = max_page_cache_key(url)
+    cached = await read_cached_page(cache_key, timedelta(days=1))
+    if cached is not None:
+        logger.info(f"💾 Число страниц из кэша: {cached} ({url})")
+        return int(cached)
+
     page = await browser.new_page()
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
-        # Попробуем закрыть куки, чтобы они не перекрывали пагинацию/клики
+        # Попробуем закрыть куки, чтобы они не перекрывали пагинацию
         await _dismiss_cookies(page)
 
-        # Дадим CSR дорисоваться, но без жестких ожиданий
         try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
+            await page.wait_for_selector(f"{PAGINATION_SELECTOR} a", timeout=10000, state="attached")
         except PlaywrightTimeoutError:
-            pass
-
-        # Ждём появление списка пагинации (точно ваш селектор)
-        pagination = None
-        for sel in [
-            'ul[aria-label="Pagination"]',
-            'ul.pagination[aria-label="Pagination"]',  # запасной
-            'ul.b-pagination[aria-label="Pagination"]',  # запасной
-        ]:
-            try:
-                await page.wait_for_selector(sel, timeout=6000, state="attached")
-                pagination = page.locator(sel)
-                break
-            except PlaywrightTimeoutError:
-                continue
-
-        if pagination is None:
-            # возможно ленивый рендер — проскроллим и попробуем ещё раз
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(500)
-            try:
-                await page.wait_for_selector(
-                    'ul[aria-label="Pagination"]', timeout=4000, state="attached"
-                )
-                pagination = page.locator('ul[aria-label="Pagination"]')
-            except PlaywrightTimeoutError:
-                # нет пагинации — одна страница
-                return 1
-
-        # Убедимся, что есть хотя бы одна ссылка
-        await pagination.locator("a").first.wait_for(state="attached", timeout=4000)
-
-        # --- Heuristic #1: aria-setsize на радио-ссылках (в вашем HTML это "2")
-        max_pages = None
-        try:
-            radios = pagination.locator('a[role="menuitemradio"]')
-            rcnt = await radios.count()
-            sizes = []
-            for i in range(rcnt):
-                val = await radios.nth(i).get_attribute("aria-setsize")
-                if val and val.isdigit():
-                    sizes.append(int(val))
-            if sizes:
-                max_pages = max(sizes)
-        except Exception:
-            pass
-        if isinstance(max_pages, int) and max_pages > 0:
-            return max_pages
-
-        # --- Heuristic #2: парсим параметр ?page= из href
-        links = pagination.locator("a[href]")
-        lcnt = await links.count()
-        pages = []
-        for i in range(lcnt):
-            a = links.nth(i)
-            href = await a.get_attribute("href") or ""
-            if href:
-                abs_url = urljoin(url, href)
-                q = parse_qs(urlparse(abs_url).query)
-                val = q.get("page", [None])[0]
-                if val and str(val).isdigit():
-                    pages.append(int(val))
-                    continue
-            # Иногда номер прямо в тексте <a>2</a>
-            try:
-                txt = (await a.inner_text()).strip()
-                if re.fullmatch(r"\d+", txt):
-                    pages.append(int(txt))
-            except Exception:
-                pass
-
-        if pages:
-            return max(pages)
-
-        # --- Heuristic #3: ссылка "последняя" (» / last)
-        try:
-            last_link = pagination.locator(
-                'a[aria-label*="last" i], a:has-text("»")'
-            ).first
-            if await last_link.count() > 0:
-                href = await last_link.get_attribute("href")
-                if href:
-                    abs_url = urljoin(url, href)
-                    q = parse_qs(urlparse(abs_url).query)
-                    val = q.get("page", [None])[0]
-                    if val and str(val).isdigit():
-                        return int(val)
-        except Exception:
-            pass
+            # нет пагинации — одна страница (не кэшируем: могла не дорисоваться)
+            return 1
 
-        # если ничего не вышло — считаем, что 1 страница
-        return 1
+        max_page = await page.evaluate(MAX_PAGE_SCRIPT, PAGINATION_SELECTOR) or 1
+        await write_cached_page(cache_key, str(max_page))
+        logger.info(f"📊 Страниц листинга: {max_page} ({url})")
+        return max_page
 
     except PlaywrightTimeoutError:
         logger.warning(f"⏱ Timeout при загрузке или поиске пагинации на {url}")
@@ -199,16 +145,17 @@ async def get_paginated_urls(url: str, browser) -> list[str]:
     return [update_url_param(url, "page", str(i + 1)) for i in range(max_page)]
 
 
-async def process_job(job_div: ResultSet, browser) -> dict[str, str] | None:
+def get_job_url(job_div: ResultSet) -> str | None:
     job_link_tag = job_div.find("a")
     if not job_link_tag:
         return None
 
     href = job_link_tag["href"].lstrip("/")
-    job_url = f"{base_url}/{href}"
+    return f"{base_url}/{href}"
+
 
-    job_page_html = await fetch_html_async(job_url, browser)
-    soup = BeautifulSoup(job_page_html, "html.parser")
+def parse_job_page(job_page_html: str, job_url: str) -> dict[str, str] | None:
+    soup = make_soup(job_page_html, parse_only=CONTENT_STRAINER)
     content = soup.find("content")
     if not content:
         return None
@@ -235,94 +182,72 @@ async def process_job(job_div: ResultSet, browser) -> dict[str, str] | None:
     }
 
 
-async def process_page(
-    url: str, browser, stats: Dict[str, Any]
-) -> list[dict[str, str]]:
-    page_html = await fetch_html_async(url, browser)
-    soup = BeautifulSoup(page_html, "html.parser")
+async def process_job(job_url: str, browser) -> dict[str, str] | None:
+    job_page_html = await fetch_html_async(job_url, browser, cache_ttl=page_cache_ttl())
+    return await parse_html(parse_job_page, job_page_html, job_url)
+
+
+def parse_listing_page(page_html: str) -> tuple[int, list[str]]:
+    """
+    Разбирает HTML страницы листинга
+
+    Returns:
+        (число карточек вакансий на странице, ссылки на вакансии)
+    """
+    soup = make_soup(page_html, parse_only=CONTENT_STRAINER)
     content_tags = soup.find_all("content")
     if not content_tags:
-        return []
+        return 0, []
 
     jobs_content = content_tags[-1]
     job_rows = jobs_content.find_all("div", recursive=False)
-    stats["total_found"] += len(job_rows)
 
-    return await asyncio.gather(
-        *[process_job(job_row, browser) for job_row in job_rows]
-    )
+    job_urls = [get_job_url(job_row) for job_row in job_rows]
+    return len(job_rows), [job_url for job_url in job_urls if job_url]
 
 
-async def scrape_thehub_jobs(session: Session):
-    all_jobs = []
-    start_time = time.time()
-
-    # Статистика для отчета
-    stats = {
-        "total_found": 0,
-        "successfully_parsed": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-    }
+async def process_page(url: str, browser) -> list[str]:
+    """Возвращает ссылки на вакансии со страницы листинга"""
+    page_html = await fetch_html_async(url, browser)
+    _, job_urls = await parse_html(parse_listing_page, page_html)
+    return job_urls
 
-    try:
+
+class TheHubParser(Parser):
+    slug = "thehub-jobs"
+    source = SOURCE
+    host = "thehub.io"
+
+    @asynccontextmanager
+    async def open(self, ctx: RunContext) -> AsyncIterator[None]:
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-
-            urls_nested = await asyncio.gather(
-                *[get_paginated_urls(url, browser) for url in URLS]
-            )
-            urls = [u for group in urls_nested for u in group]
-
-            all_results = await asyncio.gather(
-                *[process_page_throttled(url, browser, stats) for url in urls]
-            )
-            flat_results = [job for group in all_results for job in group if job]
-
-            stats["successfully_parsed"] = len(flat_results)
-
-            for job_info in flat_results:
-                existing = session.exec(
-                    select(Job).where(Job.url == job_info["url"])
-                ).first()
-                if not existing:
-                    job = Job(
-                        title=job_info["title"],
-                        url=job_info["url"],
-                        description=job_info["description"],
-                        source=SOURCE,
-                        parsed_at=datetime.utcnow(),
-                        company_url=job_info["company_url"],
-                        company=job_info["company"],
-                    )
-                    session.add(job)
-                    all_jobs.append(job)
-                    stats["added_to_db"] += 1
-                    logger.info(f"✅ Сохранено: {job_info['title']}")
-                else:
-                    stats["duplicates_skipped"] += 1
-                    logger.info(f"⚠️ Пропущено (дубликат): {existing.title}")
-
-            session.commit()
-            await browser.close()
-
-        end_time = time.time()
-        duration = end_time - start_time
-
-        # Формируем и отправляем отчет в Slack
-        report = (
-            f"📊 *Сводка по парсингу* {SOURCE}:\n"
-            f"Всего найдено запросов по запрос: {stats['total_found']}\n"
-            f"Успешно спарсили: {stats['successfully_parsed']}\n"
-            f"Добавили в БД: {stats['added_to_db']}\n"
-            f"Пропустили дубликатов: {stats['duplicates_skipped']}\n"
-            f"Время выполнения: {duration:.2f} секунд"
+            browser = await launch_chromium(p, headless=True)
+            ctx.state["browser"] = browser
+            try:
+                yield
+            finally:
+                await browser.close()
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, str]]:
+        browser = ctx.state["browser"]
+        urls_nested = await asyncio.gather(
+            *[get_paginated_urls(url, browser) for url in URLS]
         )
-        await send_slack_message(report)
-
-        return all_jobs
-    except Exception as e:
-        error_message = f"❌ Критическая ошибка при скрапинге: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Ошибка при парсинге {SOURCE}:\n{str(e)}")
-        return []
+        urls = [u for group in urls_nested for u in group]
+
+        listing_results = await asyncio.gather(
+            *[process_page(url, browser) for url in urls]
+        )
+        for group in listing_results:
+            for job_url in group:
+                yield {"url": job_url}
+
+    async def details(self, item: Dict[str, str], ctx: RunContext) -> dict[str, str] | None:
+        return await process_job(item["url"], ctx.state["browser"])
+
+
+parser = TheHubParser()
+
+
+async def scrape_thehub_jobs(session: Session):
+    return await parser.run(session)
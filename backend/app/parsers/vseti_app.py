@@ -1,95 +1,198 @@
 import asyncio
-from bs4 import BeautifulSoup, ResultSet
-from app.models import Job
-from sqlmodel import select, Session
-from datetime import datetime, timedelta
-from app.utils.browser import fetch_html_browser, get_browser_page, fetch_html_async
-from typing import Any, Dict, List, Optional
-from app.logger import logger
-from app.utils.slack import send_slack_message
-from functools import lru_cache
-from playwright.async_api import async_playwright,  TimeoutError as PlaywrightTimeoutError
-
+import re
 import time
-
-sem = asyncio.Semaphore(10)
+from contextlib import asynccontextmanager
+from bs4 import SoupStrainer
+from sqlmodel import Session
+from app.utils.browser import fetch_html_async, launch_chromium
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+from app.logger import logger
+from app.parsers.base import Parser, RunContext
+from app.utils.page_cache import page_cache_ttl
+from app.utils.html import has_class, make_soup, parse_html
+from app.utils.limiter import limiter_for_url
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 URLS = [
     "https://www.vseti.app/jobs?jobstype=%D0%A0%D0%B0%D0%B7%D1%80%D0%B0%D0%B1%D0%BE%D1%82%D0%BA%D0%B0&level=Middle%2CSenior&location=%D0%94%D1%80%D1%83%D0%B3%D0%BE%D0%B5%2C%D0%97%D0%B0+%D1%80%D1%83%D0%B1%D0%B5%D0%B6%D0%BE%D0%BC&format=%D0%A3%D0%B4%D0%B0%D0%BB%D1%91%D0%BD%D0%BD%D0%BE"
 ]
 SOURCE = "vseti.app"
 
+# Разбираем только нужные контейнеры, а не всю страницу
+LISTING_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "a" and has_class(attrs, "card-jobs"))
+DETAIL_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "a" or (name == "div" and has_class(attrs, "content_vacancy_div")))
+
+
+# Карточка вакансии в листинге: по ней ждем отрисовку страницы
+CARD_SELECTOR = "a.card-jobs"
+NEXT_PAGE_SELECTOR = 'a[aria-label="Next Page"], a.w-pagination-next'
+MAX_LISTING_PAGES = 10
+LISTING_TIMEOUT_MS = 15000
+
+# Webflow-пагинация: ссылка "Next Page" ведет на ?<id коллекции>_page=N,
+# а счетчик страниц выводится как "1 / 5"
+PAGINATION_SCRIPT = """
+() => {
+    const next = document.querySelector('a[aria-label="Next Page"], a.w-pagination-next');
+    const counter = document.querySelector('.w-page-count');
+    return {
+        next: next ? next.href : null,
+        count: counter ? counter.textContent : null,
+    };
+}
+"""
+
+
+def parse_pagination(info: Dict[str, Optional[str]]) -> Optional[Tuple[str, int]]:
+    """
+    Параметр номера страницы и число страниц из ссылки "Next Page"
+
+    Returns:
+        (имя параметра, число страниц) или None, если страницы не адресуются по URL
+    """
+    next_url = info.get("next")
+    if not next_url:
+        return None
 
-async def process_page_throttled(job: Dict[str, str], browser):
-    async with sem:
-        try:
-            return await get_job_details(job, browser)
-        except Exception as e:
-            logger.error(
-                f"❌ Ошибка при обработке вакансии {job.get('title', 'Unknown')}: {str(e)}")
-            return None
+    page_param = next(
+        (key for key in parse_qs(urlparse(next_url).query) if key.endswith("_page")), None)
+    if page_param is None:
+        return None
 
+    match = re.search(r"/\s*(\d+)", info.get("count") or "")
+    page_count = int(match.group(1)) if match else MAX_LISTING_PAGES
+    return page_param, min(page_count, MAX_LISTING_PAGES)
 
-async def get_full_jobs_page(url: str):
-    max_pages = 10
-    page_num = 0
 
+def page_url(url: str, page_param: str, page_num: int) -> str:
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    query_params[page_param] = [str(page_num)]
+    return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
+
+
+async def wait_for_cards(page, url: str) -> None:
     try:
-        async with get_browser_page(url) as page:
-            while page_num < max_pages:
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                next_page_link = page.locator('a[aria-label="Next Page"]')
-
-                if not await next_page_link.is_visible():
-                    logger.info(
-                        f"📊 Кнопки 'Next Page' больше нет. Отдаю контент. Пройдено страниц: {page_num}")
-                    break
-
-                logger.info(
-                    f"📊 Нашел кнопку 'Next Page'. Жму (страница {page_num + 1})")
-                await next_page_link.click()
-
-                try:
-                    await page.wait_for_load_state("networkidle", timeout=10000)
-                except Exception as e:
-                    logger.warning(
-                        f"⚠️ Загрузка не завершилась по networkidle: {e}. Жду ещё 5 секунд...")
-                    await page.wait_for_timeout(5000)
-
-                page_num += 1
-            return await page.content()
+        await page.wait_for_selector(CARD_SELECTOR, timeout=LISTING_TIMEOUT_MS, state="attached")
+    except PlaywrightTimeoutError:
+        logger.warning(f"⚠️ Не дождался карточек вакансий на {url}")
+
+
+async def get_listing_page(url: str, browser) -> Optional[str]:
+    """HTML одной страницы листинга, загруженной в общем браузере"""
+    # Ошибки ловим снаружи слота: таймауты должны дойти до лимитера
+    try:
+        async with limiter_for_url(url).slot() as slot:
+            page = await browser.new_page()
+            try:
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                slot.report_status(response.status if response else None)
+                await wait_for_cards(page, url)
+                return await page.content()
+            finally:
+                await page.close()
     except Exception as e:
         logger.error(f"❌ Ошибка при загрузке страницы {url}: {str(e)}")
         return None
 
 
-async def get_job_details(job: Dict[str, str], browser):
+async def click_through_pages(page, url: str) -> str:
+    """
+    Запасной путь, если страницы не адресуются по URL: последовательно жмем
+    "Next Page" и отдаем накопленный контент
+    """
+    page_num = 0
+    while page_num < MAX_LISTING_PAGES:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        next_page_link = page.locator(NEXT_PAGE_SELECTOR).first
+
+        if not await next_page_link.is_visible():
+            logger.info(
+                f"📊 Кнопки 'Next Page' больше нет. Отдаю контент. Пройдено страниц: {page_num}")
+            break
+
+        logger.info(
+            f"📊 Нашел кнопку 'Next Page'. Жму (страница {page_num + 1})")
+        cards_before = await page.locator(CARD_SELECTOR).count()
+        await next_page_link.click()
+        # Ждем, пока подгрузятся новые карточки, а не тишины в сети
+        try:
+            await page.wait_for_function(
+                "([selector, before]) => document.querySelectorAll(selector).length !== before",
+                arg=[CARD_SELECTOR, cards_before], timeout=LISTING_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            logger.warning(f"⚠️ Новые карточки не появились на {url}")
+
+        page_num += 1
+    return await page.content()
+
+
+async def get_full_jobs_pages(url: str, browser) -> List[str]:
+    """
+    HTML всех страниц листинга.
+
+    Первая страница открывается один раз, чтобы узнать схему пагинации
+    и число страниц, остальные загружаются параллельно по прямым URL.
+    """
+    page = await browser.new_page()
     try:
-        html = await fetch_html_async(job["href"], browser)
-        if not html:
-            logger.warning(f"⚠️ Пустой HTML для {job['href']}")
-            return None
-
-        soup = BeautifulSoup(html, "html.parser")
-        description_div = soup.find('div', class_="content_vacancy_div")
-        job_description = description_div.get_text(
-        ) if description_div is not None else "Не найдено"
-
-        company_link_tag = soup.find("a", string="Подробнее о компании")
-        company_url = company_link_tag['href'] if company_link_tag else ""
-
-        return {
-            "url": job["href"],
-            "title": job["title"],
-            "description": job_description,
-            "company_url": company_url,
-            "company": job["company"]
-        }
+        async with limiter_for_url(url).slot() as slot:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            slot.report_status(response.status if response else None)
+            await wait_for_cards(page, url)
+            first_html = await page.content()
+            pagination = parse_pagination(await page.evaluate(PAGINATION_SCRIPT))
+
+        # Листание кнопкой — до 10 ожиданий карточек, слот лимитера на это время не держим
+        if pagination is None:
+            logger.info(f"📊 Пагинация по URL не найдена, листаю страницы кнопкой: {url}")
+            return [await click_through_pages(page, url)]
     except Exception as e:
-        logger.error(
-            f"❌ Ошибка при парсинге деталей вакансии {job.get('href', 'Unknown')}: {str(e)}")
+        logger.error(f"❌ Ошибка при загрузке страницы {url}: {str(e)}")
+        return []
+    finally:
+        await page.close()
+
+    page_param, page_count = pagination
+    logger.info(f"📊 Страниц листинга: {page_count} ({page_param}), загружаю параллельно")
+    other_pages = await asyncio.gather(*[
+        get_listing_page(page_url(url, page_param, page_num), browser)
+        for page_num in range(2, page_count + 1)
+    ])
+    return [first_html, *[html for html in other_pages if html]]
+
+
+def parse_job_details(html: str, job: Dict[str, str]) -> Dict[str, str]:
+    """Извлекает описание и ссылку на компанию со страницы вакансии"""
+    soup = make_soup(html, parse_only=DETAIL_STRAINER)
+    description_div = soup.find('div', class_="content_vacancy_div")
+    job_description = description_div.get_text(
+    ) if description_div is not None else "Не найдено"
+
+    company_link_tag = soup.find("a", string="Подробнее о компании")
+    company_url = company_link_tag['href'] if company_link_tag else ""
+
+    return {
+        "url": job["href"],
+        "title": job["title"],
+        "description": job_description,
+        "company_url": company_url,
+        "company": job["company"]
+    }
+
+
+async def get_job_details(job: Dict[str, str], browser):
+    # None — только если страница не загрузилась; ошибки разбора обрабатывает Parser.fetch_details
+    html = await fetch_html_async(job["href"], browser, cache_ttl=page_cache_ttl())
+    if not html:
+        logger.warning(f"⚠️ Пустой HTML для {job['href']}")
         return None
 
+    return await parse_html(parse_job_details, html, job)
+
 
 async def get_job_links_from_page(html: str) -> List[Dict[str, str]]:
     """Возвращает список вакансий или пустой список в случае ошибки"""
@@ -97,8 +200,13 @@ async def get_job_links_from_page(html: str) -> List[Dict[str, str]]:
         logger.warning("⚠️ Пустой HTML при парсинге ссылок на вакансии")
         return []
 
+    return await parse_html(parse_job_links, html)
+
+
+def parse_job_links(html: str) -> List[Dict[str, str]]:
+    """Извлекает вакансии из HTML страницы списка"""
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, parse_only=LISTING_STRAINER)
         links = soup.find_all("a", class_="card-jobs")
         job_links = []
 
@@ -140,136 +248,61 @@ async def get_job_links_from_page(html: str) -> List[Dict[str, str]]:
         return []
 
 
-async def scrape_vseti_app_jobs(session: Session):
-    """Основная функция скрапинга"""
-    start_time = time.time()
-    all_jobs = []
-
-    # Статистика для отчета
-    stats = {
-        "total_found": 0,
-        "successfully_parsed": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0
+class VsetiParser(Parser):
+    slug = "vseti-app-jobs"
+    source = SOURCE
+    host = "vseti.app"
+    requires_auth = False
+    extra_stats = {
+        "listing_pages": "Страниц листинга",
+        "listing_seconds": "Время загрузки листинга, секунд",
     }
 
-    try:
-        # Получаем HTML страниц
-        tasks = [get_full_jobs_page(url) for url in URLS]
-        html_pages = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Фильтруем успешные результаты
-        valid_html_pages = []
-        for i, html in enumerate(html_pages):
-            if isinstance(html, Exception):
-                logger.error(
-                    f"❌ Ошибка при загрузке URL {URLS[i]}: {str(html)}")
-            elif html is not None:
-                valid_html_pages.append(html)
-            else:
-                logger.warning(f"⚠️ Пустой HTML для URL {URLS[i]}")
-
-        if not valid_html_pages:
-            logger.error("❌ Не удалось загрузить ни одной страницы")
-            return []
-
-        # Парсим ссылки на вакансии
-        job_links_tasks = [get_job_links_from_page(
-            html) for html in valid_html_pages]
-        jobs_nested = await asyncio.gather(*job_links_tasks, return_exceptions=True)
-
-        # Объединяем все вакансии в один список
-        jobs = []
-        for job_list in jobs_nested:
-            if isinstance(job_list, Exception):
-                logger.error(f"❌ Ошибка при парсинге ссылок: {str(job_list)}")
-            elif job_list is not None:
-                jobs.extend(job_list)
-
-        if not jobs:
-            logger.warning("⚠️ Не найдено ни одной вакансии")
-            return []
-
-        stats["total_found"] = len(jobs)
-        logger.info(
-            f"📊 Всего найдено {len(jobs)} вакансий для детального парсинга")
-
-        # Получаем детальную информацию о вакансиях
+    @asynccontextmanager
+    async def open(self, ctx: RunContext) -> AsyncIterator[None]:
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+            browser = await launch_chromium(p, headless=True)
+            ctx.state["browser"] = browser
+            try:
+                yield
+            finally:
+                await browser.close()
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, str]]:
+        browser = ctx.state["browser"]
+        listing_start = time.time()
+        logger.info(f"📊 Загружаю листинг {SOURCE}: {len(URLS)} URL")
+        html_groups = await asyncio.gather(
+            *[get_full_jobs_pages(url, browser) for url in URLS], return_exceptions=True)
+        ctx.stats["listing_seconds"] = round(time.time() - listing_start)
+
+        for url, html_pages in zip(URLS, html_groups):
+            if isinstance(html_pages, Exception):
+                logger.error(f"❌ Ошибка при загрузке URL {url}: {str(html_pages)}")
+                continue
+            if not html_pages:
+                logger.warning(f"⚠️ Пустой HTML для URL {url}")
+                continue
 
-            all_results = await asyncio.gather(*[
-                process_page_throttled(job, browser) for job in jobs
-            ], return_exceptions=True)
+            ctx.stats["listing_pages"] += len(html_pages)
+            for html in html_pages:
+                for job in await get_job_links_from_page(html):
+                    yield job
 
-            await browser.close()
+        logger.info(
+            f"📊 Листинг {SOURCE} загружен за {time.time() - listing_start:.2f} секунд, "
+            f"страниц: {ctx.stats['listing_pages']}")
 
-        # Обрабатываем результаты
-        valid_jobs = []
-        for result in all_results:
-            if isinstance(result, Exception):
-                logger.error(f"❌ Ошибка при обработке вакансии: {str(result)}")
-            elif result is not None:
-                valid_jobs.append(result)
+    def get_url(self, job: Dict[str, str]) -> str:
+        return job["href"]
 
-        stats["successfully_parsed"] = len(valid_jobs)
-        logger.info(f"📊 Успешно обработано {len(valid_jobs)} вакансий")
+    async def details(self, job: Dict[str, str], ctx: RunContext) -> Optional[Dict[str, str]]:
+        return await get_job_details(job, ctx.state["browser"])
 
-        # Сохраняем в базу данных
-        for job_info in valid_jobs:
-            try:
-                existing = session.exec(
-                    select(Job).where(Job.url == job_info["url"])).first()
-                if not existing:
-                    job = Job(
-                        title=job_info["title"],
-                        url=job_info["url"],
-                        description=job_info["description"],
-                        source=SOURCE,
-                        parsed_at=datetime.utcnow(),
-                        company_url=job_info.get("company_url", ""),
-                        company=job_info["company"]
-                    )
-                    session.add(job)
-                    all_jobs.append(job)
-                    stats["added_to_db"] += 1
-                    logger.info(f"✅ Сохранено: {job_info['title']}")
-                else:
-                    stats["duplicates_skipped"] += 1
-                    logger.info(f"⚠️ Пропущено (дубликат): {existing.title}")
-            except Exception as e:
-                logger.error(
-                    f"❌ Ошибка при сохранении вакансии {job_info.get('title', 'Unknown')}: {str(e)}")
-                continue
 
-        if all_jobs:
-            try:
-                session.commit()
-                logger.info(f"✅ Коммит в БД успешен")
-            except Exception as e:
-                logger.error(f"❌ Ошибка при коммите в БД: {str(e)}")
-                session.rollback()
-
-        end_time = time.time()
-        duration = end_time - start_time
-
-        # Формируем и отправляем отчет в Slack
-        report = (
-            f"📊 *Сводка по парсингу* {SOURCE}:\n"
-            f"Всего найдено запросов по запрос: {stats['total_found']}\n"
-            f"Успешно спарсили: {stats['successfully_parsed']}\n"
-            f"Добавили в БД: {stats['added_to_db']}\n"
-            f"Пропустили дубликатов: {stats['duplicates_skipped']}\n"
-            f"Время выполнения: {duration:.2f} секунд"
-        )
-        await send_slack_message(report)
+parser = VsetiParser()
 
-        logger.info(
-            f"✅ Скрапинг завершен за {duration:.2f} секунд. Добавлено {len(all_jobs)} вакансий")
 
-        return all_jobs
-    except Exception as e:
-        error_message = f"❌ Критическая ошибка при скрапинге: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Ошибка при парсинге {SOURCE}:\n{str(e)}")
-        return []
+async def scrape_vseti_app_jobs(session: Session):
+    """Основная функция скрапинга"""
+    return await parser.run(session)
@@ -3,15 +3,15 @@ Y Combinator Jobs Parser
 Fetches jobs from RapidAPI active-jobs-db and filters for software development positions.
 """
 
-import httpx
-import time
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from sqlmodel import Session, select
+from typing import AsyncIterator, List, Dict, Any, Optional
+from sqlmodel import Session
 from app.models import Job
 from app.logger import logger
-from app.utils.slack import send_slack_message
+from app.parsers.base import Parser, RunContext
+from app.utils.keywords import KeywordMatcher
+from app.utils.http import get_http_client
 from app.config import settings
 
 
@@ -41,6 +41,9 @@ DEV_KEYWORDS = {
     'web developer', 'api developer', 'systems engineer',
     'embedded', 'firmware', 'linux', 'unix',
 }
+# Role nouns that also match as word prefixes: 'engineers', 'engineering'
+DEV_KEYWORD_PREFIXES = {'developer', 'engineer', 'programmer'}
+DEV_KEYWORDS_MATCHER = KeywordMatcher(DEV_KEYWORDS, prefixes=DEV_KEYWORD_PREFIXES)
 
 
 def is_dev_job(title: str, description: str = "") -> bool:
@@ -51,15 +54,7 @@ def is_dev_job(title: str, description: str = "") -> bool:
     if not title:
         return False
     
-    # Combine title and description for checking
-    text_lower = f"{title} {description or ''}".lower()
-    
-    # Check for dev-related keywords
-    for keyword in DEV_KEYWORDS:
-        if keyword in text_lower:
-            return True
-    
-    return False
+    return DEV_KEYWORDS_MATCHER.search(title, description or "")
 
 
 def parse_salary(salary_raw) -> Optional[str]:
@@ -123,31 +118,31 @@ async def fetch_jobs_from_api() -> List[Dict[str, Any]]:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(API_URL, headers=headers)
-            
-            logger.info(f"📡 Ответ API: status={response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list):
-                    logger.info(f"📊 Получено {len(data)} вакансий из Y Combinator API")
-                    return data
-                elif isinstance(data, dict):
-                    # Some APIs wrap results in a dict
-                    jobs = data.get("jobs", data.get("data", data.get("results", [])))
-                    if isinstance(jobs, list):
-                        logger.info(f"📊 Получено {len(jobs)} вакансий из Y Combinator API (из dict)")
-                        return jobs
-                    logger.warning(f"⚠️ Неожиданный формат ответа от API: dict без списка вакансий")
-                    return []
-                else:
-                    logger.warning(f"⚠️ Неожиданный формат ответа от API: {type(data)}")
-                    return []
+        client = get_http_client(API_HOST, timeout=60.0)
+        response = await client.get(API_URL, headers=headers)
+        
+        logger.info(f"📡 Ответ API: status={response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list):
+                logger.info(f"📊 Получено {len(data)} вакансий из Y Combinator API")
+                return data
+            elif isinstance(data, dict):
+                # Some APIs wrap results in a dict
+                jobs = data.get("jobs", data.get("data", data.get("results", [])))
+                if isinstance(jobs, list):
+                    logger.info(f"📊 Получено {len(jobs)} вакансий из Y Combinator API (из dict)")
+                    return jobs
+                logger.warning(f"⚠️ Неожиданный формат ответа от API: dict без списка вакансий")
+                return []
             else:
-                logger.error(f"❌ Ошибка API: {response.status_code} - {response.text[:500]}")
+                logger.warning(f"⚠️ Неожиданный формат ответа от API: {type(data)}")
                 return []
-                
+        else:
+            logger.error(f"❌ Ошибка API: {response.status_code} - {response.text[:500]}")
+            return []
+            
     except Exception as e:
         logger.error(f"❌ Ошибка при запросе к API: {str(e)}")
         return []
@@ -196,102 +191,31 @@ def map_job_to_model(job_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-async def scrape_ycombinator_jobs(session: Session) -> List[Job]:
-    """
-    Main function to scrape Y Combinator jobs from RapidAPI.
-    Fetches from API, filters dev jobs, and saves to database.
-    """
-    all_jobs = []
-    start_time = time.time()
-    
-    # Statistics for report
-    stats = {
-        "total_fetched": 0,
-        "dev_jobs_found": 0,
-        "added_to_db": 0,
-        "duplicates_skipped": 0,
-        "filtered_out": 0,
-    }
-    
-    try:
-        # Fetch all jobs from API
+class YCombinatorParser(Parser):
+    slug = "ycombinator-jobs"
+    source = SOURCE
+    requires_auth = False
+    extra_stats = {"filtered_out": "Отфильтровано не-dev вакансий"}
+
+    async def listings(self, ctx: RunContext) -> AsyncIterator[Dict[str, Any]]:
+        """Dev jobs of the API response, mapped to Job fields."""
         jobs_data = await fetch_all_jobs()
-        stats["total_fetched"] = len(jobs_data)
-        
         if not jobs_data:
             logger.warning("⚠️ Не получено вакансий из Y Combinator API")
-            await send_slack_message(f"⚠️ {SOURCE}: не получено вакансий из API")
-            return []
         
-        # Filter and process jobs
         for job_data in jobs_data:
-            title = job_data.get("title", "")
-            
-            # Check if it's a dev job
-            if not is_dev_job(title):
-                stats["filtered_out"] += 1
-                continue
-            
-            stats["dev_jobs_found"] += 1
-            
-            # Map to model
-            job_info = map_job_to_model(job_data)
-            
-            # Skip if no URL
-            if not job_info["url"]:
-                logger.warning(f"⚠️ Пропущена вакансия без URL: {job_info['title']}")
-                continue
-            
-            # Check for duplicates
-            existing = session.exec(
-                select(Job).where(Job.url == job_info["url"])
-            ).first()
-            
-            if existing:
-                stats["duplicates_skipped"] += 1
-                logger.debug(f"⏭️ Пропущен дубликат: {job_info['title']}")
+            if not is_dev_job(job_data.get("title", "")):
+                ctx.stats["filtered_out"] += 1
                 continue
-            
-            # Create and save job
-            job = Job(
-                title=job_info["title"],
-                url=job_info["url"],
-                description=job_info["description"],
-                company=job_info["company"],
-                company_url=job_info.get("company_url"),
-                salary=job_info["salary"],
-                source=SOURCE,
-                parsed_at=job_info["parsed_at"],
-            )
-            
-            session.add(job)
-            all_jobs.append(job)
-            stats["added_to_db"] += 1
-            logger.info(f"✅ Сохранено: {job_info['title']} @ {job_info['company']}")
-        
-        # Commit all jobs
-        session.commit()
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        # Send Slack report
-        report = (
-            f"📊 *Сводка по парсингу {SOURCE}*:\n"
-            f"Всего найдено вакансий: {stats['dev_jobs_found']}\n"
-            f"Добавлено в БД: {stats['added_to_db']}\n"
-            f"Пропущено дубликатов: {stats['duplicates_skipped']}\n"
-            f"Время выполнения: {duration:.2f} секунд"
-        )
-        await send_slack_message(report)
-        
-        logger.info(f"✅ Парсинг {SOURCE} завершен. Добавлено {stats['added_to_db']} вакансий")
-        
-        return all_jobs
-        
-    except Exception as e:
-        error_message = f"❌ Критическая ошибка при парсинге {SOURCE}: {str(e)}"
-        logger.error(error_message)
-        await send_slack_message(f"❌ Ошибка при парсинге {SOURCE}:\n{str(e)}")
-        return []
+            yield map_job_to_model(job_data)
+
+
+parser = YCombinatorParser()
 
+
+async def scrape_ycombinator_jobs(session: Session) -> List[Job]:
+    """
+    Main function to scrape Y Combinator jobs from RapidAPI.
+    Fetches from API, filters dev jobs, and saves to database.
+    """
+    return await parser.run(session)
@@ -1,15 +1,7 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
-from app.parsers.startup_jobs import scrape_startup_jobs
-from app.parsers.thehub_io import scrape_thehub_jobs
-from app.parsers.vseti_app import scrape_vseti_app_jobs
-from app.parsers.dev_by import scrape_devby_jobs
-from app.parsers.justremote_co import scrape_justremote_jobs
-from app.parsers.remoteok import scrape_remoteok_jobs
-from app.parsers.himalayas_app import scrape_himalayas_jobs
-from app.parsers.ycombinator import scrape_ycombinator_jobs
-from app.parsers.activejobs_db import scrape_activejobs_db
+from app.parsers.registry import PARSERS
 
 
 from app.db import get_session
@@ -44,24 +36,12 @@ async def run_parsers():
 
     session = next(get_session())
     
-    parsers = [
-        ("startup.jobs", scrape_startup_jobs),
-        ("thehub.io", scrape_thehub_jobs),
-        ("vseti.app", scrape_vseti_app_jobs),
-        ("devby.jobs", scrape_devby_jobs),
-        ("justremote.co", scrape_justremote_jobs),
-        ("remoteok.io", scrape_remoteok_jobs),
-        ("himalayas.app", scrape_himalayas_jobs),
-        ("ycombinator", scrape_ycombinator_jobs),
-        ("activejobs_db", scrape_activejobs_db),
-    ]
-    
     success_count = 0
     fail_count = 0
     
     try:
-        for name, parser_func in parsers:
-            result = await run_single_parser(name, parser_func, session)
+        for parser in PARSERS.values():
+            result = await run_single_parser(parser.display_name, parser.run, session)
             if result:
                 success_count += 1
             else:
@@ -78,16 +58,20 @@ async def run_matching_job():
     """Run matching of developers with jobs"""
     # Import here to avoid issues during startup
     from app.matching import run_matching, send_matching_results
+    from app.utils.profiling import profile_run
     
     logger.info("🔍 Начинаю матчинг разработчиков с вакансиями")
     await send_slack_message("🔍 Запуск ежедневного матчинга разработчиков с вакансиями")
     
     session = next(get_session())
     try:
-        results = await run_matching(session)
+        # Профилируется при PROFILE_RUNS
+        async with profile_run("matching", "matching"):
+            results = await run_matching(session)
+            if results:
+                await send_matching_results(results, session)
         
         if results:
-            await send_matching_results(results, session)
             logger.info(f"✅ Матчинг завершен успешно. Найдено совпадений для {len(results)} вакансий")
             await send_slack_message(f"✅ Матчинг завершен успешно. Обработано {len(results)} вакансий")
         else:
@@ -1,8 +1,9 @@
-import httpx
 import re
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
 from app.config import settings
 from app.logger import logger
+from app.utils.http import get_http_client
 
 
 def parse_salary(salary: Optional[str]) -> int:
@@ -69,65 +70,65 @@ async def create_amocrm_lead(
     ]
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Step 1: Create the lead
-            create_url = f"{settings.AMOCRM_BASE_URL}/api/v4/leads"
-            response = await client.post(
-                create_url,
-                headers=headers,
-                json=lead_payload
-            )
-            
-            if response.status_code not in [200, 201]:
-                logger.error(f"❌ Failed to create AmoCRM lead: {response.status_code} - {response.text}")
-                return None
-            
-            response_data = response.json()
-            
-            # Extract lead ID from response
-            if "_embedded" in response_data and "leads" in response_data["_embedded"]:
-                lead_id = response_data["_embedded"]["leads"][0]["id"]
-            else:
-                logger.error(f"❌ Unexpected AmoCRM response format: {response_data}")
-                return None
-            
-            logger.info(f"✅ Created AmoCRM lead with ID: {lead_id}")
-            
-            # Step 2: Add comment with job details and candidates
-            comment_text = f"Вакансия: {job_title}\n"
-            comment_text += f"Компания: {job_company or 'Не указана'}\n"
-            comment_text += f"Ссылка на вакансию: {job_url}\n\n"
-            comment_text += "Кандидаты (score >= 70):\n"
-            
-            for candidate in top_candidates:
-                name = candidate.get("developer_name") or candidate.get("developer", {}).get("name", "Unknown")
-                score = candidate.get("score", 0)
-                comment_text += f"• {name} - {score}%\n"
-            
-            note_payload = [
-                {
-                    "entity_id": lead_id,
-                    "note_type": "common",
-                    "params": {
-                        "text": comment_text
-                    }
+        client = get_http_client(urlparse(settings.AMOCRM_BASE_URL).netloc)
+        # Step 1: Create the lead
+        create_url = f"{settings.AMOCRM_BASE_URL}/api/v4/leads"
+        response = await client.post(
+            create_url,
+            headers=headers,
+            json=lead_payload
+        )
+        
+        if response.status_code not in [200, 201]:
+            logger.error(f"❌ Failed to create AmoCRM lead: {response.status_code} - {response.text}")
+            return None
+        
+        response_data = response.json()
+        
+        # Extract lead ID from response
+        if "_embedded" in response_data and "leads" in response_data["_embedded"]:
+            lead_id = response_data["_embedded"]["leads"][0]["id"]
+        else:
+            logger.error(f"❌ Unexpected AmoCRM response format: {response_data}")
+            return None
+        
+        logger.info(f"✅ Created AmoCRM lead with ID: {lead_id}")
+        
+        # Step 2: Add comment with job details and candidates
+        comment_text = f"Вакансия: {job_title}\n"
+        comment_text += f"Компания: {job_company or 'Не указана'}\n"
+        comment_text += f"Ссылка на вакансию: {job_url}\n\n"
+        comment_text += "Кандидаты (score >= 70):\n"
+        
+        for candidate in top_candidates:
+            name = candidate.get("developer_name") or candidate.get("developer", {}).get("name", "Unknown")
+            score = candidate.get("score", 0)
+            comment_text += f"• {name} - {score}%\n"
+        
+        note_payload = [
+            {
+                "entity_id": lead_id,
+                "note_type": "common",
+                "params": {
+                    "text": comment_text
                 }
-            ]
-            
-            notes_url = f"{settings.AMOCRM_BASE_URL}/api/v4/leads/notes"
-            notes_response = await client.post(
-                notes_url,
-                headers=headers,
-                json=note_payload
-            )
-            
-            if notes_response.status_code not in [200, 201]:
-                logger.warning(f"⚠️ Failed to add comment to lead: {notes_response.status_code}")
-            else:
-                logger.info(f"✅ Added comment to AmoCRM lead {lead_id}")
-            
-            return str(lead_id)
-            
+            }
+        ]
+        
+        notes_url = f"{settings.AMOCRM_BASE_URL}/api/v4/leads/notes"
+        notes_response = await client.post(
+            notes_url,
+            headers=headers,
+            json=note_payload
+        )
+        
+        if notes_response.status_code not in [200, 201]:
+            logger.warning(f"⚠️ Failed to add comment to lead: {notes_response.status_code}")
+        else:
+            logger.info(f"✅ Added comment to AmoCRM lead {lead_id}")
+        
+        return str(lead_id)
+        
     except Exception as e:
         logger.error(f"❌ Error creating AmoCRM lead: {str(e)}")
         return None
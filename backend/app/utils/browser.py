@@ -1,14 +1,43 @@
 
-import asyncio
-from playwright.async_api import async_playwright,  TimeoutError as PlaywrightTimeoutError, Page, Browser, BrowserContext
-# from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from playwright.async_api import async_playwright,  TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError, Page, Browser, BrowserContext
 from app.logger import logger
-from typing import Optional
+from app.metrics import BROWSER_PAGES_OPEN, count_http_response, observe_page_fetch
+from app.utils.limiter import THROTTLE_STATUSES, limiter_for_url, normalize_host
+from app.utils.page_cache import read_cached_page, write_cached_page
+from app.utils.replay import ReplayBrowser, get_replay
+from app.utils.retry import FetchError, fetch_with_retry
+from datetime import timedelta
+from typing import Optional, Tuple
+import time
+import weakref
 
 from contextlib import asynccontextmanager
 
-MAX_PAGES = 15
-browser_semaphore = asyncio.Semaphore(MAX_PAGES)
+# Запущенные браузеры, для метрики открытых страниц
+_browsers: "weakref.WeakSet[Browser]" = weakref.WeakSet()
+
+
+def count_open_pages() -> int:
+    return sum(
+        len(context.pages)
+        for browser in list(_browsers) if browser.is_connected()
+        for context in browser.contexts
+    )
+
+
+BROWSER_PAGES_OPEN.set_function(count_open_pages)
+
+
+async def launch_chromium(p, **kwargs) -> Browser:
+    """
+    Запускает Chromium (аргументы как у p.chromium.launch).
+    Во время записи или воспроизведения (app.utils.replay) страницы браузера
+    загружаются через нее.
+    """
+    browser = await p.chromium.launch(**kwargs)
+    _browsers.add(browser)
+    replay = get_replay()
+    return ReplayBrowser(browser, replay) if replay is not None else browser
 
 
 @asynccontextmanager
@@ -27,7 +56,8 @@ async def get_browser_page(url: str):
         logger.info(f"📊 Открываю страницу: {url}")
 
         # Настройки для VPS
-        browser = await p.chromium.launch(
+        browser = await launch_chromium(
+            p,
             headless=True,
             args=[
                 '--no-sandbox',
@@ -59,19 +89,92 @@ async def get_browser_page(url: str):
             await context.close()
             await browser.close()
 
-# @retry(
-#     stop=stop_after_attempt(3),
-#     wait=wait_exponential(multiplier=1, min=2, max=10),
-#     retry=retry_if_exception_type(PlaywrightTimeoutError)
-# )
+# Страница короче считается пустой (about:blank, оборванный ответ)
+MIN_CONTENT_LENGTH = 200
+
+
+async def load_page(page: Page, url: str) -> Tuple[str, bool]:
+    """
+    Одна попытка загрузки страницы в открытой вкладке.
+
+    Returns:
+        (HTML, дождались ли тишины в сети). Если сеть не затихла за 10 секунд,
+        возвращается то, что успело отрисоваться
+
+    Raises:
+        FetchError: timeout, navigation, blocked (403/429) или empty
+    """
+    host = normalize_host(url)
+    started = time.perf_counter()
+    try:
+        content, settled = await _load_page(page, url, host)
+    except FetchError as e:
+        observe_page_fetch(host, e.kind, time.perf_counter() - started)
+        raise
+    observe_page_fetch(host, "ok" if settled else "partial", time.perf_counter() - started)
+    return content, settled
+
+
+async def _load_page(page: Page, url: str, host: str) -> Tuple[str, bool]:
+    async with limiter_for_url(url).slot() as slot:
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except PlaywrightTimeoutError as e:
+            slot.report_timeout()
+            raise FetchError("timeout", url) from e
+        except PlaywrightError as e:
+            raise FetchError("navigation", url, str(e).splitlines()[0]) from e
+
+        status = response.status if response else None
+        count_http_response(host, "browser", status)
+        slot.report_status(status)
+        if status in THROTTLE_STATUSES:
+            raise FetchError("blocked", url, f"HTTP {status}")
+
+        settled = True
+        try:
+            await page.wait_for_load_state("networkidle", timeout=10000)
+            await page.wait_for_timeout(1000)
+        except PlaywrightTimeoutError:
+            # Не дождаться тишины в сети — не повод снижать параллельность
+            settled = False
+            logger.warning(f"⚠️ Timeout на {url}, возвращаю возможный контент...")
+        content = await page.content()
+
+    if len(content) < MIN_CONTENT_LENGTH:
+        raise FetchError("empty", url, f"{len(content)} байт")
+    return content, settled
+
+
+async def fetch_html_browser(url: str, screenshot_path: Optional[str] = None,
+                             cache_ttl: Optional[timedelta] = None) -> str:
+    """
+    Загружает HTML страницы в отдельном браузере.
+
+    Args:
+        url: Адрес страницы
+        screenshot_path: Куда сохранить скриншот (опционально)
+        cache_ttl: Если задан, страница берется из кэша, пока ей меньше cache_ttl,
+            а успешно загруженная страница сохраняется в кэш
 
+    Returns:
+        HTML содержимое страницы
+
+    Raises:
+        FetchError: страницу не удалось загрузить за все попытки
+    """
+    if cache_ttl and not screenshot_path:
+        cached = await read_cached_page(url, cache_ttl)
+        if cached is not None:
+            logger.info(f"💾 HTML из кэша: {url}")
+            return cached
 
-async def fetch_html_browser(url: str, screenshot_path: Optional[str] = None) -> str:
     async with async_playwright() as p:
         logger.info(f"📊 Запрашиваю HTML: {url}")
 
         # Настройки для VPS
-        browser = await p.chromium.launch(
+        browser = await launch_chromium(
+            p,
             headless=True,
             args=[
                 '--no-sandbox',
@@ -87,75 +190,70 @@ async def fetch_html_browser(url: str, screenshot_path: Optional[str] = None) ->
         context = await browser.new_context(
             user_agent='Mozilla/5.0 (Linux; x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         )
-        page = await context.new_page()
-
-        try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await page.wait_for_timeout(1000)
-        except PlaywrightTimeoutError:
-            logger.warning(
-                f"⚠️ Timeout на {url}, возвращаю возможный контент...")
 
-        if screenshot_path:
+        async def attempt() -> Tuple[str, bool]:
+            page = await context.new_page()
             try:
-                await page.screenshot(path=screenshot_path, full_page=True)
-                logger.info(f"📸 Скриншот сохранен: {screenshot_path}")
-            except Exception as e:
-                logger.error(f"❌ Ошибка при создании скриншота: {e}")
+                result = await load_page(page, url)
+                if screenshot_path:
+                    try:
+                        await page.screenshot(path=screenshot_path, full_page=True)
+                        logger.info(f"📸 Скриншот сохранен: {screenshot_path}")
+                    except Exception as e:
+                        logger.error(f"❌ Ошибка при создании скриншота: {e}")
+                return result
+            finally:
+                await page.close()
 
-        content = await page.content()
-        await context.close()
-        await browser.close()
+        try:
+            content, settled = await fetch_with_retry(url, attempt)
+        finally:
+            await context.close()
+            await browser.close()
+
+        # Частично загруженные страницы не кэшируем
+        if cache_ttl and settled:
+            await write_cached_page(url, content)
         return content
 
 
-# @retry(
-#     stop=stop_after_attempt(3),
-#     wait=wait_exponential(multiplier=1, min=2, max=10),
-#     retry=retry_if_exception_type(PlaywrightTimeoutError)
-# )
-# async def _fetch_html_async(url: str, browser) -> str:
-#     # async with async_playwright() as p:
-#     logger.info(f"📊 Запрашиваю HTML: {url}")
-#     # browser = await p.chromium.launch(headless=False)
-#     page = await browser.new_page()
-
-#     try:
-#         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-#         await page.wait_for_load_state("networkidle", timeout=10000)
-#         await page.wait_for_timeout(1000)  # Подстраховка
-#     except PlaywrightTimeoutError:
-#         logger.warning(
-#             f"⚠️ Timeout на {url}, возвращаю возможный контент...")
-
-#     content = await page.content()
-#     await browser.close()
-#     return content
-
-
-async def fetch_html_async(url: str, browser) -> str:
-    """Загружает HTML содержимое страницы с помощью переданного браузера."""
-    async with browser_semaphore:
-        # Проверяем, что браузер еще не закрыт
-        if browser.is_connected() == False:
-            logger.error(f"❌ Браузер закрыт, не могу загрузить {url}")
-            return ""
+async def fetch_html_async(url: str, browser, cache_ttl: Optional[timedelta] = None) -> str:
+    """
+    Загружает HTML содержимое страницы с помощью переданного браузера.
+
+    Если задан cache_ttl, страница берется из кэша, пока ей меньше cache_ttl,
+    а успешно загруженная страница сохраняется в кэш.
+    Неудачные загрузки повторяются (app.utils.retry); если страницу так и не
+    удалось загрузить, возвращается пустая строка.
+    """
+    if cache_ttl:
+        cached = await read_cached_page(url, cache_ttl)
+        if cached is not None:
+            logger.info(f"💾 HTML из кэша: {url}")
+            return cached
 
+    # Проверяем, что браузер еще не закрыт
+    if browser.is_connected() == False:
+        logger.error(f"❌ Браузер закрыт, не могу загрузить {url}")
+        return ""
+
+    async def attempt() -> Tuple[str, bool]:
         page = await browser.new_page()
         try:
             logger.info(f"🌐 Загружаю страницу: {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await page.wait_for_timeout(1000)
-            content = await page.content()
-        except PlaywrightTimeoutError:
-            logger.warning(
-                f"⚠️ Timeout при загрузке {url}, возвращаю частичный контент")
-            content = await page.content()
-        except Exception as e:
-            logger.error(f"❌ Ошибка при загрузке {url}: {e}")
-            content = ""
+            return await load_page(page, url)
         finally:
             await page.close()
-        return content
+
+    try:
+        content, settled = await fetch_with_retry(url, attempt)
+    except FetchError as e:
+        logger.error(f"❌ Не удалось загрузить {url}: {e}")
+        return ""
+    except Exception as e:
+        logger.error(f"❌ Ошибка при загрузке {url}: {e}")
+        return ""
+
+    if cache_ttl and settled:
+        await write_cached_page(url, content)
+    return content
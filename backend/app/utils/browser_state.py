@@ -0,0 +1,50 @@
+"""
+Сессия браузера (cookies и localStorage) между запусками, зашифрованная Fernet-ключом.
+Сессия, которую не удалось расшифровать, считается отсутствующей.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.logger import logger
+
+
+def make_fernet(key: Optional[str]) -> Optional[Fernet]:
+    """Fernet from the configured key, None if the key is missing or invalid."""
+    if not key:
+        return None
+    try:
+        return Fernet(key.encode())
+    except ValueError:
+        logger.error("❌ Ключ шифрования сессии должен быть Fernet-ключом (32 байта в urlsafe base64)")
+        return None
+
+
+def load_browser_state(path: str, fernet: Fernet) -> Optional[Dict[str, Any]]:
+    """Decrypted state saved by save_browser_state(), None if missing or unreadable."""
+    state_path = Path(path)
+    if not state_path.exists():
+        return None
+    try:
+        return json.loads(fernet.decrypt(state_path.read_bytes()))
+    except (InvalidToken, ValueError, OSError) as e:
+        logger.warning(f"⚠️ Не удалось прочитать сохраненную сессию {path}: {type(e).__name__}")
+        return None
+
+
+def save_browser_state(path: str, fernet: Fernet, state: Dict[str, Any]) -> None:
+    """Encrypt and atomically replace the saved state, readable by the owner only."""
+    state_path = Path(path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(state_path.suffix + ".tmp")
+    tmp_path.write_bytes(fernet.encrypt(json.dumps(state).encode("utf-8")))
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, state_path)
+
+
+def delete_browser_state(path: str) -> None:
+    Path(path).unlink(missing_ok=True)
@@ -0,0 +1,194 @@
+import hashlib
+import random
+import re
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+from uuid import UUID
+from sqlmodel import Session, select
+from app.models import Job, JobSignature
+from app.logger import logger
+from app.utils.executor import run_cpu_bound
+
+T = TypeVar("T")
+
+# Максимум URL в одном IN (...), чтобы не упираться в размер запроса
+KNOWN_URLS_CHUNK_SIZE = 1000
+
+
+def get_known_urls(session: Session, urls: Iterable[str]) -> Set[str]:
+    """
+    Return the subset of urls that are already stored as jobs.
+
+    Resolved with one indexed query per KNOWN_URLS_CHUNK_SIZE urls instead
+    of a SELECT per job.
+    """
+    unique_urls = list({url for url in urls if url})
+    known: Set[str] = set()
+    for i in range(0, len(unique_urls), KNOWN_URLS_CHUNK_SIZE):
+        chunk = unique_urls[i:i + KNOWN_URLS_CHUNK_SIZE]
+        known.update(session.exec(
+            select(Job.url).where(Job.url.in_(chunk)).execution_options(query_name="known_urls")).all())
+    return known
+
+
+def skip_known_jobs(
+    session: Session,
+    items: List[T],
+    get_url: Callable[[T], Any],
+) -> Tuple[List[T], int]:
+    """
+    Drop listing items whose url is already in the database, before their
+    detail pages are fetched.
+
+    Args:
+        session: Database session
+        items: Listing items (dicts, tags, ...)
+        get_url: Function returning the job url of an item
+
+    Returns:
+        (items to fetch, number of skipped known items)
+    """
+    known = get_known_urls(session, (get_url(item) for item in items))
+    fresh = [item for item in items if get_url(item) not in known]
+    skipped = len(items) - len(fresh)
+    if skipped:
+        logger.info(f"⏭️ Пропускаю {skipped} уже известных вакансий без загрузки деталей")
+    return fresh, skipped
+
+
+# --- Почти-дубликаты одной вакансии на разных площадках (MinHash + LSH) ---
+#
+# Сигнатуры хранятся в таблице jobsignature: при изменении любого из
+# параметров ниже старые сигнатуры перестают совпадать с новыми.
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 128
+# 32 полосы по 4 строки: кандидатами становятся пары с похожестью от ~0.4
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_rnd = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rnd.randrange(1, _MERSENNE_PRIME), _rnd.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+# Оценка Jaccard по шинглам company + title + description
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Jaccard по словам заголовка: "Senior" и "Staff" версии одной роли не склеиваем
+TITLE_SIMILARITY_THRESHOLD = 0.75
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _words(text: Optional[str]) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def _hash64(value: str) -> int:
+    """Stable across processes, unlike hash()."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def minhash_signature(title: str, company: Optional[str], description: Optional[str]) -> List[int]:
+    """MinHash signature over word shingles of normalized company, title and description."""
+    words = _words(company) + _words(title) + _words(description)
+    if len(words) < SHINGLE_SIZE:
+        shingles = set(words)
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    if not shingles:
+        return []
+
+    hashed = [_hash64(shingle) % _MERSENNE_PRIME for shingle in shingles]
+    return [
+        min((a * x + b) % _MERSENNE_PRIME for x in hashed)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def minhash_signatures(jobs: Sequence[Tuple[str, Optional[str], Optional[str]]]) -> List[List[int]]:
+    """Signatures for (title, company, description) tuples, runs in the parsing process pool."""
+    return [minhash_signature(*job) for job in jobs]
+
+
+def lsh_bands(signature: Sequence[int]) -> List[int]:
+    """Hash of each LSH band: jobs sharing any band hash are duplicate candidates."""
+    return [
+        _hash64(f"{band}:" + ",".join(map(str, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])))
+        for band in range(LSH_BANDS)
+    ]
+
+
+def estimate_similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not left or len(left) != len(right):
+        return 0.0
+    return sum(a == b for a, b in zip(left, right)) / len(left)
+
+
+def title_similarity(left: str, right: str) -> float:
+    left_words, right_words = set(_words(left)), set(_words(right))
+    if not left_words or not right_words:
+        return 0.0
+    return len(left_words & right_words) / len(left_words | right_words)
+
+
+def find_canonical_job(session: Session, job: Job, signature: List[int], bands: List[int]) -> Optional[UUID]:
+    """
+    Find an already stored copy of job posted on another source.
+
+    Returns:
+        id of the canonical job (the first stored copy) or None
+    """
+    candidates = session.exec(
+        select(JobSignature.signature, Job.id, Job.title, Job.canonical_job_id)
+        .join(Job, Job.id == JobSignature.job_id)
+        .where(JobSignature.bands.overlap(bands))
+        .where(Job.source != job.source)
+        .execution_options(query_name="near_duplicate_candidates")
+    ).all()
+
+    best_id, best_similarity = None, NEAR_DUPLICATE_THRESHOLD
+    for candidate_signature, candidate_id, candidate_title, candidate_canonical_id in candidates:
+        if title_similarity(job.title, candidate_title) < TITLE_SIMILARITY_THRESHOLD:
+            continue
+        similarity = estimate_similarity(signature, candidate_signature)
+        if similarity >= best_similarity:
+            best_id, best_similarity = candidate_canonical_id or candidate_id, similarity
+    return best_id
+
+
+async def link_duplicates(session: Session, jobs: List[Job]) -> int:
+    """
+    Store MinHash signatures of new jobs and link copies of vacancies already
+    stored from other sources to their canonical job. Call before commit.
+
+    Args:
+        session: Database session the jobs were added to
+        jobs: New jobs of one parser run
+
+    Returns:
+        Number of jobs linked as duplicates
+    """
+    if not jobs:
+        return 0
+    # Вакансии должны быть в БД раньше, чем ссылающиеся на них сигнатуры
+    session.flush()
+
+    signatures = await run_cpu_bound(
+        minhash_signatures, [(job.title, job.company, job.description) for job in jobs])
+
+    linked = 0
+    for job, signature in zip(jobs, signatures):
+        if not signature:
+            continue
+        bands = lsh_bands(signature)
+        canonical_id = find_canonical_job(session, job, signature, bands)
+        if canonical_id:
+            job.canonical_job_id = canonical_id
+            linked += 1
+            logger.info(f"🔗 Дубликат вакансии с другой площадки: {job.title} ({job.url}) -> {canonical_id}")
+        session.add(JobSignature(job_id=job.id, signature=signature, bands=bands))
+
+    if linked:
+        logger.info(f"🔗 Связано с вакансиями других площадок: {linked} из {len(jobs)}")
+    return linked
@@ -0,0 +1,110 @@
+"""
+Общий пул процессов для разбора HTML и ответов API. Воркеры запускаются через spawn:
+в приложении есть потоки, а fork процесса с потоками небезопасен.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+from app.logger import logger
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+executor_stats: Dict[str, Any] = {
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "wall_seconds": 0.0,
+    "pool_restarts": 0,
+}
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool, created on first use. None if PARSE_WORKERS is 0."""
+    global _executor
+    if _executor is None and settings.PARSE_WORKERS > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"⚙️ Запущен пул процессов для парсинга: {settings.PARSE_WORKERS} воркеров")
+    return _executor
+
+
+async def run_cpu_bound(func: Callable[..., T], *args) -> T:
+    """
+    Run func(*args) in the shared process pool.
+
+    func must be a module-level function and args/result must be picklable.
+    With PARSE_WORKERS=0 the call runs in a thread of this process instead.
+    If a worker died and broke the pool, the pool is rebuilt and the call
+    is retried once.
+    """
+    executor_stats["submitted"] += 1
+    executor_stats["in_flight"] += 1
+    executor_stats["max_in_flight"] = max(executor_stats["max_in_flight"], executor_stats["in_flight"])
+    started = time.perf_counter()
+    try:
+        executor = get_executor()
+        try:
+            result = await _run(executor, func, *args)
+        except BrokenProcessPool:
+            logger.warning("⚠️ Пул процессов для парсинга сломан (воркер завершился), пересоздаю")
+            _discard_executor(executor)
+            executor = get_executor()
+            try:
+                result = await _run(executor, func, *args)
+            except BrokenProcessPool:
+                # Задача сама роняет воркер: пул снова пересоздастся к следующему вызову
+                _discard_executor(executor)
+                raise
+        executor_stats["completed"] += 1
+        return result
+    except Exception:
+        executor_stats["failed"] += 1
+        raise
+    finally:
+        executor_stats["in_flight"] -= 1
+        executor_stats["wall_seconds"] += time.perf_counter() - started
+
+
+async def _run(executor: Optional[ProcessPoolExecutor], func: Callable[..., T], *args) -> T:
+    if executor is None:
+        return await asyncio.to_thread(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def _discard_executor(executor: Optional[ProcessPoolExecutor]) -> None:
+    # Одновременно упавшие вызовы не должны остановить пул, уже пересозданный другим вызовом
+    if executor is not None and executor is _executor:
+        executor_stats["pool_restarts"] += 1
+        shutdown_executor()
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Counters of the pool; queue_depth is the number of tasks waiting for a free worker."""
+    workers = settings.PARSE_WORKERS
+    return {
+        **executor_stats,
+        "workers": workers,
+        "queue_depth": max(0, executor_stats["in_flight"] - max(workers, 1)),
+        "wall_seconds": round(executor_stats["wall_seconds"], 3),
+    }
+
+
+def shutdown_executor() -> None:
+    """Stop worker processes, called on application shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("⚙️ Пул процессов для парсинга остановлен")
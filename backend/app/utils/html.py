@@ -0,0 +1,53 @@
+"""
+Разбор HTML для парсеров: make_soup() на lxml (если установлен) с SoupStrainer
+и parse_html() в пуле процессов.
+"""
+
+from typing import Callable, Optional, TypeVar
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.utils.executor import run_cpu_bound
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+T = TypeVar("T")
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup tree with the fastest available backend.
+
+    Args:
+        html: Page HTML
+        parse_only: Keep only tags matching this strainer (and their children)
+
+    Returns:
+        Parsed document
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def has_class(attrs: dict, class_name: str) -> bool:
+    """
+    Check a class token in raw tag attributes, as passed to a SoupStrainer
+    callable during parsing (class may be a string or a list there).
+    """
+    classes = attrs.get("class") or ""
+    if isinstance(classes, str):
+        classes = classes.split()
+    return class_name in classes
+
+
+async def parse_html(func: Callable[..., T], *args) -> T:
+    """
+    Run a sync HTML parse function in the parsing process pool.
+
+    func must be a module-level function of picklable arguments: changes
+    it makes to mutable arguments are not visible to the caller.
+    """
+    return await run_cpu_bound(func, *args)
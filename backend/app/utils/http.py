@@ -0,0 +1,143 @@
+"""
+Общие keep-alive HTTP клиенты внешних API, по одному на хост, со счетчиками
+переиспользования соединений.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.logger import logger
+from app.metrics import count_http_response
+from app.utils.replay import ReplayTransport, get_replay
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+
+http_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+    "requests": 0,
+    "connections_opened": 0,
+    "http2_responses": 0,
+    "errors": 0,
+})
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _make_hooks(host: str) -> Dict[str, list]:
+    stats = http_stats[host]
+
+    async def trace(event_name: str, info: Dict[str, Any]) -> None:
+        if event_name in ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete"):
+            stats["connections_opened"] += 1
+
+    async def on_request(request: httpx.Request) -> None:
+        stats["requests"] += 1
+        request.extensions["trace"] = trace
+
+    async def on_response(response: httpx.Response) -> None:
+        count_http_response(host, "httpx", response.status_code)
+        if response.http_version == "HTTP/2":
+            stats["http2_responses"] += 1
+        if response.status_code >= 500:
+            stats["errors"] += 1
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def get_http_client(
+    host: str,
+    *,
+    timeout: Optional[float] = None,
+    headers: Optional[Dict[str, str]] = None,
+    follow_redirects: bool = False,
+) -> httpx.AsyncClient:
+    """
+    Application-wide client for one external host.
+
+    The client is configured on first use: later calls with the same host
+    return it as is, per-request options are passed to client.get()/post().
+    Connection failures are retried by the transport HTTP_RETRIES times,
+    HTTP-level retries (429, 5xx) stay with the callers.
+
+    Args:
+        host: Host name, also the key of connection metrics
+        timeout: Read/write/pool timeout in seconds (HTTP_TIMEOUT_SECONDS by default)
+        headers: Default headers of the client
+        follow_redirects: Follow redirects by default
+
+    Returns:
+        Shared httpx.AsyncClient, must not be closed by the caller
+    """
+    loop = _running_loop()
+    entry = _clients.get(host)
+    # httpx connections are bound to the event loop that opened them: scripts
+    # running their own asyncio.run() get a client of their own
+    if entry is not None and not entry[0].is_closed and entry[1] is loop:
+        return entry[0]
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS,
+    )
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=limits,
+        retries=settings.HTTP_RETRIES,
+    )
+    replay = get_replay()
+    if replay is not None:
+        transport = ReplayTransport(transport, replay)
+    client = httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            timeout or settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        headers=headers,
+        follow_redirects=follow_redirects,
+        event_hooks=_make_hooks(host),
+    )
+    _clients[host] = (client, loop)
+    logger.info(f"🌐 HTTP клиент для {host} (HTTP/2: {'да' if HTTP2_AVAILABLE else 'нет'})")
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close pooled connections, called on application shutdown."""
+    loop = _running_loop()
+    for host, (client, client_loop) in list(_clients.items()):
+        if client_loop is loop and not client.is_closed:
+            await client.aclose()
+    _clients.clear()
+
+
+def get_http_stats() -> Dict[str, Any]:
+    """Per-host request counters and connection reuse ratio."""
+    hosts = {}
+    for host, stats in http_stats.items():
+        reused = max(0, stats["requests"] - stats["connections_opened"])
+        hosts[host] = {
+            **stats,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / stats["requests"], 3) if stats["requests"] else 0.0,
+        }
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "open_clients": sum(1 for client, _ in _clients.values() if not client.is_closed),
+        "hosts": hosts,
+    }
@@ -0,0 +1,88 @@
+import re
+from typing import Any, Dict, Iterable, Set
+
+
+class KeywordMatcher:
+    """
+    Keyword set compiled into a single regex.
+
+    A keyword matches a whole word: 'go' hits 'go developer' but not
+    'google' or 'goods', 'java' does not hit 'javanese'. Keywords that start
+    or end with a non-word character ('.net', 'c++', 'go ') have no boundary
+    check on that side. Stems passed as prefixes match the start of a word:
+    the prefix 'engineer' hits 'engineers' and 'engineering' but not
+    'reengineer'. When keywords share a prefix, the longest one is reported
+    ('developer' rather than 'dev').
+
+    Keywords are arranged into a prefix trie, so the regex engine checks
+    each text position against one branch per first character instead of
+    trying every keyword in turn.
+
+    Usage:
+        matcher = KeywordMatcher({'react', 'node', 'full stack'}, prefixes={'developer'})
+        matcher.search("Senior React Developers")  # True
+        matcher.find("node.js / react")            # {'node', 'react'}
+    """
+
+    def __init__(self, keywords: Iterable[str], prefixes: Iterable[str] = ()):
+        self.keywords = frozenset(keyword.lower() for keyword in keywords if keyword)
+        self.prefixes = frozenset(prefix.lower() for prefix in prefixes if prefix)
+        self._pattern = re.compile(self._build_pattern(self.keywords, self.prefixes))
+
+    def search(self, *texts: str) -> bool:
+        """Check if any keyword occurs in any of texts."""
+        return self._pattern.search(self._join(texts)) is not None
+
+    def find(self, *texts: str) -> Set[str]:
+        """Return keywords that occur in texts."""
+        return {match.group(0) for match in self._pattern.finditer(self._join(texts))}
+
+    @staticmethod
+    def _join(texts: Iterable[str]) -> str:
+        # Newline is a word boundary, so keywords never match across two texts
+        return "\n".join(text for text in texts if text).lower()
+
+    @classmethod
+    def _build_pattern(cls, keywords: Iterable[str], prefixes: Iterable[str] = ()) -> str:
+        # The "" key marks where a keyword ends and holds its word-end check
+        trie: Dict[str, Any] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node.setdefault("", r"(?!\w)" if keyword[-1].isalnum() else "")
+        for prefix in prefixes:
+            node = trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            # A prefix accepts any continuation, so it overrides a word-end check
+            node[""] = ""
+
+        if not trie:
+            # (?!) never matches, so an empty keyword set matches nothing
+            return "(?!)"
+
+        branches = []
+        for char in sorted(trie):
+            # The word-start check goes after the first character: a leading
+            # literal lets the engine skip positions that cannot start a keyword.
+            # (?<!\w.) looks at the character before the one just consumed.
+            guard = r"(?<!\w.)" if char.isalnum() else ""
+            branches.append(re.escape(char) + guard + cls._build_node(trie[char]))
+        return "(?:" + "|".join(branches) + ")"
+
+    @classmethod
+    def _build_node(cls, node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + cls._build_node(child) for char, child in sorted(node.items()) if char]
+        end = node.get("")
+        if not branches:
+            return end or ""
+        if end is None and len(branches) == 1:
+            return branches[0]
+        if end == "":
+            # Greedy optional group: the longer keyword wins when both match
+            return "(?:" + "|".join(branches) + ")?"
+        if end is None:
+            return "(?:" + "|".join(branches) + ")"
+        # The word-end check is the last alternative, after the longer keywords
+        return "(?:" + "|".join(branches + [end]) + ")"
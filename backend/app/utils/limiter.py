@@ -0,0 +1,189 @@
+"""
+Адаптивная (AIMD) параллельность загрузок для каждого сайта. Лимитеры живут весь процесс:
+следующий запуск начинает с подобранного лимита.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.config import settings
+from app.logger import logger
+
+# Ответы, которыми сайт просит снизить частоту запросов
+THROTTLE_STATUSES = {403, 429}
+# Рост лимита только пока задержка не больше чем в столько раз превышает лучшую
+LATENCY_TOLERANCE = 2.0
+LATENCY_SMOOTHING = 0.2
+TIMEOUT_ERRORS = (asyncio.TimeoutError, TimeoutError, PlaywrightTimeoutError, httpx.TimeoutException)
+
+
+class Slot:
+    """One acquired request slot; the caller reports how the request went."""
+
+    def __init__(self, limiter: "AdaptiveLimiter"):
+        self.limiter = limiter
+        self.failed = False
+
+    def report_status(self, status: Optional[int]) -> None:
+        if status in THROTTLE_STATUSES:
+            self.failed = True
+            self.limiter.on_failure("throttled", f"HTTP {status}")
+
+    def report_timeout(self) -> None:
+        self.failed = True
+        self.limiter.on_failure("timeouts", "timeout")
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit of one host, see the module docstring."""
+
+    def __init__(self, host: str, initial: int, min_limit: int, max_limit: int):
+        self.host = host
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "timeouts": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.current_limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Освобожденный для нас слот отдаем следующему
+                self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.current_limit - self.in_flight
+        for waiter in list(self._waiters):
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Slot]:
+        """
+        Hold one request slot. A request that completes without a reported
+        failure counts as a success with its duration as latency; timeouts
+        raised out of the block count as failures.
+        """
+        await self.acquire()
+        slot = Slot(self)
+        started = time.monotonic()
+        self.stats["requests"] += 1
+        try:
+            yield slot
+        except TIMEOUT_ERRORS:
+            if not slot.failed:
+                slot.report_timeout()
+            raise
+        else:
+            if not slot.failed:
+                self.on_success(time.monotonic() - started)
+        finally:
+            self.release()
+
+    def on_success(self, latency: float) -> None:
+        self._latency = latency if self._latency is None else (
+            LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self._latency)
+        self._best_latency = latency if self._best_latency is None else min(self._best_latency, latency)
+        if self._latency > LATENCY_TOLERANCE * self._best_latency or self.limit >= self.max_limit:
+            return
+
+        previous = self.current_limit
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        if self.current_limit > previous:
+            self.stats["increases"] += 1
+            self._wake()
+
+    def on_failure(self, kind: str, reason: str) -> None:
+        self.stats[kind] += 1
+        now = time.monotonic()
+        if now - self._last_decrease < max(self._latency or 0.0, 1.0):
+            return
+
+        self._last_decrease = now
+        previous = self.current_limit
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        if self.current_limit < previous:
+            self.stats["decreases"] += 1
+            logger.warning(
+                f"🐢 {self.host}: {reason}, снижаю параллельность {previous} → {self.current_limit}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "latency_seconds": round(self._latency, 3) if self._latency is not None else None,
+            "best_latency_seconds": round(self._best_latency, 3) if self._best_latency is not None else None,
+            **self.stats,
+        }
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def normalize_host(url_or_host: str) -> str:
+    """Host of a URL (or a bare host name) without the www. prefix."""
+    host = urlparse(url_or_host).netloc if "//" in url_or_host else url_or_host
+    host = host.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def get_limiter(host: str) -> AdaptiveLimiter:
+    """Process-wide limiter of one host, created on first use."""
+    host = normalize_host(host)
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = AdaptiveLimiter(
+            host,
+            initial=settings.ADAPTIVE_CONCURRENCY_INITIAL,
+            min_limit=settings.ADAPTIVE_CONCURRENCY_MIN,
+            max_limit=settings.ADAPTIVE_CONCURRENCY_MAX,
+        )
+        _limiters[host] = limiter
+    return limiter
+
+
+def limiter_for_url(url: str) -> AdaptiveLimiter:
+    return get_limiter(normalize_host(url))
+
+
+def get_limiter_stats() -> Dict[str, Any]:
+    """Current limit, load and failure counters of every host."""
+    return {host: limiter.snapshot() for host, limiter in _limiters.items()}
@@ -1,10 +1,15 @@
 import httpx
 import json
 import asyncio
+import time
 from app.config import settings
 from app.logger import logger
+from app.metrics import LLM_REQUEST_SECONDS, count_llm_usage
+from app.utils.http import get_http_client
 from typing import Dict, Any, List
 
+OPENROUTER_HOST = "openrouter.ai"
+
 
 async def evaluate_match_batch(developers: List[Dict[str, Any]], job_info: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
@@ -139,72 +144,78 @@ Include ALL developers in response, even with low scores."""
     max_retries = 3
     base_delay = 2
     
+    model = payload["model"]
     for attempt in range(max_retries):
+        started = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
+            client = get_http_client(OPENROUTER_HOST, timeout=60.0)
+            response = await client.post(
+                f"https://{OPENROUTER_HOST}/api/v1/chat/completions",
+                headers=headers,
+                json=payload
+            )
+            outcome = {200: "ok", 429: "rate_limited"}.get(response.status_code, "error")
+            LLM_REQUEST_SECONDS.labels(model, outcome).observe(time.perf_counter() - started)
+            
+            if response.status_code == 200:
+                result = response.json()
+                count_llm_usage(model, result.get("usage") or {})
+                content = result['choices'][0]['message']['content']
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
+                # Try to parse JSON from the response
+                try:
+                    # Remove markdown code blocks if present
+                    content = content.strip()
+                    if content.startswith("```json"):
+                        content = content[7:]
+                    if content.startswith("```"):
+                        content = content[3:]
+                    if content.endswith("```"):
+                        content = content[:-3]
+                    content = content.strip()
                     
-                    # Try to parse JSON from the response
-                    try:
-                        # Remove markdown code blocks if present
-                        content = content.strip()
-                        if content.startswith("```json"):
-                            content = content[7:]
-                        if content.startswith("```"):
-                            content = content[3:]
-                        if content.endswith("```"):
-                            content = content[:-3]
-                        content = content.strip()
-                        
-                        parsed = json.loads(content)
-                        
-                        # Validate the response for batch format
-                        if "matches" in parsed and isinstance(parsed["matches"], list):
-                            matches = []
-                            for match in parsed["matches"]:
-                                if "developer_id" in match and "score" in match:
-                                    score = int(match["score"])
-                                    if 0 <= score <= 100:
-                                        matches.append({
-                                            "developer_id": str(match["developer_id"]),
-                                            "score": score,
-                                            "reasoning": match.get("reasoning", "")
-                                        })
-                            
-                            logger.info(f"✅ LLM batch evaluation: {len(matches)} developers evaluated")
-                            return matches
-                        
-                        logger.warning(f"⚠️ Invalid LLM response format: {parsed}")
-                        return []
+                    parsed = json.loads(content)
+                    
+                    # Validate the response for batch format
+                    if "matches" in parsed and isinstance(parsed["matches"], list):
+                        matches = []
+                        for match in parsed["matches"]:
+                            if "developer_id" in match and "score" in match:
+                                score = int(match["score"])
+                                if 0 <= score <= 100:
+                                    matches.append({
+                                        "developer_id": str(match["developer_id"]),
+                                        "score": score,
+                                        "reasoning": match.get("reasoning", "")
+                                    })
                         
-                    except json.JSONDecodeError as e:
-                        logger.error(f"❌ Failed to parse LLM JSON response: {content[:500]}")
-                        return []
-                
-                elif response.status_code == 429:
-                    # Rate limit, retry with backoff
-                    if attempt < max_retries - 1:
-                        delay = base_delay ** (attempt + 1)
-                        logger.warning(f"⚠️ Rate limited, retrying in {delay}s... (attempt {attempt + 1}/{max_retries})")
-                        await asyncio.sleep(delay)
-                        continue
-                    else:
-                        logger.error(f"❌ Rate limited after {max_retries} attempts")
-                        return []
-                
-                else:
-                    logger.error(f"❌ OpenRouter API error: {response.status_code} - {response.text}")
+                        logger.info(f"✅ LLM batch evaluation: {len(matches)} developers evaluated")
+                        return matches
+                    
+                    logger.warning(f"⚠️ Invalid LLM response format: {parsed}")
                     return []
                     
+                except json.JSONDecodeError as e:
+                    logger.error(f"❌ Failed to parse LLM JSON response: {content[:500]}")
+                    return []
+            
+            elif response.status_code == 429:
+                # Rate limit, retry with backoff
+                if attempt < max_retries - 1:
+                    delay = base_delay ** (attempt + 1)
+                    logger.warning(f"⚠️ Rate limited, retrying in {delay}s... (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
+                    continue
+                else:
+                    logger.error(f"❌ Rate limited after {max_retries} attempts")
+                    return []
+            
+            else:
+                logger.error(f"❌ OpenRouter API error: {response.status_code} - {response.text}")
+                return []
+                
         except httpx.TimeoutException:
+            LLM_REQUEST_SECONDS.labels(model, "timeout").observe(time.perf_counter() - started)
             if attempt < max_retries - 1:
                 delay = base_delay ** (attempt + 1)
                 logger.warning(f"⚠️ Request timeout, retrying in {delay}s... (attempt {attempt + 1}/{max_retries})")
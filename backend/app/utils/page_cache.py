@@ -0,0 +1,136 @@
+"""
+Кэш загруженных страниц вакансий в SQLite (zlib, вытеснение давно не читанных записей).
+Листинги и ленты API не кэшируются; из async-кода — read_cached_page()/write_cached_page().
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+from app.logger import logger
+
+# Время последнего чтения для LRU обновляем не чаще раза в 10 минут, а не при каждом попадании
+ACCESS_TOUCH_SECONDS = 600
+
+
+@dataclass
+class CachedPage:
+    content: str
+    content_hash: str
+    fetched_at: float
+
+
+class PageCache:
+    """URL-keyed cache of page contents with TTL and size-based LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_accessed_at ON pages (accessed_at)")
+        self._total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def get_entry(self, url: str, ttl: timedelta) -> Optional[CachedPage]:
+        """Return the cached entry for url if it is younger than ttl."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, content_hash, fetched_at, accessed_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            content, content_hash, fetched_at, accessed_at = row
+            if now - fetched_at > ttl.total_seconds():
+                return None
+            if now - accessed_at > ACCESS_TOUCH_SECONDS:
+                self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+        return CachedPage(
+            content=zlib.decompress(content).decode("utf-8"),
+            content_hash=content_hash,
+            fetched_at=fetched_at,
+        )
+
+    def get(self, url: str, ttl: timedelta) -> Optional[str]:
+        """Return cached content for url if it is younger than ttl."""
+        entry = self.get_entry(url, ttl)
+        return entry.content if entry else None
+
+    def set(self, url: str, content: str) -> str:
+        """Store content for url and return its sha256 hash."""
+        raw = content.encode("utf-8")
+        content_hash = hashlib.sha256(raw).hexdigest()
+        compressed = zlib.compress(raw, 6)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO pages (url, content, content_hash, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (url, compressed, content_hash, len(compressed), now, now),
+            )
+            self._total_size += len(compressed) - (previous[0] if previous else 0)
+            if self._total_size > self.max_bytes:
+                self._evict()
+        return content_hash
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is under 90% of its limit."""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if self._total_size <= target:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._total_size -= size
+            evicted += 1
+        logger.info(f"🧹 Page cache: вытеснено {evicted} записей, размер {self._total_size / 1024 / 1024:.1f} MB")
+
+
+@lru_cache()
+def get_page_cache() -> PageCache:
+    """Shared page cache instance configured from settings."""
+    return PageCache(settings.PAGE_CACHE_PATH, settings.PAGE_CACHE_MAX_MB * 1024 * 1024)
+
+
+def page_cache_ttl() -> Optional[timedelta]:
+    """Default TTL for cached pages, or None when caching is disabled."""
+    if settings.PAGE_CACHE_TTL_HOURS <= 0:
+        return None
+    return timedelta(hours=settings.PAGE_CACHE_TTL_HOURS)
+
+
+async def read_cached_page(url: str, ttl: timedelta) -> Optional[str]:
+    """PageCache.get() in a worker thread."""
+    return await asyncio.to_thread(lambda: get_page_cache().get(url, ttl))
+
+
+async def write_cached_page(url: str, content: str) -> None:
+    """PageCache.set() in a worker thread."""
+    await asyncio.to_thread(lambda: get_page_cache().set(url, content))
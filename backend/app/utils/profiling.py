@@ -0,0 +1,285 @@
+"""
+Профилирование запусков парсеров и матчинга по запросу: срезы стека цикла событий
+и время задач asyncio (см. «Профилирование запусков» в README).
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import settings
+from app.logger import logger
+
+ARTIFACTS = {
+    "stacks.folded": "text/plain; charset=utf-8",
+    "tasks.json": "application/json",
+    "run.json": "application/json",
+}
+# Задачи в сводке run.json (полный список — в tasks.json)
+TOP_TASKS = 15
+
+_active: Optional["RunProfile"] = None
+
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Counts folded stacks of one thread, sampled from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="run-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.stacks[self.fold(frame)] += 1
+            self.samples += 1
+
+    def fold(self, frame) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                # Кадры TimedCoroutine между циклом событий и корутиной задачи не показываем
+                label = self._labels[code] = "" if code.co_filename == __file__ else frame_label(code)
+            if label:
+                labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+@dataclass
+class TaskStats:
+    tasks: int = 0
+    finished: int = 0
+    wall_seconds: float = 0.0
+    busy_seconds: float = 0.0
+
+
+class TimedCoroutine:
+    """Coroutine proxy that adds the duration of every step to its TaskStats."""
+
+    def __init__(self, coro, stats: TaskStats):
+        self._coro = coro
+        self._stats = stats
+        self._created = time.perf_counter()
+        self.__name__ = getattr(coro, "__name__", type(coro).__name__)
+        self.__qualname__ = getattr(coro, "__qualname__", self.__name__)
+
+    def send(self, value):
+        started = time.perf_counter()
+        try:
+            return self._coro.send(value)
+        except BaseException:
+            self._finish()
+            raise
+        finally:
+            self._stats.busy_seconds += time.perf_counter() - started
+
+    def throw(self, *args):
+        started = time.perf_counter()
+        try:
+            return self._coro.throw(*args)
+        except BaseException:
+            self._finish()
+            raise
+        finally:
+            self._stats.busy_seconds += time.perf_counter() - started
+
+    def close(self):
+        return self._coro.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # cr_frame, cr_await и т.п. — для тех, кто смотрит на корутину задачи (repr, anyio)
+        return getattr(self._coro, name)
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def _finish(self) -> None:
+        self._stats.finished += 1
+        self._stats.wall_seconds += time.perf_counter() - self._created
+
+
+@dataclass
+class RunProfile:
+    """One profiled run: its collectors while running, its record afterwards."""
+    id: str
+    kind: str
+    name: str
+    directory: Path
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    duration_seconds: float = 0.0
+    status: str = "ok"
+    tasks: Dict[str, TaskStats] = field(default_factory=lambda: defaultdict(TaskStats))
+
+    def task_factory(self, previous):
+        def create_task(loop, coro, **kwargs):
+            stats = self.tasks[getattr(coro, "__qualname__", type(coro).__name__)]
+            stats.tasks += 1
+            coro = TimedCoroutine(coro, stats)
+            if previous is not None:
+                return previous(loop, coro, **kwargs)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+        return create_task
+
+    def task_rows(self) -> List[Dict[str, Any]]:
+        rows = [
+            {
+                "coroutine": name,
+                "tasks": stats.tasks,
+                "finished": stats.finished,
+                "wall_seconds": round(stats.wall_seconds, 3),
+                "busy_seconds": round(stats.busy_seconds, 3),
+            }
+            for name, stats in self.tasks.items()
+        ]
+        return sorted(rows, key=lambda row: row["busy_seconds"], reverse=True)
+
+    def record(self, sampler: StackSampler) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "name": self.name,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "samples": sampler.samples,
+            "sample_interval_ms": settings.PROFILE_SAMPLE_INTERVAL_MS,
+            "top_tasks": self.task_rows()[:TOP_TASKS],
+            "artifacts": {
+                name: f"{settings.API_V1_PREFIX}/system/profiles/{self.id}/{name}" for name in ARTIFACTS
+            },
+        }
+
+    def save(self, sampler: StackSampler) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / "stacks.folded", "w", encoding="utf-8") as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        (self.directory / "tasks.json").write_text(
+            json.dumps(self.task_rows(), ensure_ascii=False, indent=2), encoding="utf-8")
+        (self.directory / "run.json").write_text(
+            json.dumps(self.record(sampler), ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def new_run_id(name: str) -> str:
+    return f"{datetime.utcnow():%Y%m%d-%H%M%S}-{name}-{uuid.uuid4().hex[:6]}"
+
+
+@asynccontextmanager
+async def profile_run(kind: str, name: str, enabled: bool = False) -> AsyncIterator[Optional[RunProfile]]:
+    """
+    Profile the block if enabled or PROFILE_RUNS is set.
+
+    Yields:
+        RunProfile of the run (its id is the profile link), None when the
+        run is not profiled
+    """
+    global _active
+    if not (enabled or settings.PROFILE_RUNS):
+        yield None
+        return
+    if _active is not None:
+        logger.warning(f"⚠️ {name}: уже профилируется {_active.id}, запуск без профиля")
+        yield None
+        return
+
+    run_id = new_run_id(name)
+    profile = RunProfile(id=run_id, kind=kind, name=name, directory=Path(settings.PROFILE_DIR) / run_id)
+    loop = asyncio.get_running_loop()
+    previous_factory = loop.get_task_factory()
+    sampler = StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+
+    _active = profile
+    loop.set_task_factory(profile.task_factory(previous_factory))
+    sampler.start()
+    logger.info(f"🔬 Профилирую {name}: {run_id}")
+    started = time.perf_counter()
+    try:
+        yield profile
+    except BaseException:
+        profile.status = "error"
+        raise
+    finally:
+        profile.duration_seconds = time.perf_counter() - started
+        sampler.stop()
+        loop.set_task_factory(previous_factory)
+        _active = None
+        try:
+            profile.save(sampler)
+            prune_profiles()
+            logger.info(f"🔬 Профиль {run_id}: {sampler.samples} срезов стека, {profile.directory}")
+        except OSError as e:
+            logger.error(f"❌ Не удалось сохранить профиль {run_id}: {e}")
+
+
+def prune_profiles() -> None:
+    """Keep the PROFILE_KEEP newest profiles."""
+    for run_dir in list_profile_dirs()[settings.PROFILE_KEEP:]:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def list_profile_dirs() -> List[Path]:
+    root = Path(settings.PROFILE_DIR)
+    if not root.is_dir():
+        return []
+    # Id начинается с времени запуска: сортировка по имени — от новых к старым
+    return sorted((path for path in root.iterdir() if (path / "run.json").is_file()), reverse=True)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Run records of the saved profiles, newest first."""
+    records = []
+    for run_dir in list_profile_dirs():
+        try:
+            records.append(json.loads((run_dir / "run.json").read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+def get_profile_artifact(run_id: str, artifact: str) -> Optional[Path]:
+    """Path of one artifact of a saved profile, None if there is no such profile or artifact."""
+    if artifact not in ARTIFACTS:
+        return None
+    # Id ищем среди сохраненных профилей, а не подставляем в путь: выйти из PROFILE_DIR нельзя
+    run_dir = next((path for path in list_profile_dirs() if path.name == run_id), None)
+    if run_dir is None:
+        return None
+    path = run_dir / artifact
+    return path if path.is_file() else None
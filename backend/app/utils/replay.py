@@ -0,0 +1,231 @@
+"""
+Запись ответов сайтов и API в HAR-файл и запуск парсера по записи без сети
+(benchmarks.parser_run). Без активного ReplayStore ни во что не вмешивается.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.logger import logger
+
+# Не нужны для разбора страниц: не записываем и не загружаем
+SKIPPED_RESOURCE_TYPES = {"image", "media", "font"}
+# Тело хранится раскодированным, эти заголовки ему больше не соответствуют
+HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+Key = Tuple[str, str, str]
+
+_active: Optional["ReplayStore"] = None
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> Key:
+    body_hash = hashlib.sha1(body).hexdigest() if body else ""
+    return method.upper(), url, body_hash
+
+
+class ReplayStore:
+    """Recorded responses of one run, keyed by method, URL and request body."""
+
+    def __init__(self, path: Path, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.entries: List[Dict[str, Any]] = []
+        self._responses: Dict[Key, List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[Key, int] = defaultdict(int)
+        self.stats = {"documents": 0, "api_requests": 0, "resources": 0, "misses": 0, "skipped": 0}
+        if mode == "replay":
+            self._load()
+
+    # --- файл HAR
+
+    def _load(self) -> None:
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        with opener(self.path, "rt", encoding="utf-8") as f:
+            har = json.load(f)
+        for entry in har["log"]["entries"]:
+            request = entry["request"]
+            body = base64.b64decode(request["postData"]["text"]) if request.get("postData") else None
+            self._responses[request_key(request["method"], request["url"], body)].append(entry)
+        self.entries = har["log"]["entries"]
+        logger.info(f"📼 Загружено {len(self.entries)} записанных ответов из {self.path}")
+
+    def save(self) -> None:
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "jobs-parser replay", "version": "1.0"},
+                "entries": self.entries,
+            }
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        with opener(self.path, "wt", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False)
+        logger.info(f"📼 Записано {len(self.entries)} ответов в {self.path}")
+
+    # --- запись и выдача
+
+    def add(self, source: str, resource_type: str, method: str, url: str, body: Optional[bytes],
+            status: int, headers: Dict[str, str], content: bytes) -> None:
+        request: Dict[str, Any] = {"method": method.upper(), "url": url}
+        if body:
+            request["postData"] = {"mimeType": "application/octet-stream", "text": base64.b64encode(body).decode()}
+        self.entries.append({
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": 0,
+            "request": request,
+            "response": {
+                "status": status,
+                "headers": [{"name": name, "value": value} for name, value in headers.items()],
+                "content": {
+                    "size": len(content),
+                    "mimeType": headers.get("content-type", ""),
+                    "text": base64.b64encode(content).decode(),
+                    "encoding": "base64",
+                },
+            },
+            "_source": source,
+            "_resourceType": resource_type,
+        })
+        self.count(resource_type)
+
+    def lookup(self, method: str, url: str, body: Optional[bytes]) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Next recorded response for the request (the last one repeats), None if not recorded."""
+        key = request_key(method, url, body)
+        responses = self._responses.get(key)
+        if not responses:
+            self.stats["misses"] += 1
+            return None
+        entry = responses[min(self._served[key], len(responses) - 1)]
+        self._served[key] += 1
+        self.count(entry.get("_resourceType", ""))
+        response = entry["response"]
+        headers = {header["name"]: header["value"] for header in response["headers"]}
+        return response["status"], headers, base64.b64decode(response["content"]["text"])
+
+    def count(self, resource_type: str) -> None:
+        if resource_type == "document":
+            self.stats["documents"] += 1
+        elif resource_type == "api":
+            self.stats["api_requests"] += 1
+        else:
+            self.stats["resources"] += 1
+
+    # --- Playwright
+
+    async def handle_route(self, route) -> None:
+        request = route.request
+        if request.resource_type in SKIPPED_RESOURCE_TYPES:
+            self.stats["skipped"] += 1
+            await route.abort()
+            return
+
+        body = request.post_data_buffer
+        if self.mode == "replay":
+            recorded = self.lookup(request.method, request.url, body)
+            if recorded is None:
+                await route.abort()
+                return
+            status, headers, content = recorded
+            await route.fulfill(status=status, headers=strip_hop_headers(headers), body=content)
+            return
+
+        try:
+            response = await route.fetch()
+            content = await response.body()
+        except Exception:
+            await route.abort()
+            return
+        headers = strip_hop_headers(response.headers)
+        self.add("browser", request.resource_type, request.method, request.url, body,
+                 response.status, headers, content)
+        await route.fulfill(status=response.status, headers=headers, body=content)
+
+
+def strip_hop_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {name: value for name, value in headers.items() if name.lower() not in HOP_HEADERS}
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records responses of the wrapped transport or serves recorded ones."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, store: ReplayStore):
+        self.transport = transport
+        self.store = store
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        url = str(request.url)
+        if self.store.mode == "replay":
+            recorded = self.store.lookup(request.method, url, body)
+            if recorded is None:
+                raise httpx.ConnectError(f"Нет записанного ответа для {request.method} {url}", request=request)
+            status, headers, content = recorded
+            return httpx.Response(status, headers=headers, content=content, request=request)
+
+        response = await self.transport.handle_async_request(request)
+        # Храним тело как пришло (вместе с content-encoding), клиент раскодирует его сам
+        content = b"".join([chunk async for chunk in response.stream])
+        await response.aclose()
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in ("content-length", "transfer-encoding")}
+        self.store.add("httpx", "api", request.method, url, body, response.status_code, headers, content)
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayBrowser:
+    """Playwright Browser whose new pages and contexts go through the replay store."""
+
+    def __init__(self, browser, store: ReplayStore):
+        self._browser = browser
+        self._store = store
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+    async def new_context(self, **kwargs):
+        context = await self._browser.new_context(**kwargs)
+        await context.route("**/*", self._store.handle_route)
+        return context
+
+    async def new_page(self, **kwargs):
+        page = await self._browser.new_page(**kwargs)
+        await page.route("**/*", self._store.handle_route)
+        return page
+
+
+def get_replay() -> Optional[ReplayStore]:
+    return _active
+
+
+@contextmanager
+def use_replay(path: Path, mode: str) -> Iterator[ReplayStore]:
+    """
+    Record or replay all outbound traffic inside the block.
+
+    HTTP clients are created per host on first use, so the block should
+    start before any of them (close_http_clients() otherwise).
+    """
+    global _active
+    store = ReplayStore(path, mode)
+    _active = store
+    try:
+        yield store
+    finally:
+        _active = None
+        if mode == "record":
+            store.save()
@@ -0,0 +1,162 @@
+"""
+Повторы загрузки страниц с экспоненциальной паузой и случайным разбросом, классы ошибок
+и circuit breaker по сайтам. Ошибки попадают в статистику текущего запуска парсера.
+"""
+
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+from app.logger import logger
+from app.utils.limiter import normalize_host
+
+T = TypeVar("T")
+
+FETCH_ERROR_KINDS = ("timeout", "navigation", "blocked", "empty", "circuit_open")
+
+# Ошибки, после которых повтор имеет смысл (открытая цепь не повторяется)
+RETRYABLE_KINDS = {"timeout", "navigation", "blocked", "empty"}
+
+# Счетчики текущего запуска парсера: ключи fetch_<kind>
+fetch_error_stats: ContextVar[Optional[Dict[str, int]]] = ContextVar("fetch_error_stats", default=None)
+
+
+class FetchError(Exception):
+    """Page load failure of a known kind, see FETCH_ERROR_KINDS."""
+
+    def __init__(self, kind: str, url: str, message: str = ""):
+        super().__init__(f"{kind}: {url}{f' ({message})' if message else ''}")
+        self.kind = kind
+        self.url = url
+
+
+def count_fetch_error(kind: str) -> None:
+    stats = fetch_error_stats.get()
+    if stats is not None:
+        key = f"fetch_{kind}"
+        stats[key] = stats.get(key, 0) + 1
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker of one host."""
+
+    def __init__(self, host: str, failure_threshold: int, reset_seconds: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def cancel_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"🔌 {self.host}: сайт снова отвечает, цепь закрыта")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        trial_failed = self._trial_in_flight
+        self._trial_in_flight = False
+        if trial_failed or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            logger.warning(
+                f"🔌 {self.host}: {self.failures} ошибок подряд, "
+                f"пауза запросов на {self.reset_seconds:.0f} секунд")
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(url_or_host: str) -> CircuitBreaker:
+    """Process-wide circuit breaker of one host, created on first use."""
+    host = normalize_host(url_or_host)
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            host,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+        )
+        _breakers[host] = breaker
+    return breaker
+
+
+def get_breaker_stats() -> Dict[str, Any]:
+    return {
+        host: {"state": breaker.state, "consecutive_failures": breaker.failures}
+        for host, breaker in _breakers.items()
+    }
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential delay before retry number `attempt` (from 1)."""
+    cap = min(settings.FETCH_RETRY_MAX_SECONDS, settings.FETCH_RETRY_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+async def fetch_with_retry(url: str, load: Callable[[], Awaitable[T]],
+                           attempts: Optional[int] = None) -> T:
+    """
+    Run load() until it succeeds, with jittered backoff and the circuit breaker of the host.
+
+    Args:
+        url: Loaded URL, its host selects the circuit breaker
+        load: One load attempt, raises FetchError on a classified failure
+        attempts: Number of attempts (FETCH_RETRY_ATTEMPTS by default)
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        FetchError: the last failure, or kind "circuit_open" while the host is paused
+    """
+    attempts = max(1, attempts or settings.FETCH_RETRY_ATTEMPTS)
+    breaker = get_breaker(url)
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow():
+            count_fetch_error("circuit_open")
+            raise FetchError("circuit_open", url, f"пауза запросов к {breaker.host}")
+
+        try:
+            result = await load()
+        except FetchError as e:
+            count_fetch_error(e.kind)
+            breaker.record_failure()
+            if e.kind not in RETRYABLE_KINDS or attempt == attempts:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"⚠️ {e}, повтор {attempt}/{attempts - 1} через {delay:.1f} с")
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Отмена или непредвиденная ошибка: пробная загрузка не состоялась
+            breaker.cancel_trial()
+            raise
+
+        breaker.record_success()
+        return result
@@ -0,0 +1,36 @@
+"""Отбор вакансий: is_dev_job площадок и filter_jobs перед matching."""
+
+import pytest
+
+from app.matching import filter_jobs
+from app.parsers import himalayas_app, remoteok, ycombinator
+
+
+@pytest.mark.benchmark(group="is_dev_job")
+def bench_is_dev_job_remoteok_tags(benchmark, remoteok_items):
+    result = benchmark(lambda: [remoteok.is_dev_job(item.get("tags", [])) for item in remoteok_items])
+    assert any(result) and not all(result)
+
+
+@pytest.mark.benchmark(group="is_dev_job")
+def bench_is_dev_job_himalayas_categories_title(benchmark, himalayas_items):
+    result = benchmark(lambda: [
+        himalayas_app.is_dev_job(item.get("categories", []), item.get("title", ""))
+        for item in himalayas_items
+    ])
+    assert any(result)
+
+
+@pytest.mark.benchmark(group="is_dev_job")
+def bench_is_dev_job_ycombinator_title_description(benchmark, ycombinator_items):
+    result = benchmark(lambda: [
+        ycombinator.is_dev_job(item.get("title", ""), item.get("description_text", ""))
+        for item in ycombinator_items
+    ])
+    assert any(result)
+
+
+@pytest.mark.benchmark(group="filter_jobs")
+def bench_filter_jobs(benchmark, job_models):
+    result = benchmark(filter_jobs, job_models)
+    assert 0 < len(result) < len(job_models)
@@ -0,0 +1,29 @@
+"""Преобразование элементов API в поля Job: map_job_to_model площадок."""
+
+import pytest
+
+from app.parsers import activejobs_db, himalayas_app, remoteok, ycombinator
+
+
+@pytest.mark.benchmark(group="map_job_to_model")
+def bench_map_job_to_model_remoteok(benchmark, remoteok_items):
+    result = benchmark(lambda: [remoteok.map_job_to_model(item) for item in remoteok_items])
+    assert all(job["url"] for job in result)
+
+
+@pytest.mark.benchmark(group="map_job_to_model")
+def bench_map_job_to_model_himalayas(benchmark, himalayas_items):
+    result = benchmark(lambda: [himalayas_app.map_job_to_model(item) for item in himalayas_items])
+    assert all(job["url"] for job in result)
+
+
+@pytest.mark.benchmark(group="map_job_to_model")
+def bench_map_job_to_model_ycombinator(benchmark, ycombinator_items):
+    result = benchmark(lambda: [ycombinator.map_job_to_model(item) for item in ycombinator_items])
+    assert len(result) == len(ycombinator_items)
+
+
+@pytest.mark.benchmark(group="map_job_to_model")
+def bench_map_job_to_model_activejobs_db(benchmark, activejobs_items):
+    result = benchmark(lambda: [activejobs_db.map_job_to_model(item) for item in activejobs_items])
+    assert len(result) == len(activejobs_items)
@@ -0,0 +1,39 @@
+"""Разбор полей: зарплаты, даты листинга justremote.co, параметры URL thehub.io."""
+
+import pytest
+
+from app.parsers import activejobs_db, justremote_co, thehub_io, ycombinator
+from app.utils import amocrm
+from benchmarks.datasets import TODAY
+
+
+@pytest.mark.benchmark(group="parse_salary")
+def bench_parse_salary_ycombinator(benchmark, ycombinator_items):
+    raw = [item.get("salary_raw") for item in ycombinator_items]
+    result = benchmark(lambda: [ycombinator.parse_salary(salary) for salary in raw])
+    assert any(result)
+
+
+@pytest.mark.benchmark(group="parse_salary")
+def bench_parse_salary_activejobs_db(benchmark, activejobs_items):
+    raw = [item.get("salary") for item in activejobs_items]
+    result = benchmark(lambda: [activejobs_db.parse_salary(salary) for salary in raw])
+    assert any(result)
+
+
+@pytest.mark.benchmark(group="parse_salary")
+def bench_parse_salary_amocrm(benchmark, salary_strings):
+    result = benchmark(lambda: [amocrm.parse_salary(salary) for salary in salary_strings])
+    assert any(result)
+
+
+@pytest.mark.benchmark(group="urls_and_dates")
+def bench_update_url_param(benchmark, listing_urls):
+    result = benchmark(lambda: [thehub_io.update_url_param(url, "page", "7") for url in listing_urls])
+    assert all("page=7" in url for url in result)
+
+
+@pytest.mark.benchmark(group="urls_and_dates")
+def bench_parse_site_date(benchmark, site_dates):
+    result = benchmark(lambda: [justremote_co._parse_site_date(text, TODAY) for text in site_dates])
+    assert all(result)
@@ -0,0 +1,17 @@
+"""Очистка HTML-описаний из API: strip_html_tags remoteok.io и himalayas.app."""
+
+import pytest
+
+from app.parsers import himalayas_app, remoteok
+
+
+@pytest.mark.benchmark(group="strip_html_tags")
+def bench_strip_html_tags_remoteok(benchmark, html_descriptions):
+    result = benchmark(lambda: [remoteok.strip_html_tags(html) for html in html_descriptions])
+    assert not any("<p" in text for text in result)
+
+
+@pytest.mark.benchmark(group="strip_html_tags")
+def bench_strip_html_tags_himalayas(benchmark, html_descriptions):
+    result = benchmark(lambda: [himalayas_app.strip_html_tags(html) for html in html_descriptions])
+    assert len(result) == len(html_descriptions)
@@ -0,0 +1,85 @@
+"""
+Сравнение результатов набора pytest-benchmark с базовыми.
+
+Берет два JSON от --benchmark-json (базовый, обычно
+benchmarks/baselines/baseline.json, и текущий) и сравнивает выбранную
+статистику каждого бенчмарка. Бенчмарк, ставший медленнее больше чем на
+--threshold процентов, считается регрессией: команда печатает таблицу и
+завершается с кодом 1, так что ее можно ставить в CI.
+
+Время зависит от машины: сравнивать имеет смысл результаты с одного
+компьютера и одного размера наборов (--bench-jobs), об отличиях команда
+предупреждает.
+
+Запуск из каталога backend/:
+    python -m pytest benchmarks --benchmark-json=bench.json
+    python -m benchmarks.compare benchmarks/baselines/baseline.json bench.json --threshold 15
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+STATS = ("min", "median", "mean")
+
+
+def load(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def by_name(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {bench["name"]: bench for bench in results["benchmarks"]}
+
+
+def warn_on_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    for key, label in (("bench_jobs", "размер наборов"), ("bench_har", "записанные ответы")):
+        if baseline.get(key) != current.get(key):
+            print(f"⚠️ Разные {label}: базовый {baseline.get(key)}, текущий {current.get(key)}")
+    base_cpu = baseline.get("machine_info", {}).get("cpu", {}).get("brand_raw")
+    current_cpu = current.get("machine_info", {}).get("cpu", {}).get("brand_raw")
+    if base_cpu != current_cpu:
+        print(f"⚠️ Разные процессоры: базовый {base_cpu}, текущий {current_cpu}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=15.0, help="допустимое замедление, %%")
+    parser.add_argument("--stat", choices=STATS, default="min")
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    warn_on_mismatch(baseline, current)
+    base_benchmarks, current_benchmarks = by_name(baseline), by_name(current)
+
+    regressions = []
+    print(f"{'бенчмарк':<50} {'базовый, ms':>12} {'текущий, ms':>12} {'изменение':>10}")
+    for name in sorted(base_benchmarks.keys() | current_benchmarks.keys()):
+        if name not in current_benchmarks:
+            print(f"{name:<50} {'':>12} {'':>12}  нет в текущих")
+            continue
+        if name not in base_benchmarks:
+            print(f"{name:<50} {'':>12} {'':>12}  нет в базовых")
+            continue
+        before = base_benchmarks[name]["stats"][args.stat]
+        after = current_benchmarks[name]["stats"][args.stat]
+        change = (after - before) / before * 100
+        mark = ""
+        if change > args.threshold:
+            regressions.append(name)
+            mark = " ❌"
+        elif change < -args.threshold:
+            mark = " ✅"
+        print(f"{name:<50} {before * 1000:12.2f} {after * 1000:12.2f} {change:+9.1f}%{mark}")
+
+    if regressions:
+        print(f"❌ Медленнее больше чем на {args.threshold:g}% ({args.stat}): {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"✅ Регрессий больше {args.threshold:g}% ({args.stat}) нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Фикстуры набора pytest-benchmark: наборы входных данных размером --bench-jobs
+(синтетические или из HAR-записей --bench-har), общие для всей сессии.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from app.models import Job
+from app.parsers import himalayas_app, remoteok, ycombinator
+from benchmarks import datasets
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("jobs-parser benchmarks")
+    group.addoption(
+        "--bench-jobs", type=int, default=int(os.getenv("BENCH_JOBS", "10000")),
+        help="размер наборов данных, вакансий (по умолчанию 10000 или BENCH_JOBS)")
+    group.addoption(
+        "--bench-har", type=Path, action="append", default=[],
+        help="HAR-запись benchmarks.parser_run с ответами API; можно указать несколько раз")
+
+
+def pytest_report_header(config):
+    har = ", ".join(str(path) for path in config.getoption("--bench-har")) or "нет, только синтетика"
+    return f"benchmarks: {config.getoption('--bench-jobs')} вакансий, записанные ответы: {har}"
+
+
+@pytest.fixture(scope="session")
+def jobs_count(pytestconfig) -> int:
+    return pytestconfig.getoption("--bench-jobs")
+
+
+@pytest.fixture(scope="session")
+def api_items(pytestconfig, jobs_count) -> Dict[str, List[Dict[str, Any]]]:
+    recorded = datasets.load_har_items(pytestconfig.getoption("--bench-har"))
+    return {
+        source: datasets.fill_to(recorded[source], source, jobs_count)
+        for source in datasets.GENERATORS
+    }
+
+
+@pytest.fixture(scope="session")
+def remoteok_items(api_items):
+    return api_items["remoteok"]
+
+
+@pytest.fixture(scope="session")
+def himalayas_items(api_items):
+    return api_items["himalayas"]
+
+
+@pytest.fixture(scope="session")
+def ycombinator_items(api_items):
+    return api_items["ycombinator"]
+
+
+@pytest.fixture(scope="session")
+def activejobs_items(api_items):
+    return api_items["activejobs"]
+
+
+@pytest.fixture(scope="session")
+def html_descriptions(remoteok_items, himalayas_items) -> List[str]:
+    half = len(remoteok_items) // 2
+    return [item.get("description") or "" for item in remoteok_items[:half] + himalayas_items[half:]]
+
+
+@pytest.fixture(scope="session")
+def job_models(api_items, jobs_count) -> List[Job]:
+    """Вакансии из БД на входе matching: тексты после map_job_to_model разных площадок."""
+    mapped = (
+        [remoteok.map_job_to_model(item) for item in api_items["remoteok"][:jobs_count // 2]]
+        + [himalayas_app.map_job_to_model(item) for item in api_items["himalayas"][:jobs_count // 4]]
+        + [ycombinator.map_job_to_model(item) for item in api_items["ycombinator"]]
+    )
+    return [Job(**fields) for fields in mapped[:jobs_count]]
+
+
+@pytest.fixture(scope="session")
+def salary_strings(jobs_count) -> List[str]:
+    return datasets.make_salary_strings(jobs_count)
+
+
+@pytest.fixture(scope="session")
+def site_dates(jobs_count) -> List[str]:
+    return datasets.make_site_dates(jobs_count)
+
+
+@pytest.fixture(scope="session")
+def listing_urls(jobs_count) -> List[str]:
+    return datasets.make_listing_urls(jobs_count)
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    # benchmarks.compare сверяет размер наборов с базовыми результатами
+    output_json["bench_jobs"] = config.getoption("--bench-jobs")
+    output_json["bench_har"] = [str(path) for path in config.getoption("--bench-har")]
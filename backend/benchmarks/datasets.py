@@ -0,0 +1,271 @@
+"""
+Входные данные для набора pytest-benchmark (benchmarks/bench_*.py).
+
+Синтетические элементы повторяют форму ответов API площадок: HTML-описания
+с тегами и сущностями, теги/категории, зарплаты в разных форматах, даты
+листинга justremote.co. Генератор детерминирован (seed), поэтому прогоны
+на одной машине сравнимы между собой и с базовыми результатами.
+
+Записанные ответы берутся из HAR-файлов benchmarks.parser_run (--bench-har):
+из них достаются элементы API remoteok.io, himalayas.app, Y Combinator и
+Active Jobs DB и дополняются синтетическими до нужного размера.
+"""
+
+import base64
+import json
+import random
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import httpx
+
+from app.parsers import activejobs_db, himalayas_app, remoteok, ycombinator
+
+TITLE_WORDS = (
+    "senior junior lead staff principal backend frontend fullstack python react "
+    "golang java data ml devops platform mobile ios android engineer developer "
+    "manager designer marketing sales support recruiter analyst writer"
+).split()
+TAGS = (
+    "react python node typescript marketing sales design support finance legal "
+    "devops kubernetes aws golang writing seo customer-success hr backend frontend"
+).split()
+CATEGORIES = (
+    "Software Engineering|Backend Development|Frontend Development|DevOps|"
+    "Data Science|Marketing|Sales|Customer Support|Design|Finance|Operations"
+).split("|")
+TEXT_WORDS = (
+    "we are looking for a team player to join our remote company you will work on "
+    "product features with customers partners stakeholders hybrid benefits salary "
+    "equity vacation health insurance growth mission culture удаленно команда"
+).split()
+TECH_WORDS = "react typescript python postgres docker kubernetes".split()
+OFFICE_WORDS = "office onsite офис".split()
+INLINE_TAGS = ("b", "i", "strong", "em", "a", "code")
+ENTITIES = ("&amp;", "&nbsp;", "&quot;", "&#39;", "&mdash;", "&lt;3")
+CURRENCIES = ("USD", "EUR", "GBP")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+FULL_MONTHS = ("January", "March", "August", "December")
+# "Сегодня" для дат justremote.co фиксировано, чтобы результат не зависел от дня запуска
+TODAY = date(2025, 6, 15)
+
+# Записанные ответы: хост API → (ключ набора данных, признак элемента-вакансии)
+HAR_SOURCES = {
+    remoteok.API_HOST: ("remoteok", "position"),
+    himalayas_app.API_HOST: ("himalayas", "title"),
+    ycombinator.API_HOST: ("ycombinator", "title"),
+    activejobs_db.API_HOST: ("activejobs", "title"),
+}
+
+
+def make_title(rnd: random.Random) -> str:
+    return " ".join(rnd.choice(TITLE_WORDS) for _ in range(rnd.randint(2, 5))).title()
+
+
+def make_text(rnd: random.Random, words: int) -> str:
+    text = [rnd.choice(TEXT_WORDS) for _ in range(words)]
+    # Технологии и офис упоминаются не во всех вакансиях и в случайном месте текста
+    if rnd.random() < 0.3:
+        text.insert(rnd.randrange(len(text)), rnd.choice(TECH_WORDS))
+    if rnd.random() < 0.2:
+        text.insert(rnd.randrange(len(text)), rnd.choice(OFFICE_WORDS))
+    return " ".join(text)
+
+
+def make_html_description(rnd: random.Random) -> str:
+    """Описание как в API remoteok/himalayas: абзацы и списки с разметкой и сущностями."""
+    blocks = []
+    for _ in range(rnd.randint(3, 8)):
+        words = make_text(rnd, rnd.randint(20, 60)).split()
+        for _ in range(rnd.randint(1, 4)):
+            i = rnd.randrange(len(words))
+            tag = rnd.choice(INLINE_TAGS)
+            words[i] = f"<{tag}>{words[i]}</{tag}>{rnd.choice(ENTITIES)}"
+        if rnd.random() < 0.3:
+            items = "".join(f"<li>{word}</li>\n" for word in words[:5])
+            blocks.append(f"<ul>\n{items}</ul>")
+        else:
+            blocks.append(f'<p class="text">{" ".join(words)}</p>')
+    return "\n".join(blocks)
+
+
+def make_iso_date(rnd: random.Random) -> str:
+    return f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T{rnd.randint(0, 23):02d}:15:00Z"
+
+
+def make_remoteok_item(rnd: random.Random, i: int) -> Dict[str, Any]:
+    salary_min = rnd.choice((0, 60000, 90000, 120000))
+    return {
+        "slug": f"remote-job-{i}",
+        "id": str(i),
+        "date": make_iso_date(rnd),
+        "company": f"Company {i % 997}",
+        "position": make_title(rnd),
+        "tags": rnd.sample(TAGS, rnd.randint(0, 6)),
+        "description": make_html_description(rnd),
+        "salary_min": salary_min,
+        "salary_max": salary_min + rnd.choice((0, 20000, 40000)),
+        "url": f"https://remoteok.com/remote-jobs/remote-job-{i}" if rnd.random() < 0.8 else "",
+    }
+
+
+def make_himalayas_item(rnd: random.Random, i: int) -> Dict[str, Any]:
+    salary_min = rnd.choice((None, 50000, 80000, 110000))
+    item = {
+        "title": make_title(rnd),
+        "slug": f"job-{i}" if rnd.random() < 0.5 else "",
+        "id": i,
+        "applicationLink": f"https://himalayas.app/apply/{i}" if rnd.random() < 0.5 else "",
+        "categories": rnd.sample(CATEGORIES, rnd.randint(0, 3)),
+        "description": make_html_description(rnd),
+        "salaryMin": salary_min,
+        "salaryMax": salary_min + 30000 if salary_min else None,
+        "currency": rnd.choice(CURRENCIES),
+        "pubDate": make_iso_date(rnd) if rnd.random() < 0.7 else rnd.randint(1735689600, 1760000000),
+    }
+    if rnd.random() < 0.5:
+        item["companyName"] = f"Company {i % 997}"
+    else:
+        item["company"] = {"name": f"Company {i % 997}", "url": f"https://company{i % 997}.example"}
+    return item
+
+
+def make_ycombinator_salary(rnd: random.Random) -> Any:
+    value = {"minValue": rnd.choice((None, 100000, 150000)), "maxValue": rnd.choice((None, 200000))}
+    salary = {"currency": "USD", "value": {**value, "unitText": rnd.choice(("YEAR", "MONTH"))}}
+    roll = rnd.random()
+    if roll < 0.3:
+        return None
+    if roll < 0.6:
+        # RapidAPI отдает salary_raw и объектом, и строкой JSON
+        return json.dumps(salary)
+    return salary
+
+
+def make_ycombinator_item(rnd: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "title": make_title(rnd),
+        "url": f"https://www.ycombinator.com/companies/c{i % 997}/jobs/{i}",
+        "organization": f"Company {i % 997}",
+        "organization_url": f"https://c{i % 997}.example",
+        "date_posted": make_iso_date(rnd),
+        "locations_derived": rnd.sample(["San Francisco", "New York", "Berlin", "London"], rnd.randint(0, 3)),
+        "remote_derived": rnd.random() < 0.5,
+        "salary_raw": make_ycombinator_salary(rnd),
+        "description_text": make_text(rnd, rnd.randint(100, 300)),
+    }
+
+
+def make_activejobs_salary(rnd: random.Random) -> Any:
+    roll = rnd.random()
+    if roll < 0.3:
+        return None
+    if roll < 0.5:
+        return f"${rnd.randint(40, 150)},000 - ${rnd.randint(150, 250)},000 a year"
+    return {
+        "min": rnd.choice((None, 70000, 90000)),
+        "max": rnd.choice((None, 130000)),
+        "currency": rnd.choice(CURRENCIES),
+        "period": rnd.choice(("year", "month", "hour")),
+    }
+
+
+def make_activejobs_item(rnd: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "title": make_title(rnd),
+        "url": f"https://jobs.example/{i}",
+        "organization": f"Company {i % 997}",
+        "date_posted": rnd.choice((make_iso_date(rnd).rstrip("Z"), make_iso_date(rnd)[:10])),
+        "location": rnd.choice((None, "Berlin, Germany", ["Remote", "Europe", "Poland"])),
+        "remote": rnd.random() < 0.5,
+        "description": make_text(rnd, rnd.randint(50, 200)),
+        "salary": make_activejobs_salary(rnd),
+    }
+
+
+GENERATORS = {
+    "remoteok": make_remoteok_item,
+    "himalayas": make_himalayas_item,
+    "ycombinator": make_ycombinator_item,
+    "activejobs": make_activejobs_item,
+}
+
+
+def make_items(source: str, count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rnd = random.Random(f"{source}:{seed}")
+    generate = GENERATORS[source]
+    return [generate(rnd, i) for i in range(count)]
+
+
+def load_har_items(paths: Sequence[Path]) -> Dict[str, List[Dict[str, Any]]]:
+    """Элементы-вакансии из ответов API в HAR-записях, по ключам GENERATORS."""
+    from app.utils.limiter import normalize_host
+    from app.utils.replay import ReplayStore
+
+    items: Dict[str, List[Dict[str, Any]]] = {source: [] for source in GENERATORS}
+    for path in paths:
+        for entry in ReplayStore(path, "replay").entries:
+            source = HAR_SOURCES.get(normalize_host(entry["request"]["url"]))
+            if source is None or entry["response"]["status"] != 200:
+                continue
+            key, marker = source
+            response = entry["response"]
+            # Тело записано как пришло, httpx.Response сам снимает content-encoding
+            data = httpx.Response(
+                200,
+                headers={header["name"]: header["value"] for header in response["headers"]},
+                content=base64.b64decode(response["content"]["text"]),
+            ).json()
+            if isinstance(data, dict):
+                data = data.get("jobs", data.get("data", data.get("results", [])))
+            items[key].extend(item for item in data if isinstance(item, dict) and item.get(marker))
+    return items
+
+
+def fill_to(items: List[Dict[str, Any]], source: str, count: int) -> List[Dict[str, Any]]:
+    """Записанные элементы, дополненные синтетическими до count (или обрезанные)."""
+    if len(items) >= count:
+        return items[:count]
+    return items + make_items(source, count - len(items))
+
+
+def make_salary_strings(count: int, seed: int = 42) -> List[str]:
+    """Строки Job.salary, которые app.utils.amocrm.parse_salary переводит в число."""
+    rnd = random.Random(f"salary:{seed}")
+    formats = (
+        lambda: f"${rnd.randint(40, 250) * 1000:,} - ${rnd.randint(40, 250) * 1000:,}",
+        lambda: f"USD {rnd.randint(40, 250) * 1000:,}+ / YEAR",
+        lambda: f"{rnd.randint(2, 9)} {rnd.randint(100, 999)} - {rnd.randint(2, 9)} {rnd.randint(100, 999)} BYN",
+        lambda: f"Up to €{rnd.randint(40, 250)}k",
+        lambda: "Competitive",
+        lambda: "",
+    )
+    return [rnd.choice(formats)() for _ in range(count)]
+
+
+def make_site_dates(count: int, seed: int = 42) -> List[str]:
+    """Даты листинга justremote.co: '26th Aug', '3 March', 'Today', 'Yesterday'."""
+    rnd = random.Random(f"dates:{seed}")
+    suffixes = {1: "st", 2: "nd", 3: "rd", 21: "st", 22: "nd", 23: "rd", 31: "st"}
+    texts = []
+    for _ in range(count):
+        roll = rnd.random()
+        if roll < 0.1:
+            texts.append(rnd.choice(("Today", "Yesterday")))
+            continue
+        day = rnd.randint(1, 28)
+        month = rnd.choice(FULL_MONTHS) if roll < 0.3 else rnd.choice(MONTHS)
+        suffix = suffixes.get(day, "th") if roll < 0.8 else ""
+        texts.append(f"{day}{suffix} {month}")
+    return texts
+
+
+def make_listing_urls(count: int, seed: int = 42) -> List[str]:
+    """URL поиска thehub.io с фильтрами, в которые подставляется номер страницы."""
+    rnd = random.Random(f"urls:{seed}")
+    return [
+        f"https://thehub.io/jobs?roles=backenddeveloper&roles=fullstackdeveloper"
+        f"&countryCode={rnd.choice(('DK', 'SE', 'NO', 'FI'))}&sorting=newJobs&page={rnd.randint(1, 20)}"
+        for _ in range(count)
+    ]
@@ -0,0 +1,136 @@
+"""
+Micro-benchmark разбора HTML страниц вакансий.
+
+Сравнивает на сохраненных страницах три способа построить дерево:
+- html.parser:   BeautifulSoup(html, "html.parser") на всю страницу (как было)
+- lxml:          BeautifulSoup(html, "lxml") на всю страницу
+- lxml+strainer: make_soup() с SoupStrainer парсера — только нужный контейнер
+
+Страницы берутся из каталога --fixtures (файлы *.html, в имени — домен
+источника, напр. jobs.devby.io-123.html), иначе из кэша страниц
+(cache/pages.sqlite3 — туда попадают страницы вакансий при обычном запуске
+парсеров). Если страниц нет, генерируются синтетические.
+
+Запуск из каталога backend/:
+    python -m benchmarks.html_parsing --fixtures ./fixtures --repeat 3
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.config import settings
+from app.parsers import dev_by, justremote_co, startup_jobs, thehub_io, vseti_app
+
+# Домен источника -> SoupStrainer страницы вакансии
+STRAINERS = {
+    "jobs.devby.io": dev_by.DETAIL_STRAINER,
+    "startup.jobs": startup_jobs.DETAIL_STRAINER,
+    "thehub.io": thehub_io.CONTENT_STRAINER,
+    "vseti.app": vseti_app.DETAIL_STRAINER,
+    "justremote.co": justremote_co.DETAIL_STRAINER,
+}
+
+Page = Tuple[str, str, Optional[SoupStrainer]]
+
+
+def strainer_for(name: str) -> Optional[SoupStrainer]:
+    for host, strainer in STRAINERS.items():
+        if host in name:
+            return strainer
+    return None
+
+
+def load_fixtures(directory: Path) -> List[Page]:
+    return [
+        (path.name, path.read_text(encoding="utf-8"), strainer_for(path.name))
+        for path in sorted(directory.glob("*.html"))
+    ]
+
+
+def load_page_cache(path: Path) -> List[Page]:
+    if not path.exists():
+        return []
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT url, content FROM pages").fetchall()
+    pages = []
+    for url, content in rows:
+        strainer = strainer_for(url)
+        if strainer is not None:
+            pages.append((url, zlib.decompress(content).decode("utf-8"), strainer))
+    return pages
+
+
+def make_synthetic_pages(count: int, seed: int = 42) -> List[Page]:
+    """Страницы ~200 KB: навигация, скрипты, футер и небольшой блок описания"""
+    rnd = random.Random(seed)
+    words = "remote senior developer react python team product culture benefits salary".split()
+
+    def text(n: int) -> str:
+        return " ".join(rnd.choice(words) for _ in range(n))
+
+    pages = []
+    for i in range(count):
+        nav = "".join(f'<li class="nav__item"><a href="/c/{j}">{text(3)}</a></li>' for j in range(300))
+        cards = "".join(
+            f'<div class="card related"><a href="/jobs/{j}"><h3>{text(4)}</h3></a><p>{text(30)}</p></div>'
+            for j in range(150)
+        )
+        script = f"<script>window.__STATE__ = {{\"data\": \"{text(2000)}\"}}</script>"
+        body = (
+            f'<div class="vacancy__text">{"".join(f"<p>{text(60)}</p>" for _ in range(20))}</div>'
+            f'<a href="/company/{i}">Профиль компании</a>'
+        )
+        html = f"<html><head>{script}</head><body><ul>{nav}</ul><main>{body}</main><aside>{cards}</aside></body></html>"
+        pages.append((f"synthetic-{i}", html, dev_by.DETAIL_STRAINER))
+    return pages
+
+
+def measure(pages: List[Page], build: Callable[[Page], BeautifulSoup], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for page in pages:
+            build(page)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path)
+    parser.add_argument("--page-cache", type=Path, default=Path(settings.PAGE_CACHE_PATH))
+    parser.add_argument("--synthetic", type=int, default=50, help="сколько страниц сгенерировать, если нет сохраненных")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages, origin = load_fixtures(args.fixtures), f"fixtures {args.fixtures}"
+    else:
+        pages, origin = load_page_cache(args.page_cache), f"page cache {args.page_cache}"
+    if not pages:
+        pages, origin = make_synthetic_pages(args.synthetic), "синтетические страницы"
+
+    size = sum(len(html) for _, html, _ in pages)
+    print(f"📊 {len(pages)} страниц ({origin}), {size / 1024 / 1024:.1f} MiB")
+
+    modes = [
+        ("html.parser", lambda page: BeautifulSoup(page[1], "html.parser")),
+        ("lxml", lambda page: BeautifulSoup(page[1], "lxml")),
+        ("lxml+strainer", lambda page: BeautifulSoup(page[1], "lxml", parse_only=page[2])),
+    ]
+    baseline = None
+    for name, build in modes:
+        elapsed = measure(pages, build, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:>14}: {elapsed * 1000:8.1f} ms, {elapsed / len(pages) * 1000:6.2f} ms/стр, x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Micro-benchmark классификации вакансий по ключевым словам.
+
+Сравнивает на синтетических заголовках, тегах и описаниях:
+- legacy:  вложенные циклы подстрочных проверок (как было в is_dev_job / filter_jobs)
+- matcher: KeywordMatcher — одно скомпилированное регулярное выражение
+
+Расхождения в решениях ожидаемы: matcher ищет слово целиком ('go' больше
+не срабатывает на 'google', 'ai' — на 'maintenance'), число расхождений
+печатается отдельно. Перед замерами проверяются границы слов на заголовках
+BOUNDARY_CASES; при ошибке скрипт завершается с кодом 1.
+
+Запуск из каталога backend/:
+    python -m benchmarks.keyword_matching --jobs 100000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from app.matching import OFFICE_KEYWORDS, OFFICE_KEYWORDS_MATCHER
+from app.parsers.himalayas_app import DEV_TAGS_MATCHER as HIMALAYAS_MATCHER
+from app.parsers.remoteok import DEV_TAGS as REMOTEOK_TAGS, DEV_TAGS_MATCHER as REMOTEOK_MATCHER
+from app.parsers.ycombinator import DEV_KEYWORDS, DEV_KEYWORDS_MATCHER
+
+TITLE_WORDS = (
+    "senior junior lead staff principal react python backend frontend fullstack "
+    "developer engineer manager designer marketing sales account executive support "
+    "data analyst product owner recruiter maintenance technician golang devops"
+).split()
+TAGS = (
+    "react python node typescript marketing sales design support finance legal "
+    "devops kubernetes aws golang writing seo customer-success hr"
+).split()
+TEXT_WORDS = (
+    "we are looking for a team player to join our remote company you will work on "
+    "product features with customers partners stakeholders hybrid benefits salary "
+    "equity vacation health insurance growth mission culture удаленно команда"
+).split()
+TECH_WORDS = "react typescript python postgres docker kubernetes".split()
+OFFICE_WORDS = "office onsite офис".split()
+
+Job = Tuple[str, List[str], str]
+
+# Заголовок → ожидаемое решение фильтра himalayas.app ('go', 'ai', 'java' — целые слова)
+BOUNDARY_CASES = {
+    "Google Ads Account Manager": False,
+    "Government Relations Lead": False,
+    "Goods Receiving Clerk": False,
+    "Air Traffic Coordinator": False,
+    "Recruiter (AIM program)": False,
+    "Javanese Translator": False,
+    "Senior Go Developer": True,
+    "AI Engineer": True,
+    "AI/ML Researcher": True,
+    "Java Team Lead": True,
+    "Staff Engineers, Platform": True,
+}
+
+
+def make_description(rnd: random.Random) -> str:
+    words = [rnd.choice(TEXT_WORDS) for _ in range(rnd.randint(100, 400))]
+    # Технологии и офис упоминаются не во всех вакансиях и в случайном месте текста
+    if rnd.random() < 0.3:
+        words.insert(rnd.randrange(len(words)), rnd.choice(TECH_WORDS))
+    if rnd.random() < 0.2:
+        words.insert(rnd.randrange(len(words)), rnd.choice(OFFICE_WORDS))
+    return " ".join(words)
+
+
+def make_dataset(count: int, seed: int = 42) -> List[Job]:
+    rnd = random.Random(seed)
+    return [
+        (
+            " ".join(rnd.choice(TITLE_WORDS) for _ in range(rnd.randint(2, 5))).title(),
+            rnd.sample(TAGS, rnd.randint(0, 5)),
+            make_description(rnd),
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_tags(tags: Sequence[str]) -> bool:
+    tags_lower = {tag.lower() for tag in tags}
+    for dev_tag in REMOTEOK_TAGS:
+        if dev_tag in tags_lower:
+            return True
+        for tag in tags_lower:
+            if dev_tag in tag:
+                return True
+    return False
+
+
+def legacy_text(title: str, description: str) -> bool:
+    text_lower = f"{title} {description}".lower()
+    return any(keyword in text_lower for keyword in DEV_KEYWORDS)
+
+
+def legacy_office(title: str, description: str) -> bool:
+    text_lower = f"{title} {description}".lower()
+    return any(keyword in text_lower for keyword in OFFICE_KEYWORDS)
+
+
+CASES: List[Tuple[str, Callable[[Job], bool], Callable[[Job], bool]]] = [
+    (
+        "remoteok tags",
+        lambda job: legacy_tags(job[1]),
+        lambda job: REMOTEOK_MATCHER.search(*job[1]),
+    ),
+    (
+        "ycombinator title+description",
+        lambda job: legacy_text(job[0], job[2]),
+        lambda job: DEV_KEYWORDS_MATCHER.search(job[0], job[2]),
+    ),
+    (
+        "office filter",
+        lambda job: legacy_office(job[0], job[2]),
+        lambda job: OFFICE_KEYWORDS_MATCHER.search(job[0], job[2]),
+    ),
+]
+
+
+def check_boundaries() -> List[str]:
+    """Заголовки BOUNDARY_CASES, на которых фильтр решает не так, как ожидается."""
+    return [
+        f"{title!r}: ожидалось {expected}, найдено {sorted(HIMALAYAS_MATCHER.find(title))}"
+        for title, expected in BOUNDARY_CASES.items()
+        if HIMALAYAS_MATCHER.search(title) != expected
+    ]
+
+
+def measure(func: Callable[[Job], bool], jobs: List[Job]) -> Tuple[float, List[bool]]:
+    started = time.perf_counter()
+    results = [func(job) for job in jobs]
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100000)
+    args = parser.parse_args()
+
+    errors = check_boundaries()
+    if errors:
+        print("❌ Границы слов:\n" + "\n".join(errors))
+        raise SystemExit(1)
+    print(f"✅ Границы слов: {len(BOUNDARY_CASES)} заголовков")
+
+    jobs = make_dataset(args.jobs)
+    print(f"📊 Синтетический датасет: {len(jobs)} вакансий")
+
+    for name, legacy, matcher in CASES:
+        legacy_time, legacy_results = measure(legacy, jobs)
+        matcher_time, matcher_results = measure(matcher, jobs)
+        diff = sum(a != b for a, b in zip(legacy_results, matcher_results))
+        print(
+            f"{name:>30}: legacy {legacy_time * 1000:8.1f} ms, matcher {matcher_time * 1000:8.1f} ms, "
+            f"x{legacy_time / matcher_time:.1f}, расхождений {diff}"
+        )
+
+
+if __name__ == "__main__":
+    main()
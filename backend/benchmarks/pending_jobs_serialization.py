@@ -0,0 +1,150 @@
+"""
+Micro-benchmark сериализации списка pending jobs.
+
+Сравнивает два пути ответа /api/pending-jobs на синтетических данных:
+- legacy: ORM Job -> PendingJobRead -> валидация response_model -> JSONResponse
+- fast:   SQL-кортежи -> dict -> ORJSONResponse (без повторной валидации)
+
+Запуск из каталога backend/:
+    python -m benchmarks.pending_jobs_serialization --jobs 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Tuple
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.jobs import (
+    PENDING_JOB_FIELDS,
+    PendingJobRead,
+    PendingJobsResponse,
+    rows_to_pending_jobs,
+)
+from app.models import Job
+
+SOURCES = ["startup.jobs", "thehub.io", "vseti.app", "jobs.devby.io", "remoteok.io", "himalayas.app"]
+WORDS = (
+    "python react typescript backend frontend remote senior developer engineer "
+    "postgres docker kubernetes fastapi django node angular vue team product"
+).split()
+
+
+def make_description(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+
+def make_matching_results(rnd: random.Random) -> dict | None:
+    if rnd.random() < 0.3:
+        return None
+    matches = [
+        {
+            "developer_id": str(rnd.randint(1, 500)),
+            "developer_name": f"Developer {rnd.randint(1, 500)}",
+            "score": rnd.randint(50, 100),
+            "reasoning": make_description(rnd, 40),
+        }
+        for _ in range(rnd.randint(0, 5))
+    ]
+    return {
+        "matched_at": datetime.utcnow().isoformat(),
+        "matches_count": len(matches),
+        "matches": matches,
+    }
+
+
+def make_dataset(count: int, seed: int = 42) -> List[Job]:
+    rnd = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        Job(
+            id=uuid.uuid4(),
+            title=f"Senior {rnd.choice(WORDS).title()} Developer",
+            url=f"https://example.com/jobs/{i}",
+            source=rnd.choice(SOURCES),
+            description=make_description(rnd, rnd.randint(200, 800)),
+            company=f"Company {i % 700}",
+            company_url=f"https://example.com/companies/{i % 700}",
+            apply_url=f"https://example.com/apply/{i}",
+            salary=rnd.choice([None, "$100,000 - $150,000", "от 3000$"]),
+            parsed_at=now - timedelta(minutes=i),
+            matching_results=make_matching_results(rnd),
+        )
+        for i in range(count)
+    ]
+
+
+def to_rows(jobs: List[Job]) -> List[Tuple[Any, ...]]:
+    """То, что возвращает select(*PENDING_JOB_COLUMNS)"""
+    return [tuple(getattr(job, field) for field in PENDING_JOB_FIELDS) for job in jobs]
+
+
+def legacy_path(jobs: List[Job], sources: List[str]) -> bytes:
+    pending_jobs = [
+        PendingJobRead(
+            id=job.id,
+            title=job.title,
+            url=job.url,
+            source=job.source,
+            description=job.description,
+            company=job.company,
+            company_url=job.company_url,
+            apply_url=job.apply_url,
+            salary=job.salary,
+            parsed_at=job.parsed_at,
+            matching_results=job.matching_results,
+            amocrm_lead_id=job.amocrm_lead_id
+        )
+        for job in jobs
+    ]
+    response = PendingJobsResponse(jobs=pending_jobs, available_sources=sources)
+    # Повторяем то, что FastAPI делает с response_model при возврате модели
+    field = create_model_field("Response", PendingJobsResponse, mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=response))
+    return JSONResponse(content).body
+
+
+def fast_path(rows: List[Tuple[Any, ...]], sources: List[str]) -> bytes:
+    return ORJSONResponse({
+        "jobs": rows_to_pending_jobs(rows),
+        "available_sources": sources,
+    }).body
+
+
+def measure(name: str, func: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(func())
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    print(f"{name:>8}: median {median * 1000:8.1f} ms, min {min(timings) * 1000:8.1f} ms, body {size / 1024 / 1024:.1f} MiB")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    jobs = make_dataset(args.jobs)
+    rows = to_rows(jobs)
+    sources = sorted({job.source for job in jobs})
+    print(f"📊 Синтетический датасет: {len(jobs)} вакансий")
+
+    legacy = measure("legacy", lambda: legacy_path(jobs, sources), args.repeat)
+    fast = measure("fast", lambda: fast_path(rows, sources), args.repeat)
+    print(f"Ускорение: x{legacy / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
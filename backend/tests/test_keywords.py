@@ -0,0 +1,101 @@
+"""KeywordMatcher: целые слова, основы-префиксы и фильтры площадок на нем."""
+
+import pytest
+
+from app.matching import OFFICE_KEYWORDS_MATCHER
+from app.parsers import himalayas_app, remoteok, ycombinator
+from app.utils.keywords import KeywordMatcher
+
+
+@pytest.mark.parametrize("title", [
+    "Google Ads Account Manager",
+    "Government Relations Lead",
+    "Goods Receiving Clerk",
+    "Air Traffic Coordinator",
+    "Recruiter (AIM program)",
+    "Javanese Translator",
+    "Business Development Representative",
+])
+def test_short_keywords_do_not_match_inside_words(title):
+    assert not himalayas_app.DEV_TAGS_MATCHER.search(title)
+
+
+@pytest.mark.parametrize("title, keyword", [
+    ("Senior Go Developer", "go"),
+    ("AI Engineer", "ai"),
+    ("AI/ML Researcher", "ai"),
+    ("Java Team Lead", "java"),
+])
+def test_short_keywords_match_whole_words(title, keyword):
+    assert keyword in himalayas_app.DEV_TAGS_MATCHER.find(title)
+
+
+def test_whole_word_keyword_needs_word_start_and_end():
+    matcher = KeywordMatcher({"dev"})
+    assert matcher.find("dev", "Senior dev.", "dev-ops") == {"dev"}
+    assert not matcher.search("webdev")
+    assert not matcher.search("development")
+
+
+def test_prefix_matches_any_ending_but_not_inside_word():
+    matcher = KeywordMatcher(set(), prefixes={"engineer"})
+    assert matcher.search("Engineers")
+    assert matcher.search("Engineering Manager")
+    assert not matcher.search("reengineer")
+
+
+def test_prefix_overrides_whole_word_keyword():
+    matcher = KeywordMatcher({"react"}, prefixes={"react"})
+    assert matcher.search("reactjs")
+
+
+def test_symbol_keywords_have_no_boundary_on_symbol_side():
+    matcher = KeywordMatcher({".net", "c++", "c#", "go "})
+    assert matcher.find("asp.net core") == {".net"}
+    assert matcher.find("C++/C# developer") == {"c++", "c#"}
+    assert matcher.find("we use go for services") == {"go "}
+    assert not matcher.search("cargo ships")
+
+
+def test_longest_keyword_is_reported():
+    matcher = KeywordMatcher({"dev", "developer", "devops"})
+    assert matcher.find("DevOps developer") == {"devops", "developer"}
+
+
+def test_texts_are_matched_separately():
+    matcher = KeywordMatcher({"full stack"})
+    assert not matcher.search("full", "stack")
+    assert matcher.search("backend", "Full Stack")
+
+
+def test_empty_keyword_set_matches_nothing():
+    matcher = KeywordMatcher([])
+    assert not matcher.search("anything at all")
+    assert matcher.find("anything") == set()
+
+
+@pytest.mark.parametrize("tag", [
+    "reactjs", "vuejs", "angularjs", "nextjs", "nodejs", "springboot",
+    "fullstackdeveloper", "developers", "golang", "c#", ".net",
+])
+def test_remoteok_dev_tags(tag):
+    assert remoteok.is_dev_job([tag])
+
+
+@pytest.mark.parametrize("tag", ["marketing", "sales", "nextgen-sales", "development", "design"])
+def test_remoteok_non_dev_tags(tag):
+    assert not remoteok.is_dev_job([tag])
+
+
+def test_ycombinator_go_keyword_needs_a_space():
+    assert ycombinator.is_dev_job("Backend", "services written in go and python")
+    assert not ycombinator.is_dev_job("Account Executive", "grow our google ads funnel")
+
+
+@pytest.mark.parametrize("text", ["Работа в офисе", "Hybrid, 3 days in our offices", "on-site"])
+def test_office_keywords_match_inflected_forms(text):
+    assert OFFICE_KEYWORDS_MATCHER.search(text)
+
+
+def test_office_keywords_do_not_match_other_words():
+    assert not OFFICE_KEYWORDS_MATCHER.search("Official remote position")
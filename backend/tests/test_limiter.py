@@ -0,0 +1,112 @@
+"""AdaptiveLimiter: рост лимита на успехах, снижение вдвое на 403/429 и таймаутах."""
+
+import asyncio
+
+import pytest
+
+from app.utils.limiter import AdaptiveLimiter, normalize_host
+
+
+def make_limiter(initial=4, min_limit=1, max_limit=8):
+    return AdaptiveLimiter("example.com", initial=initial, min_limit=min_limit, max_limit=max_limit)
+
+
+def test_initial_limit_is_clamped():
+    assert make_limiter(initial=20).current_limit == 8
+    assert make_limiter(initial=0).current_limit == 1
+
+
+def test_success_grows_limit_by_one_per_window():
+    limiter = make_limiter(initial=4)
+    # Прибавка 1/limit: за ~limit успешных запросов лимит растет на единицу
+    for _ in range(5):
+        limiter.on_success(0.1)
+    assert limiter.current_limit == 5
+    assert limiter.stats["increases"] == 1
+
+
+def test_limit_does_not_grow_past_max():
+    limiter = make_limiter(initial=7, max_limit=8)
+    for _ in range(100):
+        limiter.on_success(0.1)
+    assert limiter.limit == 8
+
+
+def test_limit_does_not_grow_while_latency_is_high():
+    limiter = make_limiter(initial=4)
+    limiter.on_success(0.1)
+    limit = limiter.limit
+    for _ in range(20):
+        limiter.on_success(5.0)
+    assert limiter.limit == limit
+
+
+def test_failure_halves_limit_once_per_window():
+    limiter = make_limiter(initial=8)
+    limiter.on_failure("throttled", "HTTP 429")
+    limiter.on_failure("throttled", "HTTP 429")
+    assert limiter.current_limit == 4
+    assert limiter.stats["throttled"] == 2
+    assert limiter.stats["decreases"] == 1
+
+    limiter._last_decrease = 0.0
+    limiter.on_failure("timeouts", "timeout")
+    assert limiter.current_limit == 2
+
+
+def test_failure_does_not_go_below_min():
+    limiter = make_limiter(initial=2, min_limit=2)
+    limiter.on_failure("throttled", "HTTP 403")
+    assert limiter.current_limit == 2
+    assert limiter.stats["decreases"] == 0
+
+
+def test_slot_reports_throttling_and_timeouts():
+    limiter = make_limiter(initial=8)
+
+    async def run():
+        async with limiter.slot() as slot:
+            slot.report_status(200)
+        async with limiter.slot() as slot:
+            slot.report_status(429)
+        limiter._last_decrease = 0.0
+        with pytest.raises(asyncio.TimeoutError):
+            async with limiter.slot():
+                raise asyncio.TimeoutError()
+
+    asyncio.run(run())
+    assert limiter.stats["requests"] == 3
+    assert limiter.stats["throttled"] == 1
+    assert limiter.stats["timeouts"] == 1
+    assert limiter.current_limit == 2
+    assert limiter.in_flight == 0
+
+
+def test_waiters_get_slots_in_turn():
+    limiter = make_limiter(initial=1, max_limit=1)
+    active = []
+    peak = []
+
+    async def request():
+        async with limiter.slot():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0)
+            active.pop()
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    asyncio.run(run())
+    assert max(peak) == 1
+    assert limiter.stats["requests"] == 5
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.parametrize("value, host", [
+    ("https://www.Example.com/jobs?page=2", "example.com"),
+    ("remoteok.com", "remoteok.com"),
+    ("www.himalayas.app", "himalayas.app"),
+])
+def test_normalize_host(value, host):
+    assert normalize_host(value) == host
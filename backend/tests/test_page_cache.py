@@ -0,0 +1,89 @@
+"""PageCache: срок жизни записей, вытеснение давно не читанных и учет размера."""
+
+import random
+import string
+import zlib
+from datetime import timedelta
+
+import pytest
+
+from app.utils import page_cache
+from app.utils.page_cache import PageCache
+
+TTL = timedelta(hours=1)
+
+
+def incompressible(size):
+    # Случайные буквы сжимаются слабо, так размер записи предсказуем
+    rnd = random.Random(size)
+    return "".join(rnd.choice(string.ascii_letters) for _ in range(size))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(str(tmp_path / "pages.sqlite3"), max_bytes=10_000)
+
+
+def shift(cache, url, column, seconds):
+    cache._conn.execute(f"UPDATE pages SET {column} = {column} - ? WHERE url = ?", (seconds, url))
+
+
+def test_roundtrip_returns_content_and_hash(cache):
+    content_hash = cache.set("https://example.com/a", "<html>вакансия</html>")
+    entry = cache.get_entry("https://example.com/a", TTL)
+    assert entry.content == "<html>вакансия</html>"
+    assert entry.content_hash == content_hash
+    assert cache.get("https://example.com/missing", TTL) is None
+
+
+def test_entry_expires_after_ttl(cache):
+    cache.set("https://example.com/a", "page")
+    shift(cache, "https://example.com/a", "fetched_at", 2 * 3600)
+    assert cache.get("https://example.com/a", TTL) is None
+    assert cache.get("https://example.com/a", timedelta(hours=3)) == "page"
+
+
+def test_set_replaces_entry_and_refreshes_ttl(cache):
+    cache.set("https://example.com/a", "old")
+    shift(cache, "https://example.com/a", "fetched_at", 2 * 3600)
+    cache.set("https://example.com/a", "new")
+    assert cache.get("https://example.com/a", TTL) == "new"
+
+
+def test_total_size_tracks_replacements(cache):
+    cache.set("https://example.com/a", incompressible(1000))
+    cache.set("https://example.com/a", incompressible(2000))
+    cache.set("https://example.com/b", incompressible(500))
+    expected = sum(len(zlib.compress(incompressible(n).encode(), 6)) for n in (2000, 500))
+    assert cache._total_size == expected
+
+
+def test_size_is_restored_on_reopen(cache):
+    cache.set("https://example.com/a", incompressible(1000))
+    reopened = PageCache(str(cache.path), max_bytes=cache.max_bytes)
+    assert reopened._total_size == cache._total_size
+
+
+def test_least_recently_read_entries_are_evicted(cache, monkeypatch):
+    monkeypatch.setattr(page_cache, "ACCESS_TOUCH_SECONDS", -1)
+    for name in "abc":
+        cache.set(f"https://example.com/{name}", incompressible(4000))
+        shift(cache, f"https://example.com/{name}", "accessed_at", 100)
+    assert cache.get("https://example.com/a", TTL) is not None
+
+    cache.set("https://example.com/d", incompressible(4000))
+    assert cache.get("https://example.com/b", TTL) is None
+    assert cache.get("https://example.com/a", TTL) is not None
+    assert cache.get("https://example.com/d", TTL) is not None
+    assert cache._total_size <= cache.max_bytes * 0.9
+
+
+def test_read_within_touch_interval_does_not_write(cache):
+    cache.set("https://example.com/a", "page")
+    accessed_at = cache._conn.execute("SELECT accessed_at FROM pages").fetchone()[0]
+    cache.get("https://example.com/a", TTL)
+    assert cache._conn.execute("SELECT accessed_at FROM pages").fetchone()[0] == accessed_at
+
+    shift(cache, "https://example.com/a", "accessed_at", page_cache.ACCESS_TOUCH_SECONDS + 1)
+    cache.get("https://example.com/a", TTL)
+    assert cache._conn.execute("SELECT accessed_at FROM pages").fetchone()[0] > accessed_at - 1
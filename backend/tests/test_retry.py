@@ -0,0 +1,144 @@
+"""CircuitBreaker и fetch_with_retry: переходы состояний цепи и повторы по классам ошибок."""
+
+import asyncio
+
+import pytest
+
+from app.utils import retry
+from app.utils.retry import CircuitBreaker, FetchError, fetch_with_retry
+
+URL = "https://example.com/job/1"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry, "backoff_delay", lambda attempt: 0)
+    retry._breakers.clear()
+    yield
+    retry._breakers.clear()
+
+
+def open_breaker(threshold=3, reset_seconds=60):
+    breaker = CircuitBreaker("example.com", failure_threshold=threshold, reset_seconds=reset_seconds)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+
+def expire_pause(breaker):
+    breaker.opened_at -= breaker.reset_seconds
+
+
+def test_breaker_opens_at_threshold():
+    breaker = CircuitBreaker("example.com", failure_threshold=3, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("example.com", failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_one_trial():
+    breaker = open_breaker()
+    expire_pause(breaker)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_breaker():
+    breaker = open_breaker()
+    expire_pause(breaker)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = open_breaker()
+    expire_pause(breaker)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_cancelled_trial_frees_half_open_slot():
+    breaker = open_breaker()
+    expire_pause(breaker)
+    assert breaker.allow()
+    breaker.cancel_trial()
+    assert breaker.allow()
+
+
+def failing_load(kinds):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        if len(calls) <= len(kinds):
+            raise FetchError(kinds[len(calls) - 1], URL)
+        return "ok"
+
+    return load, calls
+
+
+def test_retryable_errors_are_retried():
+    load, calls = failing_load(["timeout", "empty"])
+    assert asyncio.run(fetch_with_retry(URL, load, attempts=3)) == "ok"
+    assert len(calls) == 3
+
+
+def test_last_error_is_raised_after_all_attempts():
+    load, calls = failing_load(["timeout", "navigation", "blocked"])
+    with pytest.raises(FetchError) as error:
+        asyncio.run(fetch_with_retry(URL, load, attempts=3))
+    assert error.value.kind == "blocked"
+    assert len(calls) == 3
+
+
+def test_non_retryable_error_is_raised_at_once():
+    load, calls = failing_load(["circuit_open"])
+    with pytest.raises(FetchError):
+        asyncio.run(fetch_with_retry(URL, load, attempts=3))
+    assert len(calls) == 1
+
+
+def test_open_breaker_skips_load():
+    retry._breakers["example.com"] = open_breaker()
+    load, calls = failing_load([])
+    stats = {}
+    token = retry.fetch_error_stats.set(stats)
+    try:
+        with pytest.raises(FetchError) as error:
+            asyncio.run(fetch_with_retry(URL, load, attempts=3))
+    finally:
+        retry.fetch_error_stats.reset(token)
+    assert error.value.kind == "circuit_open"
+    assert calls == []
+    assert stats == {"fetch_circuit_open": 1}
+
+
+def test_cancelled_load_cancels_trial():
+    breaker = open_breaker()
+    expire_pause(breaker)
+    retry._breakers["example.com"] = breaker
+
+    async def load():
+        raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(fetch_with_retry(URL, load, attempts=1))
+    assert breaker.allow()